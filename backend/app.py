@@ -3,19 +3,36 @@ import os
 import json
 import subprocess
 import sys
+import tempfile
+import threading
+import time
+from collections import deque
 from datetime import datetime
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, url_for
 from flask_cors import CORS
+from sqlalchemy import create_engine
 from dotenv import load_dotenv
-from models import db
+from models import db, Job, json_cache
 from routes import routes
+from search import setup_sqlite_fts
+import migrations
+from scrape_tasks import ScrapeTaskManager
+from job_store import JobStore
+from persistence import JobLog
+from shared_store import SharedJobStore, SQLJobBackend
+from repository import JOB_ENGINES, MemoryJobRepository, SQLJobRepository
+from response_cache import ResponseCache
+from json_provider import FastJSONProvider
+from pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+import metrics
 
 # Load environment variables from .env file
 load_dotenv()  # ✅ This must be called BEFORE os.getenv
 
-# In-memory storage for jobs (in production, use a real database)
-jobs_storage = []
-job_counter = 1
+SCRAPER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scraper')
+
+# In-memory storage for jobs (JOB_ENGINE=memory)
+jobs_storage = JobStore()
 
 # Sample initial jobs
 initial_jobs = [
@@ -41,220 +58,315 @@ initial_jobs = [
     }
 ]
 
-jobs_storage.extend(initial_jobs)
-job_counter = len(initial_jobs) + 1
+for job in initial_jobs:
+    jobs_storage.add(job)
+
+def create_memory_repository(app):
+    """The in-memory engine, shared between workers or restored from disk if configured"""
+    global jobs_storage
+    first_id = None
+    if app.config['JOB_STORE_BACKEND'] == 'shared':
+        # Every worker sees the same jobs; this one's copy is a read replica
+        if app.config['SHARED_STORE_URL']:
+            shared_engine = create_engine(app.config['SHARED_STORE_URL'])
+        else:
+            with app.app_context():
+                shared_engine = db.engine
+        jobs_storage = SharedJobStore(SQLJobBackend(shared_engine),
+                                      poll_interval=app.config['SHARED_STORE_POLL_INTERVAL'],
+                                      seed=initial_jobs)
+        # Changes made by other workers invalidate cached responses too
+        jobs_storage.on_change.append(app.extensions['jobs_cache'].invalidate)
+    elif app.config['JOB_STORE_DIR']:
+        # Restore the in-memory store (scraped jobs included) from its last
+        # snapshot and journal instead of starting over from initial_jobs
+        job_log = JobLog(app.config['JOB_STORE_DIR'],
+                         snapshot_every=app.config['JOB_STORE_SNAPSHOT_EVERY'],
+                         fsync=app.config['JOB_STORE_FSYNC'])
+        job_log.restore(jobs_storage)
+        # Never reuse the id of a job deleted before the restart
+        first_id = job_log.max_numeric_id + 1
+    return MemoryJobRepository(jobs_storage, first_id)
 
 def create_app():
     app = Flask(__name__)
+    # orjson-backed JSON when installed, stdlib otherwise
+    app.json = FastJSONProvider(app)
 
     # Database configuration
     app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///databse.db')
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'fallbacksecret')
-
-    # Enable CORS
-    CORS(app)
+    app.config['BULK_CHUNK_SIZE'] = int(os.getenv('BULK_CHUNK_SIZE', 500))
+    # Where /jobs keeps jobs: "sql" (the database above) or "memory"
+    app.config['JOB_ENGINE'] = os.getenv('JOB_ENGINE', 'sql')
+    if app.config['JOB_ENGINE'] not in JOB_ENGINES:
+        raise ValueError(f"JOB_ENGINE must be one of {', '.join(JOB_ENGINES)}")
+    # Durable in-memory store: journal + snapshots in JOB_STORE_DIR (unset: memory only)
+    app.config['JOB_STORE_DIR'] = os.getenv('JOB_STORE_DIR')
+    app.config['JOB_STORE_SNAPSHOT_EVERY'] = int(os.getenv('JOB_STORE_SNAPSHOT_EVERY', 50000))
+    app.config['JOB_STORE_FSYNC'] = os.getenv('JOB_STORE_FSYNC', 'false').lower() in ('1', 'true', 'yes')
+    # "shared" keeps the in-memory jobs in a database every worker/node
+    # reads (SHARED_STORE_URL, default: the app database); each worker
+    # polls its change feed at most every SHARED_STORE_POLL_INTERVAL seconds
+    app.config['JOB_STORE_BACKEND'] = os.getenv('JOB_STORE_BACKEND', 'memory')
+    app.config['SHARED_STORE_URL'] = os.getenv('SHARED_STORE_URL')
+    app.config['SHARED_STORE_POLL_INTERVAL'] = float(os.getenv('SHARED_STORE_POLL_INTERVAL', 1.0))
+    # Memory cap for cached GET /jobs responses (per handler)
+    app.config['RESPONSE_CACHE_MAX_MB'] = int(os.getenv('RESPONSE_CACHE_MAX_MB', 32))
+    # Serialized SQL jobs kept in memory for list responses, at most
+    app.config['JSON_CACHE_MAX_ENTRIES'] = int(os.getenv('JSON_CACHE_MAX_ENTRIES', 50000))
+    # Allow ?profile=1 on any request to return a profile instead of the body
+    app.config['PROFILE_REQUESTS'] = os.getenv('PROFILE_REQUESTS', 'false').lower() in ('1', 'true', 'yes')
+
+    # Scraper configuration
+    app.config['SCRAPE_MAX_CONCURRENCY'] = int(os.getenv('SCRAPE_MAX_CONCURRENCY', 1))
+    app.config['SCRAPE_TIMEOUT'] = int(os.getenv('SCRAPE_TIMEOUT', 300))  # 5 minute timeout
+    # Upper bound for a request's max_jobs (larger values are clamped)
+    app.config['SCRAPE_MAX_JOBS'] = int(os.getenv('SCRAPE_MAX_JOBS', 500))
+    # "subprocess" runs scraper/run_scraper.py per scrape; "service" keeps a
+    # scraper with a warm WebDriver pool alive inside this process
+    app.config['SCRAPER_BACKEND'] = os.getenv('SCRAPER_BACKEND', 'subprocess')
+    app.config['SCRAPER_POOL_SIZE'] = int(os.getenv('SCRAPER_POOL_SIZE', 1))
+    app.config['SCRAPER_MAX_PAGES_PER_DRIVER'] = int(os.getenv('SCRAPER_MAX_PAGES_PER_DRIVER', 50))
+    app.config['SCRAPER_MAX_RSS_MB'] = int(os.getenv('SCRAPER_MAX_RSS_MB', 0)) or None
+    app.config['SCRAPER_WARM'] = os.getenv('SCRAPER_WARM', 'True').lower() == 'true'
+
+    # Enable CORS (expose the paging headers to the frontend)
+    CORS(app, expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER])
     
     # Initialize database
     db.init_app(app)
 
-    # Register existing routes blueprint
+    # The /jobs routes serve app.extensions['job_repository'], with GET
+    # responses cached in app.extensions['jobs_cache'] until the next write
+    cache_max_bytes = app.config['RESPONSE_CACHE_MAX_MB'] * 1024 * 1024
+    app.extensions['jobs_cache'] = ResponseCache(cache_max_bytes)
+    json_cache.max_entries = app.config['JSON_CACHE_MAX_ENTRIES']
     app.register_blueprint(routes)
 
     # ✅ Create tables safely using app context
     with app.app_context():
         db.create_all()
-
-    # Add new API endpoints for job management and scraping
-    @app.route('/jobs', methods=['GET'])
-    def get_jobs():
-        """Get all jobs with optional filtering and sorting"""
-        try:
-            filtered_jobs = jobs_storage.copy()
-            
-            # Apply filters
-            title_filter = request.args.get('title')
-            if title_filter:
-                filtered_jobs = [job for job in filtered_jobs 
-                               if title_filter.lower() in job['title'].lower()]
-            
-            company_filter = request.args.get('company')
-            if company_filter:
-                filtered_jobs = [job for job in filtered_jobs 
-                               if company_filter.lower() in job['company'].lower()]
-            
-            location_filter = request.args.get('location')
-            if location_filter:
-                filtered_jobs = [job for job in filtered_jobs 
-                               if job['location'] == location_filter]
-            
-            job_type_filter = request.args.get('job_type')
-            if job_type_filter:
-                filtered_jobs = [job for job in filtered_jobs 
-                               if job['job_type'] == job_type_filter]
-            
-            tags_filter = request.args.get('tags')
-            if tags_filter:
-                filtered_jobs = [job for job in filtered_jobs 
-                               if any(tags_filter.lower() in tag.lower() for tag in job['tags'])]
-            
-            # Apply sorting
-            sort_param = request.args.get('sort', 'posting_date_desc')
-            if sort_param == 'posting_date_asc':
-                filtered_jobs.sort(key=lambda x: x['posting_date'])
-            else:
-                filtered_jobs.sort(key=lambda x: x['posting_date'], reverse=True)
-            
-            return jsonify(filtered_jobs)
-        except Exception as e:
-            return jsonify({'error': str(e)}), 500
-
-    @app.route('/jobs/<job_id>', methods=['GET'])
-    def get_job(job_id):
-        """Get a single job by ID"""
-        try:
-            job = next((job for job in jobs_storage if job['id'] == job_id), None)
-            if job:
-                return jsonify(job)
-            else:
-                return jsonify({'error': 'Job not found'}), 404
-        except Exception as e:
-            return jsonify({'error': str(e)}), 500
-
-    @app.route('/jobs', methods=['POST'])
-    def create_job():
-        """Create a new job"""
-        try:
-            global job_counter
-            data = request.get_json()
-            
-            # Validate required fields
-            required_fields = ['title', 'company', 'location']
-            for field in required_fields:
-                if not data.get(field):
-                    return jsonify({'error': f'{field} is required'}), 400
-            
-            # Create new job
-            new_job = {
-                'id': str(job_counter),
-                'title': data['title'],
-                'company': data['company'],
-                'location': data['location'],
-                'job_type': data.get('job_type', 'Full-time'),
-                'tags': data.get('tags', []),
-                'posting_date': datetime.now().isoformat(),
-                'description': data.get('description', '')
-            }
-            
-            jobs_storage.append(new_job)
-            job_counter += 1
-            
-            return jsonify(new_job), 201
-        except Exception as e:
-            return jsonify({'error': str(e)}), 500
-
-    @app.route('/jobs/<job_id>', methods=['PUT'])
-    def update_job(job_id):
-        """Update an existing job"""
+        migrations.upgrade(db.engine)
+        setup_sqlite_fts(db.engine, Job)
+
+    if app.config['JOB_ENGINE'] == 'memory':
+        app.extensions['job_repository'] = create_memory_repository(app)
+    else:
+        app.extensions['job_repository'] = SQLJobRepository()
+        # Writes made by other workers invalidate cached responses too
+        app.extensions['job_repository'].on_change.append(app.extensions['jobs_cache'].invalidate)
+    job_repository = app.extensions['job_repository']
+
+    # Request latency/size histograms, GET /metrics and ?profile=1
+    metrics.init_app(app)
+    jobs_cache = app.extensions['jobs_cache']
+    metrics.REGISTRY.register(metrics.Gauge(
+        'jobs', 'Jobs in the repository', ('engine',),
+        function=lambda: {(app.config['JOB_ENGINE'],): job_repository.count()}))
+    metrics.REGISTRY.register(metrics.Counter(
+        'response_cache_lookups_total', 'GET /jobs response cache lookups', ('result',),
+        function=lambda: {('hit',): jobs_cache.hits, ('miss',): jobs_cache.misses}))
+    metrics.REGISTRY.register(metrics.Gauge(
+        'response_cache_bytes', 'Bytes of cached GET /jobs responses', function=lambda: jobs_cache.size_bytes))
+    started_at = time.monotonic()
+
+    # Optional long-lived in-process scraper with warm browsers
+    scraper_service = None
+    if app.config['SCRAPER_BACKEND'] == 'service':
+        if SCRAPER_DIR not in sys.path:
+            sys.path.insert(0, SCRAPER_DIR)
+        from scraper_service import ScraperService
+        scraper_service = ScraperService(
+            pool_size=app.config['SCRAPER_POOL_SIZE'],
+            max_pages_per_driver=app.config['SCRAPER_MAX_PAGES_PER_DRIVER'],
+            max_rss_mb=app.config['SCRAPER_MAX_RSS_MB'],
+            fetch_mode=os.getenv('SCRAPER_FETCH_MODE', 'auto'),
+            http_cache_dir=os.getenv('SCRAPER_HTTP_CACHE_DIR')
+        )
+        if app.config['SCRAPER_WARM']:
+            scraper_service.warm()
+
+    def run_scraper_subprocess(max_jobs, known, on_job):
+        """
+        Run the scraper script in a child process, handing each job to
+        `on_job` as its NDJSON record arrives. Returns the summary record.
+        For an incremental scrape, `known` (the catalog's fingerprints) is
+        passed to it in a temporary --known file.
+        """
+        command = [sys.executable, os.path.join(SCRAPER_DIR, 'run_scraper.py'), str(max_jobs)]
+        if known is None:
+            return stream_scraper(command, on_job)
+        with tempfile.TemporaryDirectory(prefix='scrape-') as tmp:
+            known_path = os.path.join(tmp, 'known.json')
+            with open(known_path, 'w', encoding='utf-8') as f:
+                json.dump(sorted(known), f)
+            return stream_scraper(command + ['--incremental', '--known', known_path], on_job)
+
+    def stream_scraper(command, on_job):
+        """Run a scraper command, passing its job records to `on_job`"""
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1
+        )
+        # Kill the scraper if it runs past the timeout
+        timer = threading.Timer(app.config['SCRAPE_TIMEOUT'], process.kill)
+        timer.start()
+
+        # Drain the scraper's log (stderr) on the side so it can't block the
+        # pipe; only the tail is kept for error messages
+        stderr_tail = deque(maxlen=50)
+        stderr_reader = threading.Thread(target=lambda: stderr_tail.extend(process.stderr))
+        stderr_reader.start()
+
+        summary = None
         try:
-            job = next((job for job in jobs_storage if job['id'] == job_id), None)
-            if not job:
-                return jsonify({'error': 'Job not found'}), 404
-            
-            data = request.get_json()
-            
-            # Update job fields
-            job['title'] = data.get('title', job['title'])
-            job['company'] = data.get('company', job['company'])
-            job['location'] = data.get('location', job['location'])
-            job['job_type'] = data.get('job_type', job['job_type'])
-            job['tags'] = data.get('tags', job['tags'])
-            job['description'] = data.get('description', job['description'])
-            
-            return jsonify(job)
-        except Exception as e:
-            return jsonify({'error': str(e)}), 500
+            for line in process.stdout:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get('type') == 'job':
+                    on_job(record['job'])
+                elif record.get('type') == 'summary':
+                    summary = record
+            process.wait()
+        finally:
+            timer.cancel()
+            if process.returncode is None:
+                # on_job raised: don't leave the scraper running, or
+                # unreaped with its log reader blocked on the pipe
+                process.kill()
+                process.wait()
+            stderr_reader.join()
+            process.stdout.close()
+            process.stderr.close()
+
+        if process.returncode != 0:
+            if process.returncode < 0:
+                raise RuntimeError('Scraping timeout - the process took too long')
+            raise RuntimeError(f"Scraper failed: {''.join(stderr_tail)}")
+        if summary is None:
+            raise RuntimeError('Scraper exited without a summary')
+        return summary
+
+    def run_scraper_service(max_jobs, known, on_job):
+        """Scrape in-process on the warm scraper service, with the same timeout"""
+        return scraper_service.scrape(max_jobs, on_job=on_job, incremental=known is not None,
+                                      timeout=app.config['SCRAPE_TIMEOUT'], known=known)
+
+    def run_scrape(params, report_progress):
+        """Run the scraper for a queued task, storing jobs as they arrive"""
+        max_jobs = params['max_jobs']
+
+        # Incremental scrapes skip what this catalog already has, so
+        # "known" follows the backend (a reset database means a full scrape)
+        known = None
+        if params['incremental']:
+            with app.app_context():
+                known = job_repository.fingerprints()
+
+        # Upsert scraped jobs by fingerprint so re-scraped listings keep their id
+        scraped_jobs = []
+        jobs_added = 0
+
+        def store_job(job):
+            nonlocal jobs_added
+            with app.app_context():
+                stored_job, created = job_repository.upsert(job)
+            app.extensions['jobs_cache'].invalidate()
+            scraped_jobs.append(stored_job)
+            jobs_added += created
+            report_progress({'jobs_scraped': len(scraped_jobs), 'jobs_added': jobs_added, 'max_jobs': max_jobs})
 
-    @app.route('/jobs/<job_id>', methods=['DELETE'])
-    def delete_job(job_id):
-        """Delete a job"""
         try:
-            global jobs_storage
-            job = next((job for job in jobs_storage if job['id'] == job_id), None)
-            if not job:
-                return jsonify({'error': 'Job not found'}), 404
-            
-            jobs_storage = [job for job in jobs_storage if job['id'] != job_id]
-            return '', 204
-        except Exception as e:
-            return jsonify({'error': str(e)}), 500
+            with metrics.SCRAPE_PHASE_SECONDS.time(phase='total'):
+                if scraper_service is not None:
+                    summary = run_scraper_service(max_jobs, known, store_job)
+                else:
+                    summary = run_scraper_subprocess(max_jobs, known, store_job)
+        except Exception:
+            metrics.SCRAPES.inc(status='error')
+            raise
+        metrics.observe_scrape(summary)
+        if not summary['success']:
+            metrics.SCRAPES.inc(status='error')
+            raise RuntimeError(summary['error'])
+        metrics.SCRAPES.inc(status='success')
+
+        return {
+            'success': True,
+            'message': f'Successfully scraped {len(scraped_jobs)} jobs',
+            'jobs_added': jobs_added,
+            'jobs_updated': len(scraped_jobs) - jobs_added,
+            'jobs': scraped_jobs
+        }
+
+    scrape_tasks = ScrapeTaskManager(run_scrape, max_workers=app.config['SCRAPE_MAX_CONCURRENCY'])
 
     @app.route('/scrape-jobs', methods=['POST'])
     def scrape_jobs():
-        """Scrape jobs from ActuaryList using Selenium"""
+        """Queue a scrape of ActuaryList; returns a task id to poll"""
         try:
-            data = request.get_json() or {}
+            data = request.get_json(silent=True) or {}
             max_jobs = data.get('max_jobs', 20)
-            
-            # Path to the scraper script
-            scraper_path = os.path.join(os.path.dirname(__file__), '..', 'scraper', 'run_scraper.py')
-            
-            # Run the scraper
-            result = subprocess.run(
-                [sys.executable, scraper_path, str(max_jobs)],
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout
-            )
-            
-            if result.returncode == 0:
-                # Parse the JSON output from the scraper
-                scraper_output = json.loads(result.stdout)
-                
-                if scraper_output['success']:
-                    # Add scraped jobs to storage
-                    global job_counter
-                    scraped_jobs = scraper_output['jobs']
-                    
-                    for job in scraped_jobs:
-                        job['id'] = str(job_counter)
-                        jobs_storage.append(job)
-                        job_counter += 1
-                    
-                    return jsonify({
-                        'success': True,
-                        'message': f'Successfully scraped {len(scraped_jobs)} jobs',
-                        'jobs_added': len(scraped_jobs),
-                        'jobs': scraped_jobs
-                    })
-                else:
-                    return jsonify({
-                        'success': False,
-                        'error': scraper_output['error']
-                    }), 500
-            else:
+            try:
+                if isinstance(max_jobs, (bool, float)):
+                    raise ValueError
+                max_jobs = int(max_jobs)
+            except (TypeError, ValueError):
+                max_jobs = 0
+            if max_jobs < 1:
                 return jsonify({
                     'success': False,
-                    'error': f'Scraper failed: {result.stderr}'
-                }), 500
-                
-        except subprocess.TimeoutExpired:
+                    'error': 'max_jobs must be a positive integer'
+                }), 400
+            max_jobs = min(max_jobs, app.config['SCRAPE_MAX_JOBS'])
+
+            incremental = bool(data.get('incremental', False))
+
+            task, created = scrape_tasks.submit({'max_jobs': max_jobs, 'incremental': incremental})
+            status_url = url_for('scrape_status', task_id=task.id)
             return jsonify({
-                'success': False,
-                'error': 'Scraping timeout - the process took too long'
-            }), 500
+                'success': True,
+                'task_id': task.id,
+                'status': task.status,
+                'coalesced': not created,
+                'status_url': status_url
+            }), 202, {'Location': status_url}
         except Exception as e:
+            app.logger.exception('Could not queue scrape')
             return jsonify({
                 'success': False,
                 'error': str(e)
             }), 500
 
+    @app.route('/scrape-jobs/<task_id>', methods=['GET'])
+    def scrape_status(task_id):
+        """Report status, progress and results of a scrape task"""
+        task = scrape_tasks.get(task_id)
+        if not task:
+            return jsonify({'error': 'Scrape task not found'}), 404
+        return jsonify(task.to_dict())
+
     @app.route('/health', methods=['GET'])
     def health_check():
-        """Health check endpoint"""
+        """Health check endpoint (detailed timings are on /metrics)"""
         return jsonify({
-            'status': 'healthy',~
-            'jobs_count': len(jobs_storage),
+            'status': 'healthy',
+            'engine': app.config['JOB_ENGINE'],
+            'jobs_count': job_repository.count(),
+            'uptime_seconds': round(time.monotonic() - started_at, 1),
+            'response_cache': {
+                'entries': len(jobs_cache),
+                'bytes': jobs_cache.size_bytes,
+                'hits': jobs_cache.hits,
+                'misses': jobs_cache.misses
+            },
             'timestamp': datetime.now().isoformat()
         })
 
@@ -267,7 +379,8 @@ if __name__ == '__main__':
     
     print(f"Starting Flask server on port {port}")
     print(f"Debug mode: {debug}")
-    print(f"Initial jobs loaded: {len(jobs_storage)}")
+    with app.app_context():
+        print(f"Jobs loaded: {app.extensions['job_repository'].count()} ({app.config['JOB_ENGINE']} engine)")
     
     app.run(host='0.0.0.0', port=port, debug=debug)
 
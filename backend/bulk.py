@@ -0,0 +1,208 @@
+"""
+Bulk import of job listings.
+
+validate_jobs() checks and normalizes a batch, computes each listing's
+fingerprint and drops duplicates within the batch. bulk_upsert() then
+writes the batch to the SQL Job table a chunk at a time: one SELECT to find
+rows that already exist, then one executemany each for new jobs, updated
+jobs and their tag links, all inside a single transaction.
+"""
+
+import os
+import sys
+
+from sqlalchemy import bindparam, select
+
+from dates import parse_posting_date, utcnow
+from models import Job, Tag, bump_catalog_version, job_tags
+from search import fts_sync
+
+# The listing fingerprint is shared with the scraper, so scraped and
+# imported jobs dedupe against each other
+SCRAPER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scraper')
+if SCRAPER_DIR not in sys.path:
+    sys.path.append(SCRAPER_DIR)
+from listing_identity import IDENTITY_FIELDS, fingerprint  # noqa: E402
+
+REQUIRED_FIELDS = ('title', 'company', 'location', 'job_type')
+# Columns an import writes (new and existing rows), besides tags
+STORED_FIELDS = REQUIRED_FIELDS + ('description', 'url')
+MAX_BULK_JOBS = 100_000
+BULK_CHUNK_SIZE = 500  # keeps IN (...) lists under SQLite's bound-parameter limit
+
+
+def clean_tags(tags):
+    """Tag names from a list of strings or a comma-separated string"""
+    if tags is None:
+        return []
+    if isinstance(tags, str):
+        tags = tags.split(',')
+    elif not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+        raise ValueError('tags must be a list of strings or a comma-separated string')
+    return [tag.strip() for tag in tags if tag.strip()]
+
+
+def clean_fields(item, partial=False):
+    """
+    Check and normalize the fields of a job dict, the same way for imports,
+    POST /jobs and PUT/PATCH: REQUIRED_FIELDS must be non-blank strings,
+    description and url strings or null, tags as clean_tags() takes them.
+    With `partial` only the fields present are checked and returned.
+    Raises ValueError describing the problem.
+    """
+    fields = {}
+    missing = []
+    for field in REQUIRED_FIELDS:
+        if field not in item:
+            if not partial:
+                missing.append(field)
+            continue
+        value = item[field]
+        if value is not None and not isinstance(value, str):
+            raise ValueError(f"{field} must be a string")
+        fields[field] = (value or '').strip()
+        if not fields[field]:
+            missing.append(field)
+    if missing:
+        raise ValueError(f"Missing required fields: {', '.join(missing)}")
+
+    for field, default in (('description', ''), ('url', None)):
+        if field in item or not partial:
+            value = item.get(field)
+            if value is not None and not isinstance(value, str):
+                raise ValueError(f"{field} must be a string")
+            fields[field] = value or default
+    if 'tags' in item or not partial:
+        fields['tags'] = clean_tags(item.get('tags'))
+    return fields
+
+
+def validate_jobs(items):
+    """
+    Normalize a batch of job dicts.
+
+    Returns (jobs, errors): jobs are cleaned dicts with a fingerprint,
+    posting_date as a datetime (or None) and tags as a list of names; when a
+    fingerprint repeats the last occurrence wins. errors lists
+    {'index', 'error'} for every rejected item.
+    """
+    jobs = {}
+    errors = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append({'index': index, 'error': 'Job must be an object'})
+            continue
+        try:
+            job = clean_fields(item)
+        except ValueError as e:
+            errors.append({'index': index, 'error': str(e)})
+            continue
+        try:
+            job['posting_date'] = parse_posting_date(item.get('posting_date'))
+        except ValueError:
+            errors.append({'index': index, 'error': 'Invalid posting_date'})
+            continue
+        job['fingerprint'] = item.get('fingerprint') or fingerprint(job)
+        jobs.pop(job['fingerprint'], None)
+        jobs[job['fingerprint']] = job
+    return list(jobs.values()), errors
+
+
+def refingerprint(job, fields):
+    """
+    The fields to store along with an update of `job`: its new fingerprint
+    when `fields` change what identifies the listing, else nothing
+    """
+    identity = {field: fields.get(field, job.get(field)) for field in IDENTITY_FIELDS}
+    if all(identity[field] == job.get(field) for field in IDENTITY_FIELDS):
+        return {}
+    return {'fingerprint': fingerprint(identity)}
+
+
+def _resolve_tags(conn, names):
+    """Map normalized tag name -> tag id, inserting tags that don't exist"""
+    wanted = {}
+    for name in names:
+        wanted.setdefault(Tag.normalize(name), name)
+    if not wanted:
+        return {}
+
+    tags = Tag.__table__
+    tag_ids = dict(conn.execute(
+        select(tags.c.normalized, tags.c.id).where(tags.c.normalized.in_(list(wanted)))
+    ).all())
+    missing = [{'name': name, 'normalized': normalized}
+               for normalized, name in wanted.items() if normalized not in tag_ids]
+    if missing:
+        conn.execute(tags.insert(), missing)
+        tag_ids.update(conn.execute(
+            select(tags.c.normalized, tags.c.id)
+            .where(tags.c.normalized.in_([tag['normalized'] for tag in missing]))
+        ).all())
+    return tag_ids
+
+
+def _upsert_chunk(conn, chunk):
+    jobs = Job.__table__
+    fingerprints = [job['fingerprint'] for job in chunk]
+    existing = dict(conn.execute(
+        select(jobs.c.fingerprint, jobs.c.id).where(jobs.c.fingerprint.in_(fingerprints))
+    ).all())
+
+    # New rows; existing rows keep their id and original posting_date
+    now = utcnow()
+    new_rows = [
+        dict({field: job[field] for field in STORED_FIELDS + ('fingerprint',)},
+             posting_date=job['posting_date'] or now)
+        for job in chunk if job['fingerprint'] not in existing
+    ]
+    if new_rows:
+        conn.execute(jobs.insert(), new_rows)
+
+    updated_rows = [
+        dict({field: job[field] for field in STORED_FIELDS}, job_id=existing[job['fingerprint']])
+        for job in chunk if job['fingerprint'] in existing
+    ]
+    if updated_rows:
+        conn.execute(
+            jobs.update()
+            .where(jobs.c.id == bindparam('job_id'))
+            .values(dict({field: bindparam(field) for field in STORED_FIELDS}, version=jobs.c.version + 1)),
+            updated_rows
+        )
+
+    # Re-read ids for the inserted rows and replace every job's tag links
+    job_ids = dict(existing)
+    if new_rows:
+        job_ids.update(conn.execute(
+            select(jobs.c.fingerprint, jobs.c.id)
+            .where(jobs.c.fingerprint.in_([row['fingerprint'] for row in new_rows]))
+        ).all())
+    tag_ids = _resolve_tags(conn, [tag for job in chunk for tag in job['tags']])
+    if existing:
+        conn.execute(job_tags.delete().where(job_tags.c.job_id.in_(list(existing.values()))))
+    links = {
+        (job_ids[job['fingerprint']], tag_ids[Tag.normalize(tag)])
+        for job in chunk for tag in job['tags']
+    }
+    if links:
+        conn.execute(job_tags.insert(), [{'job_id': job_id, 'tag_id': tag_id} for job_id, tag_id in links])
+
+    fts_sync(conn, Job, list(job_ids.values()))
+    return len(new_rows), len(updated_rows)
+
+
+def bulk_upsert(engine, jobs, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Insert validated jobs into the Job table, updating rows that share a
+    fingerprint. Returns (created, updated).
+    """
+    created = updated = 0
+    with engine.begin() as conn:
+        for start in range(0, len(jobs), chunk_size):
+            chunk_created, chunk_updated = _upsert_chunk(conn, jobs[start:start + chunk_size])
+            created += chunk_created
+            updated += chunk_updated
+        if created or updated:
+            bump_catalog_version(conn)
+    return created, updated
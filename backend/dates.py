@@ -0,0 +1,34 @@
+"""
+Parsing of job posting dates.
+
+Stored and submitted dates mix formats ('2024-01-15T10:00:00Z', naive
+datetime.now().isoformat() values, plain dates). Everything is normalized
+to a naive UTC datetime so dates compare and sort correctly.
+"""
+
+from datetime import datetime, timezone
+
+
+def utcnow():
+    """The current time as a naive UTC datetime, the form dates are stored in"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def parse_posting_date(value):
+    """
+    Parse an ISO 8601 date or datetime into a naive UTC datetime. Naive
+    values are taken to be UTC already. Returns None for empty values and
+    raises ValueError for anything unparseable.
+    """
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        value = str(value).strip()
+        if value.endswith(('Z', 'z')):
+            value = value[:-1] + '+00:00'
+        parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
@@ -0,0 +1,500 @@
+"""
+Indexed in-memory job store.
+
+Jobs are kept in a dict keyed by id, with secondary indexes on location,
+job_type and normalized tags so lookups and equality filters don't have
+to scan the whole catalogue. A full-text SearchIndex is maintained
+alongside them, and a bisect-maintained list of (posting datetime, id)
+keys keeps jobs in date order so listings and date ranges never sort.
+Each job's serialized JSON is cached until the job changes.
+
+Jobs are held as JobRecord objects rather than dicts: fixed __slots__,
+tags as a tuple, and the strings that repeat across listings (company,
+location, job_type, tags, templated descriptions) interned so each
+distinct value is stored once.
+
+The store is safe to share between request and scrape threads: queries
+run under a shared read lock and return finished results (lists, never
+live iterators), while writes take the lock exclusively.
+"""
+
+import sys
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from datetime import datetime
+
+from dates import parse_posting_date
+from json_provider import dumps_bytes
+from rwlock import RWLock
+from search import SearchIndex, job_tokens, normalize_tag
+
+# Sorting the candidates beats walking the date index when a filter leaves
+# fewer than 1/SPARSE_FILTER_RATIO of all jobs
+SPARSE_FILTER_RATIO = 16
+
+
+class DuplicateJobError(Exception):
+    """A write would give a job the fingerprint another job already has"""
+
+    def __init__(self, job_id):
+        super().__init__(f"Job {job_id} is already this listing")
+        # Id of the job that has the fingerprint
+        self.job_id = job_id
+
+
+class JobRecord:
+    """
+    Compact in-memory job. Supports the read-only dict operations the
+    handlers use (job['title'], get, items, in), to_dict() for persistence
+    and public_dict() for API output.
+    """
+
+    FIELDS = ('id', 'title', 'company', 'location', 'job_type', 'tags', 'posting_date',
+              'description', 'fingerprint', 'url')
+    INTERNED = frozenset(('company', 'location', 'job_type', 'description'))
+    # Fields left out of to_dict() while unset, as they were never in the dicts
+    OPTIONAL = frozenset(('fingerprint', 'url'))
+    # Fields the API serves, in order; models.Job.to_dict() returns the same
+    PUBLIC_FIELDS = ('id', 'title', 'company', 'location', 'posting_date', 'job_type', 'tags',
+                     'description', 'url')
+
+    __slots__ = FIELDS + ('extra',)
+    _FIELD_SET = frozenset(FIELDS)
+
+    def __init__(self, fields):
+        self.id = self.title = self.company = self.location = self.job_type = None
+        self.tags = self.posting_date = self.description = self.fingerprint = self.url = None
+        self.extra = None
+        self.update(fields)
+
+    def update(self, fields):
+        intern = sys.intern
+        for key, value in fields.items():
+            if key == 'tags':
+                value = tuple(intern(str(tag)) for tag in value or ())
+            elif key in self.INTERNED and isinstance(value, str):
+                value = intern(value)
+            elif key == 'posting_date' and value:
+                # Stored as the SQL engine returns it ("...Z" and offsets
+                # become naive UTC); anything unparseable is kept as given
+                try:
+                    value = parse_posting_date(value).isoformat()
+                except ValueError:
+                    pass
+            if key in self._FIELD_SET:
+                setattr(self, key, value)
+            else:
+                # Anything unexpected is kept, just not compactly
+                if self.extra is None:
+                    self.extra = {}
+                self.extra[key] = value
+
+    def __getitem__(self, key):
+        if key in self.FIELDS:
+            value = getattr(self, key)
+            if value is None and key in self.OPTIONAL:
+                raise KeyError(key)
+            return value
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def items(self):
+        for name in self.FIELDS:
+            value = getattr(self, name)
+            if value is not None or name not in self.OPTIONAL:
+                yield name, list(value) if name == 'tags' else value
+        if self.extra:
+            yield from self.extra.items()
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def public_dict(self):
+        job = {name: getattr(self, name) for name in self.PUBLIC_FIELDS}
+        job['tags'] = list(self.tags)
+        job['description'] = self.description or ''
+        return job
+
+
+def date_key(job):
+    """Sort key of a job in the date index: (posting datetime, id)"""
+    try:
+        posted_at = parse_posting_date(job.get('posting_date'))
+    except ValueError:
+        posted_at = None
+    return (posted_at or datetime.min, job['id'])
+
+
+class JobStore:
+    def __init__(self, jobs=None, journal=None):
+        # Optional persistence.JobLog notified of every change
+        self.journal = journal
+        self._lock = RWLock()
+        self._reset()
+        for job in jobs or []:
+            self.add(job)
+
+    def _reset(self):
+        self._jobs = {}
+        self._by_location = {}
+        self._by_job_type = {}
+        self._by_tag = {}
+        self._by_fingerprint = {}
+        self._search = SearchIndex()
+        self._by_date = []      # sorted (posting datetime, id)
+        self._date_keys = {}    # id -> its key in _by_date
+        self._json = {}         # id -> serialized job
+        self._search_pending = []  # ids loaded but not yet full-text indexed
+
+    def clear(self):
+        """Remove every job (not recorded in the journal)"""
+        with self._lock.write_locked():
+            self._reset()
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def __iter__(self):
+        with self._lock.read_locked():
+            return iter(list(self._jobs.values()))
+
+    def __contains__(self, job_id):
+        return job_id in self._jobs
+
+    def fingerprints(self):
+        """The fingerprints of every stored (scraped or imported) job"""
+        with self._lock.read_locked():
+            return set(self._by_fingerprint)
+
+    @contextmanager
+    def _writing(self):
+        """
+        Hold the write lock for a change. If the change made the journal
+        due for compaction, the journal is rotated under the lock and the
+        snapshot file written after it is released, so readers aren't held
+        up by the disk write.
+        """
+        with self._lock.write_locked():
+            yield
+            snapshot = None
+            if self.journal is not None and self.journal.needs_snapshot():
+                snapshot = self.journal.rotate(), self._jobs_by_date()
+        if snapshot is not None:
+            self.journal.write_snapshot(*snapshot)
+
+    # ------ Index maintenance ------
+    @staticmethod
+    def _index_add(index, key, job_id):
+        index.setdefault(key, set()).add(job_id)
+
+    @staticmethod
+    def _index_remove(index, key, job_id):
+        ids = index.get(key)
+        if ids is None:
+            return
+        ids.discard(job_id)
+        if not ids:
+            del index[key]
+
+    def _index(self, job, bulk=False):
+        job_id = job.id
+        self._index_add(self._by_location, job.location, job_id)
+        self._index_add(self._by_job_type, job.job_type, job_id)
+        for tag in job.tags:
+            self._index_add(self._by_tag, normalize_tag(tag), job_id)
+        if job.fingerprint:
+            self._by_fingerprint[job.fingerprint] = job_id
+        key = date_key(job)
+        self._date_keys[job_id] = key
+        if bulk:
+            # Sorted and search-indexed in one go by load()
+            self._by_date.append(key)
+            self._search_pending.append(job_id)
+        else:
+            insort(self._by_date, key)
+            self._search.add(job_id, job_tokens(job))
+
+    def _unindex(self, job):
+        job_id = job.id
+        self._index_remove(self._by_location, job.location, job_id)
+        self._index_remove(self._by_job_type, job.job_type, job_id)
+        for tag in job.tags:
+            self._index_remove(self._by_tag, normalize_tag(tag), job_id)
+        if job.fingerprint and self._by_fingerprint.get(job.fingerprint) == job_id:
+            del self._by_fingerprint[job.fingerprint]
+        self._search.remove(job_id)
+        self._json.pop(job_id, None)
+        key = self._date_keys.pop(job_id)
+        del self._by_date[bisect_left(self._by_date, key)]
+
+    # ------ CRUD (the unlocked _methods expect the write lock held) ------
+    def get(self, job_id):
+        """Return the job with the given id, or None"""
+        return self._jobs.get(job_id)
+
+    def add(self, job, unique=False):
+        """
+        Add a job dict (replacing any job with the same id); returns its
+        JobRecord. With `unique`, raises DuplicateJobError if another job
+        has the same fingerprint.
+        """
+        with self._writing():
+            if unique:
+                self._check_fingerprint(job.get('fingerprint'), job['id'])
+            return self._add(job)
+
+    def _check_fingerprint(self, fingerprint, job_id):
+        other_id = self._by_fingerprint.get(fingerprint) if fingerprint else None
+        if other_id is not None and other_id != job_id:
+            raise DuplicateJobError(other_id)
+
+    def _add(self, job):
+        if not isinstance(job, JobRecord):
+            job = JobRecord(job)
+        existing = self._jobs.get(job.id)
+        if existing is not None:
+            self._unindex(existing)
+        self._jobs[job.id] = job
+        self._index(job)
+        self._journal_put(job)
+        return job
+
+    def load(self, jobs):
+        """
+        Add many new jobs at once (e.g. when restoring from disk). The date
+        index is sorted once at the end instead of per job, the full-text
+        index is built on the first search rather than up front, and
+        nothing is journaled. Jobs must not already be in the store.
+        """
+        with self._lock.write_locked():
+            for job in jobs:
+                job = JobRecord(job)
+                self._jobs[job.id] = job
+                self._index(job, bulk=True)
+            self._by_date.sort()
+
+    def update(self, job_id, fields, derive=None):
+        """
+        Apply `fields` to an existing job, keeping indexes in sync.
+        `derive(job, fields)`, if given, returns further fields to set,
+        computed under the write lock (see bulk.refingerprint). Raises
+        DuplicateJobError if the job would take another job's fingerprint.
+        """
+        with self._writing():
+            job = self._jobs.get(job_id)
+            if job is not None and derive is not None:
+                fields = dict(fields, **derive(job, fields))
+                self._check_fingerprint(fields.get('fingerprint'), job_id)
+            return self._update(job_id, fields)
+
+    def _update(self, job_id, fields):
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        self._unindex(job)
+        job.update(fields)
+        self._index(job)
+        self._journal_put(job)
+        return job
+
+    def upsert(self, job, new_id):
+        """
+        Insert `job`, or update the stored job with the same fingerprint.
+
+        New jobs get their id from `new_id()`; an existing job keeps its id
+        and original posting_date. Returns (stored_job, created).
+        """
+        with self._writing():
+            return self._upsert(job, new_id)
+
+    def _upsert(self, job, new_id):
+        existing_id = self._by_fingerprint.get(job.get('fingerprint'))
+        if existing_id is not None:
+            fields = {key: value for key, value in job.items() if key not in ('id', 'posting_date')}
+            return self._update(existing_id, fields), False
+        job['id'] = new_id()
+        return self._add(job), True
+
+    def bulk_upsert(self, jobs, new_id):
+        """Upsert every job in `jobs` as one write; returns (created, updated)"""
+        created = 0
+        with self._writing():
+            for job in jobs:
+                created += self._upsert(job, new_id)[1]
+        return created, len(jobs) - created
+
+    def delete(self, job_id):
+        """Remove a job; returns the removed job or None"""
+        with self._writing():
+            job = self._jobs.pop(job_id, None)
+            if job is not None:
+                self._unindex(job)
+                if self.journal is not None:
+                    self.journal.record_delete(job_id)
+            return job
+
+    def _journal_put(self, job):
+        if self.journal is not None:
+            self.journal.record_put(job)
+
+    # ------ Querying ------
+    def encode_all(self, jobs):
+        """JSON bytes for stored jobs, cached until each is updated or removed"""
+        with self._lock.read_locked():
+            encoded = []
+            for job in jobs:
+                data = self._json.get(job.id)
+                if data is None:
+                    data = dumps_bytes(job.public_dict())
+                    # `jobs` was listed before this lock was taken; a record
+                    # replaced since then (e.g. by a sync) must not be cached
+                    if self._jobs.get(job.id) is job:
+                        self._json[job.id] = data
+                encoded.append(data)
+            return encoded
+
+    def search(self, query):
+        """Full-text search; returns {job_id: BM25 score}"""
+        if self._search_pending:
+            with self._lock.write_locked():
+                self._index_pending_search()
+        with self._lock.read_locked():
+            return self._search.search(query)
+
+    def _index_pending_search(self):
+        """Add jobs bulk-loaded by load() to the full-text index"""
+        pending, self._search_pending = self._search_pending, []
+        for job_id in pending:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                self._search.add(job_id, job_tokens(job))
+
+    def _date_range(self, after=None, before=None, keys=None):
+        """Bounds of the slice of sorted `keys` with after <= posted_at < before"""
+        keys = self._by_date if keys is None else keys
+        lo = bisect_left(keys, (after,)) if after is not None else 0
+        hi = bisect_left(keys, (before,)) if before is not None else len(keys)
+        return lo, max(lo, hi)
+
+    def sync(self, force=False):
+        """Nothing to catch up on: this store is the only copy (see SharedJobStore)"""
+        return 0
+
+    def _jobs_by_date(self):
+        return [self._jobs[job_id] for _, job_id in self._by_date]
+
+    def jobs_by_date(self):
+        """Every job, oldest first"""
+        with self._lock.read_locked():
+            return self._jobs_by_date()
+
+    def list_by_date(self, descending=False, posted_after=None, posted_before=None, cursor=None,
+                     limit=None, predicate=None, include_total=False, **filters):
+        """
+        One page of jobs in (posting date, id) order, walked straight off
+        the date index without copying or sorting the catalogue.
+
+        posted_after/posted_before bound the posting date (inclusive/
+        exclusive), cursor is the date key of the last job already returned,
+        `filters` are filter() arguments, and predicate(job) is an extra
+        per-job check. Returns (jobs, next_cursor_key, total); total is None
+        unless include_total is set.
+        """
+        with self._lock.read_locked():
+            ids = self._filter_ids(**filters) if any(value is not None for value in filters.values()) else None
+
+            def walk(cursor):
+                jobs = self._iter_by_date(descending, posted_after, posted_before, cursor, ids)
+                return filter(predicate, jobs) if predicate is not None else jobs
+
+            total = None
+            if include_total:
+                if ids is None and predicate is None:
+                    lo, hi = self._date_range(posted_after, posted_before)
+                    total = hi - lo
+                else:
+                    total = sum(1 for _ in walk(None))
+
+            page = []
+            for job in walk(cursor):
+                if limit is not None and len(page) == limit:
+                    return page, self._date_keys[page[-1].id], total
+                page.append(job)
+            return page, None, total
+
+    def _iter_by_date(self, descending=False, after=None, before=None, cursor=None, ids=None):
+        if ids is not None and len(ids) * SPARSE_FILTER_RATIO < len(self._by_date):
+            keys = sorted(self._date_keys[job_id] for job_id in ids if job_id in self._date_keys)
+            ids = None
+        else:
+            keys = self._by_date
+        lo, hi = self._date_range(after, before, keys)
+        if cursor is not None:
+            if descending:
+                hi = min(hi, bisect_left(keys, cursor))
+            else:
+                lo = max(lo, bisect_right(keys, cursor))
+
+        positions = range(hi - 1, lo - 1, -1) if descending else range(lo, hi)
+        for position in positions:
+            job_id = keys[position][1]
+            if ids is None or job_id in ids:
+                yield self._jobs[job_id]
+
+    def filter(self, location=None, job_type=None, tag=None, ids=None, posted_after=None, posted_before=None):
+        """
+        Return the jobs matching every given filter.
+
+        location and job_type are exact matches, and so is tag once
+        normalized (case and surrounding whitespace ignored), as in the SQL
+        engine; all three are single index lookups. `ids` optionally
+        restricts the result to a set of job ids (e.g. search hits), and
+        posted_after/posted_before to a posting date range.
+        """
+        with self._lock.read_locked():
+            ids = self._filter_ids(location, job_type, tag, ids, posted_after, posted_before)
+            if ids is None:
+                return list(self._jobs.values())
+            return [self._jobs[job_id] for job_id in ids if job_id in self._jobs]
+
+    def _filter_ids(self, location=None, job_type=None, tag=None, ids=None, posted_after=None,
+                    posted_before=None):
+        """Ids matching every given filter, or None when no filter was given"""
+        candidates = []
+        if ids is not None:
+            candidates.append(ids if isinstance(ids, set) else set(ids))
+        if location:
+            candidates.append(self._by_location.get(location, set()))
+        if job_type:
+            candidates.append(self._by_job_type.get(job_type, set()))
+        if tag:
+            candidates.append(self._by_tag.get(normalize_tag(tag), set()))
+        if posted_after is not None or posted_before is not None:
+            lo, hi = self._date_range(posted_after, posted_before)
+            candidates.append({job_id for _, job_id in self._by_date[lo:hi]})
+
+        if not candidates:
+            return None
+
+        # Intersect starting from the smallest set
+        candidates.sort(key=len)
+        ids = set(candidates[0])
+        for other in candidates[1:]:
+            ids &= other
+            if not ids:
+                break
+        return ids
@@ -0,0 +1,65 @@
+"""
+JSON encoding for API responses.
+
+FastJSONProvider plugs into Flask (app.json) and uses orjson when it is
+installed (pip install orjson), falling back to the standard library.
+dumps_bytes() is the same encoder for code that caches serialized jobs, and
+json_array() joins already-encoded items into a list body without
+re-encoding them.
+"""
+
+import json
+
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+def dumps_bytes(obj, default=None):
+    """
+    Serialize obj to compact UTF-8 JSON bytes with sorted keys. `default`
+    converts values JSON has no type for; with orjson, datetimes and
+    dataclasses are passed to it too so output matches the stdlib path.
+    """
+    if orjson is not None:
+        option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        if default is not None:
+            option |= orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        return orjson.dumps(obj, default=default, option=option)
+    return json.dumps(obj, default=default, sort_keys=True, separators=(',', ':'),
+                      ensure_ascii=False).encode('utf-8')
+
+
+def json_array(encoded_items):
+    """Join pre-encoded JSON values into a JSON array"""
+    return b'[' + b','.join(encoded_items) + b']'
+
+
+def json_array_response(encoded_items, status=200, headers=None):
+    """A Flask response whose body is a JSON array of pre-encoded items"""
+    return Response(json_array(encoded_items), status=status, headers=headers, mimetype='application/json')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider that encodes with orjson when available"""
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps_bytes(obj, default=self.default).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = dumps_bytes(obj, default=self.default)
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
@@ -0,0 +1,228 @@
+"""
+Prometheus metrics for the backend.
+
+A small in-process registry (counters, gauges and histograms with labels)
+rendered in the Prometheus text format on GET /metrics, so no client
+library is needed. init_app() records every request's latency and
+response size per route; the /jobs engines time their stages and scrapes
+report their phase timings into the histograms below.
+
+Metrics are per process: with several workers, scrape each one (or put
+them behind separate targets).
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from flask import Response, g, got_request_exception, request
+
+import profiling
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; covers sub-millisecond index lookups up to multi-second scrapes
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+class Metric:
+    """
+    Base for all metric types. Instead of being updated, a counter or gauge
+    can read its value from `function` whenever metrics are rendered: a
+    number, or {label values tuple: number}.
+    """
+
+    kind = 'untyped'
+
+    def __init__(self, name, help, labelnames=(), function=None):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.function = function
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} takes labels {self.labelnames}, got {tuple(labels)}')
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        """(suffix, label values, extra labels, value) for every series"""
+        if self.function is not None:
+            value = self.function()
+            if isinstance(value, dict):
+                return [('', tuple(map(str, key)), (), v) for key, v in value.items()]
+            return [('', (), (), value)]
+        with self._lock:
+            return [('', key, (), value) for key, value in self._values.items()]
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.kind}']
+        for suffix, key, extra, value in self.samples():
+            lines.append(f'{self.name}{suffix}{_format_labels(self.labelnames, key, extra)} {_format_value(value)}')
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                # Per-bucket counts (last one is +Inf), sum
+                series = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the with-block, in seconds"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self):
+        with self._lock:
+            series = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        samples = []
+        for key, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                samples.append(('_bucket', key, (('le', _format_value(float(bound))),), cumulative))
+            samples.append(('_sum', key, (), total))
+            samples.append(('_count', key, (), cumulative))
+        return samples
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        """Add a metric (replacing one with the same name); returns it"""
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+
+REGISTRY = Registry()
+
+REQUEST_SECONDS = REGISTRY.register(Histogram(
+    'http_request_duration_seconds', 'Request latency by route', ('method', 'route', 'status')))
+RESPONSE_BYTES = REGISTRY.register(Histogram(
+    'http_response_size_bytes', 'Response body size by route', ('method', 'route'), buckets=SIZE_BUCKETS))
+REQUEST_EXCEPTIONS = REGISTRY.register(Counter(
+    'http_request_exceptions_total', 'Unhandled exceptions by route', ('route', 'exception')))
+JOBS_STAGE_SECONDS = REGISTRY.register(Histogram(
+    'jobs_query_stage_seconds', 'Time per stage of a GET /jobs query (search, filter, sort, count, serialize)',
+    ('engine', 'stage')))
+SCRAPE_PHASE_SECONDS = REGISTRY.register(Histogram(
+    'scrape_phase_seconds', 'Scraper phase timings (driver startup, page load, load more, extraction per listing)',
+    ('phase',)))
+SCRAPES = REGISTRY.register(Counter('scrapes_total', 'Finished scrapes by outcome', ('status',)))
+
+
+def observe_scrape(summary):
+    """Record the phase timings a scraper summary carries"""
+    for phase, durations in (summary.get('phase_seconds') or {}).items():
+        for duration in durations:
+            SCRAPE_PHASE_SECONDS.observe(duration, phase=phase)
+
+
+def _route():
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+
+def init_app(app, registry=REGISTRY):
+    """
+    Time every request, count unhandled exceptions and serve GET /metrics.
+    With PROFILE_REQUESTS set, ?profile=1 returns a profile of the request
+    instead of its body (see profiling.py).
+    """
+
+    @app.before_request
+    def _start_request_timer():
+        g.request_started = time.perf_counter()
+        if app.config.get('PROFILE_REQUESTS') and request.args.get('profile') == '1':
+            g.profiler = profiling.start()
+
+    @app.after_request
+    def _record_request(response):
+        started = g.pop('request_started', None)
+        if started is not None:
+            route = _route()
+            REQUEST_SECONDS.observe(time.perf_counter() - started,
+                                    method=request.method, route=route, status=response.status_code)
+            if not response.direct_passthrough:
+                RESPONSE_BYTES.observe(response.calculate_content_length() or 0,
+                                       method=request.method, route=route)
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            response = profiling.report(profiler, response)
+        return response
+
+    def _count_exception(sender, exception, **extra):
+        REQUEST_EXCEPTIONS.inc(route=_route(), exception=type(exception).__name__)
+
+    got_request_exception.connect(_count_exception, app, weak=False)
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        """Prometheus scrape endpoint"""
+        return Response(registry.render(), mimetype=None, content_type=CONTENT_TYPE)
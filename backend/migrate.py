@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Apply or revert schema migrations for the configured database
+
+    python migrate.py                 # upgrade to the latest revision
+    python migrate.py upgrade [rev]
+    python migrate.py downgrade [rev] # omit rev to revert everything
+    python migrate.py current
+"""
+
+import sys
+
+import migrations
+from app import create_app
+from models import db
+
+def main(argv):
+    command = argv[0] if argv else 'upgrade'
+    target = argv[1] if len(argv) > 1 else None
+    # create_app() already upgrades to the latest revision on startup
+    app = create_app()
+
+    with app.app_context():
+        if command == 'upgrade':
+            applied = migrations.upgrade(db.engine, target)
+            print(f"Applied: {', '.join(applied) or 'nothing to do'}")
+        elif command == 'downgrade':
+            reverted = migrations.downgrade(db.engine, target)
+            print(f"Reverted: {', '.join(reverted) or 'nothing to do'}")
+        elif command == 'current':
+            with db.engine.connect() as conn:
+                print(migrations.current_revision(conn) or 'base')
+        else:
+            print(__doc__)
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
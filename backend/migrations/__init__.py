@@ -0,0 +1,92 @@
+"""
+Minimal Alembic-style schema migrations.
+
+Each module in migrations/versions defines `revision`, `down_revision`,
+`upgrade(conn)` and `downgrade(conn)`. The applied revision is stored in
+the `schema_version` table. Revisions must be written so they are safe to
+run against a database that db.create_all() has already brought up to
+date (i.e. check before creating or altering).
+"""
+
+import glob
+import importlib.util
+import os
+
+from sqlalchemy import Column, MetaData, String, Table, select
+
+VERSIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'versions')
+
+_metadata = MetaData()
+schema_version = Table(
+    'schema_version', _metadata,
+    Column('version_num', String(32), primary_key=True)
+)
+
+
+def load_revisions():
+    """Revision modules ordered from the first to the latest"""
+    modules = {}
+    for path in sorted(glob.glob(os.path.join(VERSIONS_DIR, '[0-9]*.py'))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        spec = importlib.util.spec_from_file_location(f'migrations.versions.{name}', path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        modules[module.revision] = module
+
+    ordered = []
+    revision = next((r for r, m in modules.items() if m.down_revision is None), None)
+    while revision is not None:
+        ordered.append(modules[revision])
+        revision = next((r for r, m in modules.items() if m.down_revision == revision), None)
+    return ordered
+
+
+def current_revision(conn):
+    schema_version.create(conn, checkfirst=True)
+    return conn.execute(select(schema_version.c.version_num)).scalar()
+
+
+def _set_revision(conn, revision):
+    conn.execute(schema_version.delete())
+    if revision is not None:
+        conn.execute(schema_version.insert().values(version_num=revision))
+
+
+def upgrade(engine, target=None):
+    """Apply every revision after the current one (up to `target`)"""
+    revisions = load_revisions()
+    with engine.begin() as conn:
+        current = current_revision(conn)
+    start = 0
+    if current is not None:
+        start = [m.revision for m in revisions].index(current) + 1
+
+    applied = []
+    for module in revisions[start:]:
+        with engine.begin() as conn:
+            module.upgrade(conn)
+            _set_revision(conn, module.revision)
+        applied.append(module.revision)
+        if module.revision == target:
+            break
+    return applied
+
+
+def downgrade(engine, target=None):
+    """Revert revisions down to `target` (None reverts everything)"""
+    revisions = load_revisions()
+    with engine.begin() as conn:
+        current = current_revision(conn)
+    if current is None:
+        return []
+
+    reverted = []
+    index = [m.revision for m in revisions].index(current)
+    for module in reversed(revisions[:index + 1]):
+        if module.revision == target:
+            break
+        with engine.begin() as conn:
+            module.downgrade(conn)
+            _set_revision(conn, module.down_revision)
+        reverted.append(module.revision)
+    return reverted
@@ -0,0 +1,101 @@
+"""Normalize job tags and add listing indexes
+
+Moves the comma-separated jobs.tags column into a tag dictionary (`tags`)
+plus a `job_tags` association table, and adds indexes on
+(posting_date, id), location and job_type.
+"""
+
+from sqlalchemy import (Column, DateTime, ForeignKey, Index, Integer, MetaData, String, Table,
+                        inspect, select, text)
+
+revision = '0001'
+down_revision = None
+
+metadata = MetaData()
+
+jobs = Table(
+    'jobs', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('location', String(255)),
+    Column('posting_date', DateTime),
+    Column('job_type', String(100)),
+    Column('tags', String(500))
+)
+
+tags = Table(
+    'tags', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('name', String(100), nullable=False),
+    Column('normalized', String(100), nullable=False),
+    Index('ix_tags_normalized', 'normalized', unique=True)
+)
+
+job_tags = Table(
+    'job_tags', metadata,
+    Column('job_id', Integer, ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True),
+    Column('tag_id', Integer, ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True),
+    Index('ix_job_tags_tag_id_job_id', 'tag_id', 'job_id')
+)
+
+job_indexes = [
+    Index('ix_jobs_posting_date_id', jobs.c.posting_date, jobs.c.id),
+    Index('ix_jobs_location', jobs.c.location),
+    Index('ix_jobs_job_type', jobs.c.job_type),
+]
+
+
+def _has_tags_column(conn):
+    return any(column['name'] == 'tags' for column in inspect(conn).get_columns('jobs'))
+
+
+def upgrade(conn):
+    tags.create(conn, checkfirst=True)
+    job_tags.create(conn, checkfirst=True)
+    for index in job_indexes:
+        index.create(conn, checkfirst=True)
+
+    if not _has_tags_column(conn):
+        return
+
+    # Build the tag dictionary and links from the old comma-separated column
+    tag_ids = {row.normalized: row.id for row in conn.execute(select(tags.c.id, tags.c.normalized))}
+    links = set()
+    rows = conn.execute(select(jobs.c.id, jobs.c.tags).where(jobs.c.tags.isnot(None))).all()
+    for job_id, raw_tags in rows:
+        for name in raw_tags.split(','):
+            name = name.strip()
+            if not name:
+                continue
+            normalized = name.lower()
+            if normalized not in tag_ids:
+                result = conn.execute(tags.insert().values(name=name, normalized=normalized))
+                tag_ids[normalized] = result.inserted_primary_key[0]
+            links.add((job_id, tag_ids[normalized]))
+
+    existing = set(conn.execute(select(job_tags.c.job_id, job_tags.c.tag_id)).all())
+    new_links = [{'job_id': job_id, 'tag_id': tag_id} for job_id, tag_id in links - existing]
+    if new_links:
+        conn.execute(job_tags.insert(), new_links)
+
+    conn.execute(text('ALTER TABLE jobs DROP COLUMN tags'))
+
+
+def downgrade(conn):
+    if not _has_tags_column(conn):
+        conn.execute(text('ALTER TABLE jobs ADD COLUMN tags VARCHAR(500)'))
+
+    names = {}
+    rows = conn.execute(
+        select(job_tags.c.job_id, tags.c.name)
+        .select_from(job_tags.join(tags, tags.c.id == job_tags.c.tag_id))
+        .order_by(job_tags.c.job_id, tags.c.name)
+    )
+    for job_id, name in rows:
+        names.setdefault(job_id, []).append(name)
+    for job_id, job_tag_names in names.items():
+        conn.execute(jobs.update().where(jobs.c.id == job_id).values(tags=','.join(job_tag_names)))
+
+    for index in job_indexes:
+        index.drop(conn, checkfirst=True)
+    job_tags.drop(conn, checkfirst=True)
+    tags.drop(conn, checkfirst=True)
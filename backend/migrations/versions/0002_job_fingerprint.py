@@ -0,0 +1,65 @@
+"""Add a unique fingerprint to jobs
+
+Bulk imports upsert on this column. Existing rows are backfilled with the
+same hash scraper/listing_identity.fingerprint computes (they have no URL); when several
+rows share a fingerprint only the oldest keeps it.
+"""
+
+import hashlib
+
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table, bindparam, inspect, select, text
+
+revision = '0002'
+down_revision = '0001'
+
+metadata = MetaData()
+
+jobs = Table(
+    'jobs', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('title', String(255)),
+    Column('company', String(255)),
+    Column('location', String(255)),
+    Column('fingerprint', String(64))
+)
+
+fingerprint_index = Index('ix_jobs_fingerprint', jobs.c.fingerprint, unique=True)
+
+
+# A frozen copy of scraper/listing_identity.fingerprint as of this revision:
+# migrations must not change behaviour when the live code does. Don't
+# edit it; a new fingerprint scheme needs its own migration.
+def _fingerprint(title, company, location):
+    parts = ['', title or '', company or '', location or '']
+    key = '\x1f'.join(' '.join(part.split()).lower() for part in parts)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+def upgrade(conn):
+    if not any(column['name'] == 'fingerprint' for column in inspect(conn).get_columns('jobs')):
+        conn.execute(text('ALTER TABLE jobs ADD COLUMN fingerprint VARCHAR(64)'))
+
+    seen = set(conn.execute(select(jobs.c.fingerprint).where(jobs.c.fingerprint.isnot(None))).scalars())
+    backfill = []
+    rows = conn.execute(
+        select(jobs.c.id, jobs.c.title, jobs.c.company, jobs.c.location)
+        .where(jobs.c.fingerprint.is_(None))
+        .order_by(jobs.c.id)
+    )
+    for job_id, title, company, location in rows:
+        value = _fingerprint(title, company, location)
+        if value not in seen:
+            seen.add(value)
+            backfill.append({'job_id': job_id, 'value': value})
+    if backfill:
+        conn.execute(
+            jobs.update().where(jobs.c.id == bindparam('job_id')).values(fingerprint=bindparam('value')),
+            backfill
+        )
+
+    fingerprint_index.create(conn, checkfirst=True)
+
+
+def downgrade(conn):
+    fingerprint_index.drop(conn, checkfirst=True)
+    conn.execute(text('ALTER TABLE jobs DROP COLUMN fingerprint'))
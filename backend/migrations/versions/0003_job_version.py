@@ -0,0 +1,19 @@
+"""Add a version counter to jobs
+
+Job.version is bumped on every ORM update and bulk upsert; cached
+serialized jobs are keyed on it.
+"""
+
+from sqlalchemy import inspect, text
+
+revision = '0003'
+down_revision = '0002'
+
+
+def upgrade(conn):
+    if not any(column['name'] == 'version' for column in inspect(conn).get_columns('jobs')):
+        conn.execute(text('ALTER TABLE jobs ADD COLUMN version INTEGER NOT NULL DEFAULT 1'))
+
+
+def downgrade(conn):
+    conn.execute(text('ALTER TABLE jobs DROP COLUMN version'))
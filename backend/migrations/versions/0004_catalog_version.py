@@ -0,0 +1,28 @@
+"""Add the catalog_version table
+
+A single row counting writes to jobs. Every worker polls it before serving
+GET /jobs and drops its cached responses when it has moved on.
+"""
+
+from sqlalchemy import Column, Integer, MetaData, Table, select
+
+revision = '0004'
+down_revision = '0003'
+
+metadata = MetaData()
+
+catalog_version = Table(
+    'catalog_version', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('generation', Integer, nullable=False, default=0)
+)
+
+
+def upgrade(conn):
+    catalog_version.create(conn, checkfirst=True)
+    if conn.execute(select(catalog_version.c.id).where(catalog_version.c.id == 1)).first() is None:
+        conn.execute(catalog_version.insert().values(id=1, generation=0))
+
+
+def downgrade(conn):
+    catalog_version.drop(conn, checkfirst=True)
@@ -0,0 +1,23 @@
+"""Add description and url to jobs
+
+Both were accepted (and returned by the in-memory engine) but not stored
+by the SQL engine.
+"""
+
+from sqlalchemy import inspect, text
+
+revision = '0005'
+down_revision = '0004'
+
+
+def upgrade(conn):
+    columns = {column['name'] for column in inspect(conn).get_columns('jobs')}
+    if 'description' not in columns:
+        conn.execute(text('ALTER TABLE jobs ADD COLUMN description TEXT'))
+    if 'url' not in columns:
+        conn.execute(text('ALTER TABLE jobs ADD COLUMN url VARCHAR(2048)'))
+
+
+def downgrade(conn):
+    conn.execute(text('ALTER TABLE jobs DROP COLUMN url'))
+    conn.execute(text('ALTER TABLE jobs DROP COLUMN description'))
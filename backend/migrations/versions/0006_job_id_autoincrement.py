@@ -0,0 +1,70 @@
+"""Never reuse job ids on SQLite
+
+SQLite hands out max(id) + 1, so deleting the newest job frees its id for
+the next insert, and the serialized-JSON cache (keyed on id and version)
+could then serve the deleted job for the new one. AUTOINCREMENT ids are
+never reused. SQLite can't add it to an existing table, so the table is
+rebuilt: copied into a new one, swapped in and its indexes recreated.
+Other databases don't reuse ids and are left alone.
+
+The app doesn't enable SQLite foreign key enforcement, so dropping the
+old table leaves job_tags alone.
+"""
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, Text, inspect, text
+
+revision = '0006'
+down_revision = '0005'
+
+# The jobs table as of this revision, minus indexes (copied from the old table)
+COLUMNS = ('id', 'title', 'company', 'location', 'posting_date', 'job_type', 'description', 'url',
+           'fingerprint', 'version')
+
+
+def _jobs_table(name, autoincrement):
+    return Table(
+        name, MetaData(),
+        Column('id', Integer, primary_key=True),
+        Column('title', String(255), nullable=False),
+        Column('company', String(255), nullable=False),
+        Column('location', String(255), nullable=False),
+        Column('posting_date', DateTime, nullable=False),
+        Column('job_type', String(100), nullable=False),
+        Column('description', Text),
+        Column('url', String(2048)),
+        Column('fingerprint', String(64)),
+        Column('version', Integer, nullable=False, server_default='1'),
+        sqlite_autoincrement=autoincrement
+    )
+
+
+def _has_autoincrement(conn):
+    sql = conn.execute(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'jobs'")).scalar()
+    return 'AUTOINCREMENT' in (sql or '').upper()
+
+
+def _rebuild(conn, autoincrement):
+    index_sql = conn.execute(text(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'jobs' AND sql IS NOT NULL"
+    )).scalars().all()
+    columns = ', '.join(column['name'] for column in inspect(conn).get_columns('jobs')
+                        if column['name'] in COLUMNS)
+
+    _jobs_table('jobs_rebuild', autoincrement).create(conn)
+    conn.execute(text(f"INSERT INTO jobs_rebuild ({columns}) SELECT {columns} FROM jobs"))
+    conn.execute(text("DROP TABLE jobs"))
+    conn.execute(text("ALTER TABLE jobs_rebuild RENAME TO jobs"))
+    for sql in index_sql:
+        conn.execute(text(sql))
+
+
+def upgrade(conn):
+    if conn.dialect.name != 'sqlite' or _has_autoincrement(conn):
+        return
+    _rebuild(conn, autoincrement=True)
+
+
+def downgrade(conn):
+    if conn.dialect.name != 'sqlite' or not _has_autoincrement(conn):
+        return
+    _rebuild(conn, autoincrement=False)
@@ -1,26 +1,172 @@
+import threading
+from collections import OrderedDict
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
+from sqlalchemy import event, select
+from json_provider import dumps_bytes
+from dates import utcnow
+from search import normalize_tag
 
 db = SQLAlchemy()
 
+class JSONCache:
+    """
+    Serialized to_dict() per job id, stored as (version, bytes). An entry is
+    only served while its version matches the row, so it can't go stale even
+    when another process changed the job. Holds at most `max_entries` jobs,
+    evicting the least recently used.
+    """
+
+    def __init__(self, max_entries=50000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, job_id, version):
+        with self._lock:
+            cached = self._entries.get(job_id)
+            if cached is None or cached[0] != version:
+                return None
+            self._entries.move_to_end(job_id)
+            return cached[1]
+
+    def put(self, job_id, version, data):
+        with self._lock:
+            self._entries[job_id] = (version, data)
+            self._entries.move_to_end(job_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, job_id):
+        with self._lock:
+            self._entries.pop(job_id, None)
+
+# Sized from JSON_CACHE_MAX_ENTRIES by create_app()
+json_cache = JSONCache()
+
+# A single row counting writes to the jobs table, bumped in the writing
+# transaction. Each worker keys its GET /jobs response cache on it, so a
+# write made by any worker (or a bulk import) invalidates every cache.
+catalog_version = db.Table(
+    'catalog_version',
+    db.Column('id', db.Integer, primary_key=True),
+    db.Column('generation', db.Integer, nullable=False, default=0)
+)
+
+
+def bump_catalog_version(connection):
+    """Count a write to the jobs table; call inside the write's transaction"""
+    connection.execute(
+        catalog_version.update()
+        .where(catalog_version.c.id == 1)
+        .values(generation=catalog_version.c.generation + 1)
+    )
+
+
+def read_catalog_version(connection):
+    return connection.execute(
+        select(catalog_version.c.generation).where(catalog_version.c.id == 1)
+    ).scalar() or 0
+
+# Many-to-many link between jobs and the tag dictionary
+job_tags = db.Table(
+    'job_tags',
+    db.Column('job_id', db.Integer, db.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('tag_id', db.Integer, db.ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True),
+    # Tag filters look up jobs by tag, so index the reverse direction too
+    db.Index('ix_job_tags_tag_id_job_id', 'tag_id', 'job_id')
+)
+
+class Tag(db.Model):
+    __tablename__ = 'tags'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    normalized = db.Column(db.String(100), nullable=False, unique=True, index=True)
+
+    @staticmethod
+    def normalize(name):
+        return normalize_tag(name)
+
+    @classmethod
+    def get_or_create_many(cls, names):
+        """Resolve tag names to Tag rows, creating any that don't exist yet"""
+        wanted = {}
+        for name in names:
+            if name and name.strip():
+                wanted.setdefault(cls.normalize(name), name.strip())
+        if not wanted:
+            return []
+
+        existing = cls.query.filter(cls.normalized.in_(list(wanted))).all()
+        tags = {tag.normalized: tag for tag in existing}
+        for normalized, name in wanted.items():
+            if normalized not in tags:
+                tags[normalized] = cls(name=name, normalized=normalized)
+                db.session.add(tags[normalized])
+        return [tags[normalized] for normalized in wanted]
+
 class Job(db.Model):
     __tablename__ = 'jobs'
+    __table_args__ = (
+        # Keyset paging and date sorting walk this index
+        db.Index('ix_jobs_posting_date_id', 'posting_date', 'id'),
+        db.Index('ix_jobs_location', 'location'),
+        db.Index('ix_jobs_job_type', 'job_type'),
+        # Ids of deleted jobs are never handed out again, so a cached
+        # (id, version) can't match a different job (migration 0006)
+        {'sqlite_autoincrement': True},
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
     company = db.Column(db.String(255), nullable=False)
     location = db.Column(db.String(255), nullable=False)
-    posting_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    posting_date = db.Column(db.DateTime, nullable=False, default=utcnow)
     job_type = db.Column(db.String(100), nullable=False)
-    tags = db.Column(db.String(500))  # Comma-separated values
+    description = db.Column(db.Text)
+    url = db.Column(db.String(2048))
+    # Listing identity used to dedupe bulk imports and re-scrapes
+    fingerprint = db.Column(db.String(64), unique=True, index=True)
+    # Bumped on every change (tags included); keys the serialized-JSON cache
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    tags = db.relationship('Tag', secondary=job_tags, lazy='selectin', order_by=Tag.name)
 
     def to_dict(self):
+        # Same fields as the in-memory engine (JobRecord.public_dict):
+        # string id, naive-UTC ISO 8601 date
         return {
-            "id": self.id,
+            "id": str(self.id),
             "title": self.title,
             "company": self.company,
             "location": self.location,
-            "posting_date": self.posting_date.strftime("%Y-%m-%d"),
+            "posting_date": self.posting_date.isoformat(),
             "job_type": self.job_type,
-            "tags": self.tags.split(",") if self.tags else []
+            "tags": [tag.name for tag in self.tags],
+            "description": self.description or "",
+            "url": self.url
         }
+
+    def to_json(self):
+        """to_dict() as JSON bytes, cached until the job changes"""
+        data = json_cache.get(self.id, self.version)
+        if data is None:
+            data = dumps_bytes(self.to_dict())
+            json_cache.put(self.id, self.version, data)
+        return data
+
+@event.listens_for(Job, 'before_update')
+def _bump_version(mapper, connection, target):
+    target.version = (target.version or 0) + 1
+
+@event.listens_for(Job, 'after_delete')
+def _forget_json(mapper, connection, target):
+    json_cache.discard(target.id)
+
+@event.listens_for(Job, 'after_insert')
+@event.listens_for(Job, 'after_update')
+@event.listens_for(Job, 'after_delete')
+def _count_write(mapper, connection, target):
+    bump_catalog_version(connection)
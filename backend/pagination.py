@@ -0,0 +1,94 @@
+"""
+Keyset (cursor) pagination helpers shared by the /jobs handlers.
+
+A cursor is an opaque, URL-safe token encoding the sort key of the last
+item on the previous page, e.g. (posting_date, id). The next page is
+everything strictly after that key, so no OFFSET scan is ever needed.
+"""
+
+import base64
+import json
+
+MAX_PAGE_SIZE = 100
+
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+TOTAL_COUNT_HEADER = 'X-Total-Count'
+
+
+def encode_cursor(key):
+    """Encode a sort key tuple as an opaque cursor token"""
+    raw = json.dumps(list(key), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Decode a cursor token back into a sort key tuple"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(key, list) or not key:
+        raise ValueError('Invalid cursor')
+    return tuple(key)
+
+
+def parse_page_args(args):
+    """
+    Read `limit`, `cursor` and `include_total` from the query string.
+
+    Returns (limit, cursor_key, include_total). limit is None when the
+    client did not ask for paging; cursor_key is None on the first page.
+    Raises ValueError on malformed input.
+    """
+    limit = args.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValueError('limit must be an integer')
+        if limit < 1:
+            raise ValueError('limit must be positive')
+        limit = min(limit, MAX_PAGE_SIZE)
+
+    cursor = args.get('cursor')
+    cursor_key = decode_cursor(cursor) if cursor else None
+    if cursor_key is not None and limit is None:
+        limit = MAX_PAGE_SIZE
+
+    include_total = args.get('include_total', '').lower() in ('1', 'true', 'yes')
+    return limit, cursor_key, include_total
+
+
+def paginate(items, key, limit, cursor_key, reverse=False):
+    """
+    Take one page from `items`, which must already be sorted by `key`.
+
+    Returns (page, next_cursor_key). next_cursor_key is None on the last page.
+    """
+    if cursor_key is not None:
+        try:
+            if reverse:
+                items = [item for item in items if key(item) < cursor_key]
+            else:
+                items = [item for item in items if key(item) > cursor_key]
+        except TypeError:
+            raise ValueError('Invalid cursor')
+    if limit is None:
+        return list(items), None
+
+    page = list(items[:limit + 1])
+    if len(page) > limit:
+        page = page[:limit]
+        return page, key(page[-1])
+    return page, None
+
+
+def page_headers(next_key, total=None):
+    """Build the paging headers for a response"""
+    headers = {}
+    if next_key is not None:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(next_key)
+    if total is not None:
+        headers[TOTAL_COUNT_HEADER] = str(total)
+    return headers
@@ -0,0 +1,217 @@
+"""
+Durable storage for the in-memory JobStore.
+
+Every mutation is appended to a journal (NDJSON, one operation per line)
+as it happens; once the journal grows past `snapshot_every` operations the
+whole store is written to a compacted snapshot and a fresh journal is
+started. Files are numbered by generation:
+
+    snapshot-<n>.ndjson   header line, then one job per line
+    journal-<n>.ndjson    operations applied after snapshot <n>
+
+A snapshot is written under a temporary name and renamed into place, so
+a crash never leaves a half-written snapshot behind; a torn last journal
+line is ignored on replay. On startup the newest snapshot is memory-mapped
+and parsed line by line, then its journal is replayed on top.
+"""
+
+import glob
+import json
+import mmap
+import os
+import re
+import threading
+
+from json_provider import dumps_bytes
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+SNAPSHOT_FORMAT = 1
+FILE_RE = re.compile(r'(snapshot|journal)-(\d+)\.ndjson$')
+
+
+def _numeric_id(job_id):
+    try:
+        return int(job_id)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _iter_lines(path):
+    """Yield the lines of a file through a read-only memory map"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield from iter(mapped.readline, b'')
+
+
+class JobLog:
+    """Snapshot + append-only journal for one JobStore (attach as store.journal)"""
+
+    def __init__(self, directory, snapshot_every=50_000, fsync=False):
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self.generation = 0
+        self.max_numeric_id = 0   # highest numeric job id ever stored
+        self._journal = None
+        self._journal_ops = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, kind, generation):
+        return os.path.join(self.directory, f'{kind}-{generation}.ndjson')
+
+    def _generations(self, kind):
+        generations = []
+        for path in glob.glob(os.path.join(self.directory, f'{kind}-*.ndjson')):
+            match = FILE_RE.search(os.path.basename(path))
+            if match:
+                generations.append(int(match.group(2)))
+        return sorted(generations)
+
+    # ------ Startup ------
+    def restore(self, store):
+        """
+        Load the newest snapshot and replay the journals written since into
+        `store` (which is cleared first), then attach this log as the
+        store's journal. Returns False when there was nothing on disk, in
+        which case the store keeps its contents and they become the first
+        snapshot.
+        """
+        store.journal = None
+        snapshots = self._generations('snapshot')
+        if not snapshots:
+            jobs = store.jobs_by_date()
+            self.max_numeric_id = max((_numeric_id(job['id']) for job in jobs), default=0)
+            self.write_snapshot(self.rotate(), jobs)
+            store.journal = self
+            return False
+
+        snapshot_generation = snapshots[-1]
+        store.clear()
+        lines = _iter_lines(self._path('snapshot', snapshot_generation))
+        header = _loads(next(lines))
+        if header.get('format') != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported snapshot format: {header.get('format')}")
+        self.max_numeric_id = header.get('max_numeric_id', 0)
+        store.load(_loads(line) for line in lines)
+
+        # A crash between rotating the journal and finishing the snapshot
+        # leaves more than one journal after the newest snapshot
+        replayed = 0
+        journals = [g for g in self._generations('journal') if g >= snapshot_generation] or [snapshot_generation]
+        for generation in journals:
+            replayed = self._replay(store, self._path('journal', generation))
+        self.generation = journals[-1]
+        self._open_journal(replayed)
+        if self.needs_snapshot() or len(journals) > 1:
+            self.write_snapshot(self.rotate(), store.jobs_by_date())
+        store.journal = self
+        return True
+
+    def _replay(self, store, path):
+        """Apply a journal to `store`; returns the number of operations"""
+        if not os.path.exists(path):
+            return 0
+        count = 0
+        valid_bytes = 0
+        lines = _iter_lines(path)
+        try:
+            for line in lines:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError('incomplete line')
+                    op = _loads(line)
+                except ValueError:
+                    break  # torn write at the end of the journal
+                if op['op'] == 'put':
+                    job = op['job']
+                    store.add(job)
+                    self.max_numeric_id = max(self.max_numeric_id, _numeric_id(job['id']))
+                elif op['op'] == 'delete':
+                    store.delete(op['id'])
+                count += 1
+                valid_bytes += len(line)
+        finally:
+            lines.close()
+
+        # Drop a torn tail so new operations aren't appended after it
+        if valid_bytes < os.path.getsize(path):
+            with open(path, 'r+b') as f:
+                f.truncate(valid_bytes)
+        return count
+
+    # ------ Recording ------
+    def _open_journal(self, existing_ops=0):
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = open(self._path('journal', self.generation), 'ab')
+        self._journal_ops = existing_ops
+
+    def _append(self, op):
+        with self._lock:
+            self._journal.write(dumps_bytes(op) + b'\n')
+            self._journal.flush()
+            if self.fsync:
+                os.fsync(self._journal.fileno())
+            self._journal_ops += 1
+
+    def record_put(self, job):
+        self.max_numeric_id = max(self.max_numeric_id, _numeric_id(job['id']))
+        self._append({'op': 'put', 'job': job.to_dict()})
+
+    def record_delete(self, job_id):
+        self._append({'op': 'delete', 'id': job_id})
+
+    def needs_snapshot(self):
+        return self._journal_ops >= self.snapshot_every
+
+    # ------ Compaction ------
+    def rotate(self):
+        """
+        Start a new journal generation and return its number. Call while the
+        store can't change, then write_snapshot() the store's jobs as of
+        that moment.
+        """
+        with self._lock:
+            self.generation += 1
+            self._open_journal()
+            return self.generation
+
+    def write_snapshot(self, generation, jobs):
+        """
+        Write `jobs` as snapshot `generation` and drop the files it
+        supersedes. Jobs changed after rotate() may already show their new
+        state; the journal replays those changes on top either way.
+        """
+        path = self._path('snapshot', generation)
+        temp_path = path + '.tmp'
+        header = {'format': SNAPSHOT_FORMAT, 'count': len(jobs), 'max_numeric_id': self.max_numeric_id}
+        with open(temp_path, 'wb') as f:
+            f.write(dumps_bytes(header) + b'\n')
+            # Date order, so the index sort on restore has little to do
+            for job in jobs:
+                f.write(dumps_bytes(job.to_dict()) + b'\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        with self._lock:
+            self._remove_older(generation)
+
+    def _remove_older(self, generation):
+        for kind in ('snapshot', 'journal'):
+            for old in self._generations(kind):
+                if old < generation:
+                    os.remove(self._path(kind, old))
+
+    def close(self):
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
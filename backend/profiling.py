@@ -0,0 +1,58 @@
+"""
+Profile a single request (?profile=1, when PROFILE_REQUESTS is on).
+
+Uses pyinstrument (pip install pyinstrument) when it is installed for a
+readable call tree, and the standard library's cProfile otherwise. The
+response body is replaced by the profile as plain text; the status and
+size of the real response are kept in X-Profiled-Status and
+X-Profiled-Length.
+"""
+
+import cProfile
+import io
+import pstats
+
+from flask import Response
+
+try:
+    from pyinstrument import Profiler
+except ImportError:  # optional, cProfile is the fallback
+    Profiler = None
+
+# Lines of cProfile output (functions by cumulative time)
+CPROFILE_LIMIT = 40
+
+
+def start():
+    """Start profiling the current thread; pass the result to report()"""
+    if Profiler is not None:
+        profiler = Profiler()
+        profiler.start()
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    return profiler
+
+
+def _render(profiler):
+    if Profiler is not None and isinstance(profiler, Profiler):
+        profiler.stop()
+        return 'pyinstrument', profiler.output_text(unicode=True, color=False)
+    profiler.disable()
+    out = io.StringIO()
+    stats = pstats.Stats(profiler, stream=out)
+    stats.strip_dirs().sort_stats('cumulative').print_stats(CPROFILE_LIMIT)
+    return 'cProfile', out.getvalue()
+
+
+def report(profiler, response):
+    """Stop `profiler` and return a response carrying its report"""
+    name, text = _render(profiler)
+    length = None if response.direct_passthrough else response.calculate_content_length()
+    headers = {
+        'X-Profiler': name,
+        'X-Profiled-Status': str(response.status_code),
+        'X-Profiled-Length': str(length if length is not None else ''),
+        'Cache-Control': 'no-store',
+    }
+    return Response(text, status=200, headers=headers, mimetype='text/plain')
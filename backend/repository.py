@@ -0,0 +1,481 @@
+"""
+Job storage engines behind the /jobs routes.
+
+Every engine implements JobRepository, so routes.py has one set of
+handlers whatever stores the jobs. JOB_ENGINE picks one:
+
+    sql     the SQLAlchemy Job table: SQLite (FTS5 search) or any other
+            database DATABASE_URL points at, e.g. Postgres (LIKE search)
+    memory  the indexed in-process JobStore (optionally persisted with
+            JOB_STORE_DIR or shared between workers with JOB_STORE_BACKEND)
+
+All engines return jobs with the same fields (see JobRecord.public_dict):
+string ids and naive-UTC ISO 8601 posting dates. They agree on filters
+and search too: tag= is an exact match on the normalized tag and q=
+searches search.SEARCH_FIELDS plus tag names. Each engine times the stages
+of a listing query in JOBS_STAGE_SECONDS.
+"""
+
+import threading
+from datetime import datetime
+
+from sqlalchemy import and_, column, desc, or_, select, table, text
+from sqlalchemy.exc import IntegrityError
+
+from bulk import bulk_upsert, refingerprint, validate_jobs
+from models import db, Job, Tag, read_catalog_version
+from pagination import paginate, parse_page_args
+from search import FTS_TABLE, SEARCH_FIELDS, fts_enabled, fts_query, tokenize
+from job_store import DuplicateJobError
+from shared_store import SharedJobStore
+from dates import parse_posting_date, utcnow
+from metrics import JOBS_STAGE_SECONDS
+
+JOB_ENGINES = ('sql', 'memory')
+
+# Fields a PUT/PATCH may change
+UPDATABLE_FIELDS = ('title', 'company', 'location', 'job_type', 'tags', 'description', 'url')
+
+
+def _numeric_id(job_id):
+    try:
+        return int(job_id)
+    except (TypeError, ValueError):
+        return 0
+
+
+class JobQuery:
+    """Filters, sort order and paging for one GET /jobs request"""
+
+    def __init__(self, q=None, location=None, job_type=None, tag=None, title=None, company=None,
+                 posted_after=None, posted_before=None, sort=None, limit=None, cursor_key=None,
+                 include_total=False):
+        self.q = q
+        self.location = location
+        self.job_type = job_type
+        self.tag = tag
+        self.title = title
+        self.company = company
+        self.posted_after = posted_after
+        self.posted_before = posted_before
+        self.sort = sort
+        self.limit = limit
+        self.cursor_key = cursor_key
+        self.include_total = include_total
+
+    @classmethod
+    def from_args(cls, args):
+        """Parse a query string; raises ValueError on malformed input"""
+        limit, cursor_key, include_total = parse_page_args(args)
+        # Posting date range [posted_after, posted_before)
+        try:
+            posted_after = parse_posting_date(args.get('posted_after'))
+            posted_before = parse_posting_date(args.get('posted_before'))
+        except ValueError:
+            raise ValueError('Invalid posted_after/posted_before date')
+        return cls(
+            q=args.get('q') or None,
+            location=args.get('location') or None,
+            job_type=args.get('job_type') or None,
+            tag=args.get('tag') or args.get('tags') or None,
+            title=args.get('title') or None,
+            company=args.get('company') or None,
+            posted_after=posted_after,
+            posted_before=posted_before,
+            sort=args.get('sort'),
+            limit=limit,
+            cursor_key=cursor_key,
+            include_total=include_total
+        )
+
+    @property
+    def descending(self):
+        return (self.sort or 'posting_date_desc') != 'posting_date_asc'
+
+
+class JobRepository:
+    """
+    Storage interface for jobs. Jobs go in as dicts with posting_date as a
+    datetime and come out as dicts ready for JSON.
+    """
+
+    def list_jobs(self, query):
+        """
+        One page of jobs matching a JobQuery. Returns (encoded, next_key,
+        total): each job as JSON bytes, the sort key to continue from (None
+        on the last page) and the match count if asked for. Raises
+        ValueError for a bad cursor.
+        """
+        raise NotImplementedError
+
+    def get(self, job_id):
+        """The job with this id, or None"""
+        raise NotImplementedError
+
+    def create(self, job):
+        """
+        Store a new job (with its fingerprint) and return it. Raises
+        DuplicateJobError if a job with the same fingerprint exists.
+        """
+        raise NotImplementedError
+
+    def update(self, job_id, fields):
+        """
+        Change the given UPDATABLE_FIELDS; returns the job or None if
+        missing. The fingerprint follows changes to the listing's identity
+        (see bulk.refingerprint); raises DuplicateJobError if that makes it
+        another job's.
+        """
+        raise NotImplementedError
+
+    def delete(self, job_id):
+        """Remove a job; returns False if there was none"""
+        raise NotImplementedError
+
+    def upsert(self, job):
+        """
+        Store a scraped job, updating the existing job with the same
+        fingerprint. Returns (job, created).
+        """
+        raise NotImplementedError
+
+    def bulk_upsert(self, jobs, chunk_size):
+        """Upsert jobs from validate_jobs(); returns (created, updated)"""
+        raise NotImplementedError
+
+    def count(self):
+        raise NotImplementedError
+
+    def fingerprints(self):
+        """
+        Fingerprints of the stored jobs, so incremental scrapes treat
+        exactly the listings this catalog has as known
+        """
+        raise NotImplementedError
+
+    def sync(self):
+        """Catch up with changes made elsewhere before serving a read"""
+        return 0
+
+
+# ------ In-memory engine ------
+class MemoryJobRepository(JobRepository):
+    def __init__(self, store, first_id=None):
+        """New ids start after the highest numeric id in `store` (or at `first_id` if higher)"""
+        self.store = store
+        self._next_id = max(max((_numeric_id(job['id']) for job in store), default=0) + 1, first_id or 1)
+        self._id_lock = threading.Lock()
+
+    def next_id(self):
+        """Allocate a job id (from the shared counter in shared mode)"""
+        if isinstance(self.store, SharedJobStore):
+            return self.store.next_id()
+        with self._id_lock:
+            job_id = self._next_id
+            self._next_id += 1
+        return str(job_id)
+
+    def _stage(self, stage):
+        return JOBS_STAGE_SECONDS.time(engine='memory', stage=stage)
+
+    def list_jobs(self, query):
+        store = self.store
+        # Full-text search (BM25 ranked) over SEARCH_FIELDS and tags
+        scores = None
+        if query.q:
+            with self._stage('search'):
+                scores = store.search(query.q)
+
+        # Substring filters are checked per job as the results are walked
+        title_filter = (query.title or '').lower()
+        company_filter = (query.company or '').lower()
+
+        def matches(job):
+            return (title_filter in job['title'].lower()
+                    and company_filter in job['company'].lower())
+
+        if scores is not None and query.sort is None:
+            # Relevance order: rank the search hits that pass the filters
+            with self._stage('filter'):
+                jobs = store.filter(
+                    location=query.location, job_type=query.job_type, tag=query.tag, ids=scores.keys(),
+                    posted_after=query.posted_after, posted_before=query.posted_before
+                )
+                jobs = [job for job in jobs if matches(job)]
+            with self._stage('sort'):
+                sort_key = lambda x: (-scores[x['id']], x['id'])
+                jobs.sort(key=sort_key)
+                total = len(jobs) if query.include_total else None
+                page, next_key = paginate(jobs, sort_key, query.limit, query.cursor_key)
+            with self._stage('serialize'):
+                return store.encode_all(page), next_key, total
+
+        # Date order: walk the store's sorted date index from the cursor,
+        # so nothing is copied or sorted per request
+        cursor = None
+        if query.cursor_key is not None:
+            try:
+                cursor = (datetime.fromisoformat(query.cursor_key[0]), str(query.cursor_key[1]))
+            except (TypeError, ValueError, IndexError):
+                raise ValueError('Invalid cursor')
+
+        # Filtering and date order happen together in the index walk
+        with self._stage('filter'):
+            page, next_key, total = store.list_by_date(
+                query.descending, query.posted_after, query.posted_before, cursor, query.limit,
+                predicate=matches if title_filter or company_filter else None,
+                include_total=query.include_total,
+                location=query.location, job_type=query.job_type, tag=query.tag,
+                ids=scores.keys() if scores is not None else None
+            )
+        if next_key is not None:
+            next_key = (next_key[0].isoformat(), next_key[1])
+        with self._stage('serialize'):
+            return store.encode_all(page), next_key, total
+
+    def get(self, job_id):
+        job = self.store.get(job_id)
+        return job.public_dict() if job is not None else None
+
+    def create(self, job):
+        job = dict(job, id=self.next_id(), posting_date=job['posting_date'].isoformat())
+        return self.store.add(job, unique=True).public_dict()
+
+    def update(self, job_id, fields):
+        # One store write, so concurrent updates to other fields aren't
+        # overwritten with stale values
+        job = self.store.update(job_id, fields, derive=refingerprint)
+        return job.public_dict() if job is not None else None
+
+    def delete(self, job_id):
+        return self.store.delete(job_id) is not None
+
+    def upsert(self, job):
+        job, created = self.store.upsert(job, self.next_id)
+        return job.public_dict(), created
+
+    def bulk_upsert(self, jobs, chunk_size):
+        now = utcnow().isoformat()
+        for job in jobs:
+            job['posting_date'] = job['posting_date'].isoformat() if job['posting_date'] else now
+        return self.store.bulk_upsert(jobs, self.next_id)
+
+    def count(self):
+        return len(self.store)
+
+    def fingerprints(self):
+        return self.store.fingerprints()
+
+    def sync(self):
+        return self.store.sync()
+
+
+# ------ SQL engine ------
+def _keyset_page(query, sort_column, cursor_key, descending):
+    """Order by (sort_column, Job.id) and skip past the cursor without OFFSET"""
+    if descending:
+        if cursor_key is not None:
+            query = query.filter(or_(
+                sort_column < cursor_key[0],
+                and_(sort_column == cursor_key[0], Job.id < cursor_key[1])
+            ))
+        return query.order_by(desc(sort_column), desc(Job.id))
+
+    if cursor_key is not None:
+        query = query.filter(or_(
+            sort_column > cursor_key[0],
+            and_(sort_column == cursor_key[0], Job.id > cursor_key[1])
+        ))
+    return query.order_by(sort_column, Job.id)
+
+
+class SQLJobRepository(JobRepository):
+    """
+    Jobs in the SQLAlchemy Job table; call from within an app context.
+    `on_change` callbacks run when sync() finds the jobs changed since the
+    last call, by this worker or any other.
+    """
+
+    def __init__(self):
+        self.on_change = []
+        self._catalog_version = None
+
+    def sync(self):
+        # One primary-key read of the shared write counter
+        catalog_version = read_catalog_version(db.session.connection())
+        if catalog_version == self._catalog_version:
+            return 0
+        self._catalog_version = catalog_version
+        for callback in self.on_change:
+            callback()
+        return 1
+
+    def _get(self, job_id):
+        try:
+            return db.session.get(Job, int(job_id))
+        except (TypeError, ValueError):
+            return None
+
+    def _stage(self, stage):
+        return JOBS_STAGE_SECONDS.time(engine=db.engine.dialect.name, stage=stage)
+
+    def list_jobs(self, query):
+        sql = Job.query
+
+        # Filtering - exact matches so the location/job_type/tag indexes apply
+        if query.job_type:
+            sql = sql.filter(Job.job_type == query.job_type)
+        if query.location:
+            sql = sql.filter(Job.location == query.location)
+        if query.tag:
+            sql = sql.filter(Job.tags.any(Tag.normalized == Tag.normalize(query.tag)))
+        if query.title:
+            sql = sql.filter(Job.title.ilike(f"%{query.title}%"))
+        if query.company:
+            sql = sql.filter(Job.company.ilike(f"%{query.company}%"))
+
+        # Posting date range - served by the date index
+        if query.posted_after:
+            sql = sql.filter(Job.posting_date >= query.posted_after)
+        if query.posted_before:
+            sql = sql.filter(Job.posting_date < query.posted_before)
+
+        # Full-text search: FTS5 + bm25 ranking on SQLite, LIKE elsewhere
+        matches = None
+        if query.q and fts_query(query.q):
+            if fts_enabled(db.engine):
+                fts = table(FTS_TABLE, column("rowid"), column("rank"))
+                matches = (
+                    select(fts.c.rowid.label("job_id"), fts.c.rank.label("score"))
+                    .where(text(f"{FTS_TABLE} MATCH :match").bindparams(match=fts_query(query.q)))
+                    .subquery()
+                )
+                sql = sql.join(matches, matches.c.job_id == Job.id)
+            else:
+                # Every term must appear in one of the searched fields
+                for token in tokenize(query.q):
+                    pattern = f"%{token}%"
+                    sql = sql.filter(or_(
+                        *(getattr(Job, field).ilike(pattern) for field in SEARCH_FIELDS),
+                        Job.tags.any(Tag.name.ilike(pattern))
+                    ))
+
+        # Relevance order when searching without an explicit sort
+        by_relevance = matches is not None and query.sort is None
+
+        cursor_key = query.cursor_key
+        if cursor_key is not None:
+            try:
+                sort_value, cursor_id = cursor_key
+                if by_relevance:
+                    sort_value = float(sort_value)
+                else:
+                    sort_value = datetime.fromisoformat(sort_value)
+                cursor_key = (sort_value, int(cursor_id))
+            except (ValueError, TypeError):
+                raise ValueError("Invalid cursor")
+
+        total = None
+        if query.include_total:
+            with self._stage("count"):
+                total = sql.count()
+
+        # Sorting - keyset on (sort value, id) so pages never need OFFSET
+        if by_relevance:
+            # bm25 ranks are negative; lower is a better match
+            sql = _keyset_page(sql.add_columns(matches.c.score), matches.c.score, cursor_key, False)
+        else:
+            sql = _keyset_page(sql, Job.posting_date, cursor_key, query.descending)
+
+        # Filtering and sorting both run in the database
+        with self._stage("query"):
+            rows = sql.all() if query.limit is None else sql.limit(query.limit + 1).all()
+        next_key = None
+        if query.limit is not None and len(rows) > query.limit:
+            rows = rows[:query.limit]
+            last = rows[-1]
+            if by_relevance:
+                next_key = (last.score, last.Job.id)
+            else:
+                next_key = (last.posting_date.isoformat(), last.id)
+
+        jobs = [row.Job for row in rows] if by_relevance else rows
+        # Each job's JSON is cached per version, so the body is mostly a byte join
+        with self._stage("serialize"):
+            return [job.to_json() for job in jobs], next_key, total
+
+    def get(self, job_id):
+        job = self._get(job_id)
+        return job.to_dict() if job is not None else None
+
+    def _check_fingerprint(self, fingerprint, job_id=None):
+        other_id = db.session.query(Job.id).filter_by(fingerprint=fingerprint).scalar() if fingerprint else None
+        if other_id is not None and other_id != job_id:
+            raise DuplicateJobError(str(other_id))
+
+    def _commit_unique(self, fingerprint, job_id=None):
+        """Commit, turning a fingerprint clash with a concurrent write into DuplicateJobError"""
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            self._check_fingerprint(fingerprint, job_id)
+            raise
+
+    def create(self, job):
+        self._check_fingerprint(job["fingerprint"])
+        new_job = Job(
+            title=job["title"],
+            company=job["company"],
+            location=job["location"],
+            job_type=job["job_type"],
+            posting_date=job["posting_date"],
+            description=job.get("description") or "",
+            url=job.get("url"),
+            fingerprint=job["fingerprint"],
+            tags=Tag.get_or_create_many(job.get("tags", []))
+        )
+        db.session.add(new_job)
+        self._commit_unique(job["fingerprint"])
+        return new_job.to_dict()
+
+    def update(self, job_id, fields):
+        job = self._get(job_id)
+        if job is None:
+            return None
+        fields = dict(fields, **refingerprint(job.to_dict(), fields))
+        if "fingerprint" in fields:
+            self._check_fingerprint(fields["fingerprint"], job.id)
+        for field in ("title", "company", "location", "job_type", "description", "url", "fingerprint"):
+            if field in fields:
+                setattr(job, field, fields[field])
+        if "tags" in fields:
+            job.tags = Tag.get_or_create_many(fields["tags"])
+        self._commit_unique(fields.get("fingerprint"), job.id)
+        return job.to_dict()
+
+    def delete(self, job_id):
+        job = self._get(job_id)
+        if job is None:
+            return False
+        db.session.delete(job)
+        db.session.commit()
+        return True
+
+    def upsert(self, job):
+        jobs, errors = validate_jobs([job])
+        if errors:
+            raise ValueError(errors[0]["error"])
+        created, _ = bulk_upsert(db.engine, jobs)
+        stored = Job.query.filter_by(fingerprint=jobs[0]["fingerprint"]).one()
+        return stored.to_dict(), bool(created)
+
+    def bulk_upsert(self, jobs, chunk_size):
+        return bulk_upsert(db.engine, jobs, chunk_size)
+
+    def count(self):
+        return Job.query.count()
+
+    def fingerprints(self):
+        rows = db.session.query(Job.fingerprint).filter(Job.fingerprint.isnot(None))
+        return {fingerprint for (fingerprint,) in rows}
@@ -0,0 +1,109 @@
+"""
+Response cache for GET /jobs.
+
+Entries are keyed on the normalized query string and evicted least
+recently used once their bodies exceed a memory cap. Every write bumps a
+generation counter; entries built under an older generation are never
+served, so callers only need to call invalidate() after changing jobs.
+Responses carry an ETag and answer If-None-Match with 304.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from flask import Response, make_response, request
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+# Headers from the original response that are replayed from the cache
+CACHED_HEADERS = ('Content-Type', 'X-Next-Cursor', 'X-Total-Count')
+
+
+def cache_key(args):
+    """Order-insensitive key for a query string"""
+    return tuple(sorted((key, value) for key in args for value in args.getlist(key)))
+
+
+class CacheEntry:
+    __slots__ = ('generation', 'body', 'headers', 'etag')
+
+    def __init__(self, generation, body, headers):
+        self.generation = generation
+        self.body = body
+        self.headers = headers
+        self.etag = hashlib.sha1(body).hexdigest()[:20]
+
+
+class ResponseCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size_bytes(self):
+        return self._bytes
+
+    def invalidate(self):
+        """Bump the generation and drop every cached response"""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.generation != self.generation:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, generation, body, headers):
+        """
+        Store a response built while `generation` was current. Returns the
+        entry, which is not retained if a write happened in the meantime or
+        the body alone exceeds the memory cap.
+        """
+        entry = CacheEntry(generation, body, headers)
+        with self._lock:
+            if generation != self.generation or len(body) > self.max_bytes:
+                return entry
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old.body)
+            self._entries[key] = entry
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.body)
+        return entry
+
+    def respond(self, build):
+        """
+        Serve the current request from the cache, or call `build()` (any
+        Flask view return value) and cache its 200 response.
+        """
+        key = cache_key(request.args)
+        entry = self.get(key)
+        if entry is None:
+            generation = self.generation
+            response = make_response(build())
+            if response.status_code != 200:
+                return response
+            headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+            entry = self.put(key, generation, response.get_data(), headers)
+
+        response = Response(entry.body, status=200, headers=entry.headers)
+        response.set_etag(entry.etag)
+        return response.make_conditional(request)
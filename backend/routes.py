@@ -1,91 +1,123 @@
-from flask import Blueprint, request, jsonify
-from models import db, Job
-from sqlalchemy import desc
+from flask import Blueprint, current_app, request, jsonify
+from dates import parse_posting_date, utcnow
+from bulk import BULK_CHUNK_SIZE, MAX_BULK_JOBS, clean_fields, fingerprint, validate_jobs
+from pagination import page_headers
+from json_provider import json_array_response
+from repository import UPDATABLE_FIELDS, DuplicateJobError, JobQuery
 
 routes = Blueprint('routes', __name__)
 
-# ------ GET ALL JOBS (with optional filters) ------
+
+def _repository():
+    """The JobRepository picked by JOB_ENGINE"""
+    return current_app.extensions["job_repository"]
+
+def _jobs_cache():
+    return current_app.extensions["jobs_cache"]
+
+# ------ GET ALL JOBS (with optional filters, search and cursor paging) ------
 @routes.route("/jobs", methods=["GET"])
 def get_jobs():
-    query = Job.query
-
-    # Filtering
-    job_type = request.args.get("job_type")
-    location = request.args.get("location")
-    tag = request.args.get("tag")
-    sort = request.args.get("sort", "posting_date_desc")
-
-    if job_type:
-        query = query.filter(Job.job_type.ilike(f"%{job_type}%"))
-    if location:
-        query = query.filter(Job.location.ilike(f"%{location}%"))
-    if tag:
-        query = query.filter(Job.tags.ilike(f"%{tag}%"))
-
-    # Sorting
-    if sort == "posting_date_desc":
-        query = query.order_by(desc(Job.posting_date))
-    elif sort == "posting_date_asc":
-        query = query.order_by(Job.posting_date)
-
-    jobs = query.all()
-    return jsonify([job.to_dict() for job in jobs]), 200
+    # Served from the response cache until the next write invalidates it
+    _repository().sync()
+    return _jobs_cache().respond(_list_jobs)
+
+def _list_jobs():
+    try:
+        query = JobQuery.from_args(request.args)
+        encoded, next_key, total = _repository().list_jobs(query)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return json_array_response(encoded, headers=page_headers(next_key, total))
 
 # ----------------- GET SINGLE JOB -----------------
-@routes.route("/jobs/<int:id>", methods=["GET"])
-def get_job(id):
-    job = Job.query.get(id)
+@routes.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    job = _repository().get(job_id)
     if job:
-        return jsonify(job.to_dict()), 200
+        return jsonify(job), 200
     return jsonify({"error": "Job not found"}), 404
 
 # ----------------- CREATE A NEW JOB -----------------
 @routes.route("/jobs", methods=["POST"])
 def create_job():
-    data = request.get_json()
-    required = ["title", "company", "location", "job_type"]
-
-    if not all(field in data for field in required):
-        return jsonify({"error": "Missing required fields"}), 400
-
-    new_job = Job(
-        title=data["title"],
-        company=data["company"],
-        location=data["location"],
-        job_type=data["job_type"],
-        posting_date=data.get("posting_date"),
-        tags=",".join(data.get("tags", []))
-    )
-
-    db.session.add(new_job)
-    db.session.commit()
-    return jsonify(new_job.to_dict()), 201
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a job object"}), 400
+
+    # Same checks and normalization as bulk imports
+    try:
+        job = clean_fields(dict(data, job_type=data.get("job_type") or "Full-time"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        job["posting_date"] = parse_posting_date(data.get("posting_date")) or utcnow()
+    except ValueError:
+        return jsonify({"error": "Invalid posting_date"}), 400
+
+    # Same identity as scraped and imported listings, so they dedupe
+    job["fingerprint"] = fingerprint(job)
+    try:
+        job = _repository().create(job)
+    except DuplicateJobError as e:
+        return _duplicate(e)
+    _jobs_cache().invalidate()
+    return jsonify(job), 201
+
+def _duplicate(error):
+    return jsonify({"error": "A job with the same title, company, location and url exists",
+                    "id": error.job_id}), 409
+
+# ----------------- BULK INSERT / UPSERT -----------------
+@routes.route("/jobs/bulk", methods=["POST"])
+def bulk_create_jobs():
+    """Import a list of jobs; jobs whose fingerprint already exists are updated"""
+    data = request.get_json(silent=True)
+    items = data.get("jobs") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        return jsonify({"error": "Expected a list of jobs"}), 400
+    if len(items) > MAX_BULK_JOBS:
+        return jsonify({"error": f"At most {MAX_BULK_JOBS} jobs per request"}), 413
+
+    jobs, errors = validate_jobs(items)
+    if errors and not jobs:
+        return jsonify({"error": "No valid jobs", "errors": errors}), 400
+
+    chunk_size = current_app.config.get("BULK_CHUNK_SIZE", BULK_CHUNK_SIZE)
+    created, updated = _repository().bulk_upsert(jobs, chunk_size)
+    _jobs_cache().invalidate()
+    return jsonify({
+        "created": created,
+        "updated": updated,
+        "duplicates": len(items) - len(errors) - len(jobs),
+        "errors": errors
+    }), 200
 
 # ----------------- UPDATE JOB -----------------
-@routes.route("/jobs/<int:id>", methods=["PUT", "PATCH"])
-def update_job(id):
-    job = Job.query.get(id)
+@routes.route("/jobs/<job_id>", methods=["PUT", "PATCH"])
+def update_job(job_id):
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a job object"}), 400
+
+    # Only the given fields change, checked as on create
+    try:
+        fields = clean_fields({field: data[field] for field in UPDATABLE_FIELDS if field in data}, partial=True)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        job = _repository().update(job_id, fields)
+    except DuplicateJobError as e:
+        return _duplicate(e)
     if not job:
         return jsonify({"error": "Job not found"}), 404
-
-    data = request.get_json()
-
-    job.title = data.get("title", job.title)
-    job.company = data.get("company", job.company)
-    job.location = data.get("location", job.location)
-    job.job_type = data.get("job_type", job.job_type)
-    job.tags = ",".join(data.get("tags", job.tags.split(",")))
-
-    db.session.commit()
-    return jsonify(job.to_dict()), 200
+    _jobs_cache().invalidate()
+    return jsonify(job), 200
 
 # ----------------- DELETE JOB -----------------
-@routes.route("/jobs/<int:id>", methods=["DELETE"])
-def delete_job(id):
-    job = Job.query.get(id)
-    if not job:
+@routes.route("/jobs/<job_id>", methods=["DELETE"])
+def delete_job(job_id):
+    if not _repository().delete(job_id):
         return jsonify({"error": "Job not found"}), 404
-
-    db.session.delete(job)
-    db.session.commit()
-    return jsonify({"message": "Job deleted"}), 204
+    _jobs_cache().invalidate()
+    return "", 204
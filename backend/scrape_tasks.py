@@ -0,0 +1,107 @@
+"""
+Background scrape task queue.
+
+/scrape-jobs submits work here instead of running the scraper inside the
+request handler. Tasks run on a bounded thread pool; a request whose
+parameters match a task that is still queued or running is coalesced into
+that task rather than launching another browser.
+"""
+
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+
+class ScrapeTask:
+    def __init__(self, params):
+        self.id = uuid.uuid4().hex
+        self.params = params
+        self.status = QUEUED
+        self.progress = {}
+        self.result = None
+        self.error = None
+        self.created_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def active(self):
+        return self.status in (QUEUED, RUNNING)
+
+    def to_dict(self):
+        return {
+            'task_id': self.id,
+            'status': self.status,
+            'params': self.params,
+            'progress': dict(self.progress),
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+class ScrapeTaskManager:
+    """
+    Runs `runner(params, report_progress)` for each submitted task on a pool
+    of `max_workers` threads. The runner returns the task result dict or
+    raises to mark the task as failed.
+    """
+
+    def __init__(self, runner, max_workers=1, max_finished=100):
+        self._runner = runner
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scrape')
+        self._lock = threading.Lock()
+        self._tasks = {}
+        self._finished = []
+        self._max_finished = max_finished
+
+    @staticmethod
+    def _key(params):
+        return tuple(sorted(params.items()))
+
+    def submit(self, params):
+        """Queue a scrape; returns (task, created) where created is False if coalesced"""
+        with self._lock:
+            key = self._key(params)
+            for task in self._tasks.values():
+                if task.active and self._key(task.params) == key:
+                    return task, False
+
+            task = ScrapeTask(params)
+            self._tasks[task.id] = task
+        self._executor.submit(self._run, task)
+        return task, True
+
+    def get(self, task_id):
+        return self._tasks.get(task_id)
+
+    def _run(self, task):
+        task.status = RUNNING
+        task.started_at = datetime.now()
+        try:
+            task.result = self._runner(task.params, task.progress.update)
+            task.status = COMPLETED
+        except Exception as e:
+            task.error = str(e)
+            task.status = FAILED
+        finally:
+            task.finished_at = datetime.now()
+            self._retire(task)
+
+    def _retire(self, task):
+        """Keep only the most recent finished tasks around for status lookups"""
+        with self._lock:
+            self._finished.append(task.id)
+            while len(self._finished) > self._max_finished:
+                self._tasks.pop(self._finished.pop(0), None)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
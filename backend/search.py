@@ -0,0 +1,236 @@
+"""
+Full-text search for job listings.
+
+SearchIndex is a tokenized inverted index with BM25 ranking used by the
+in-memory JobStore; it is maintained incrementally as jobs are added,
+updated and removed. For the SQLAlchemy Job model on SQLite, an FTS5
+virtual table mirrors the searchable columns and is ranked by SQLite's
+built-in bm25().
+"""
+
+import math
+import re
+from collections import Counter
+
+from sqlalchemy import bindparam, event, func, select, text
+from sqlalchemy.exc import OperationalError
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+# Text fields q= searches in every engine, besides tag names
+SEARCH_FIELDS = ('title', 'company', 'location', 'job_type', 'description')
+
+
+def normalize_tag(name):
+    """The form tags are stored and matched in (tag= is an exact match on it)"""
+    return name.strip().lower()
+
+
+def tokenize(value):
+    """Split text into lower-cased search tokens"""
+    return TOKEN_RE.findall(value.lower()) if value else []
+
+
+def job_tokens(job):
+    """Tokens for every searchable field of an in-memory job dict"""
+    tokens = []
+    for field in SEARCH_FIELDS:
+        tokens.extend(tokenize(job.get(field)))
+    for tag in job.get('tags') or []:
+        tokens.extend(tokenize(tag))
+    return tokens
+
+
+class SearchIndex:
+    """Inverted index with BM25 scoring"""
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings = {}     # token -> {doc_id: term frequency}
+        self._doc_tokens = {}   # doc_id -> distinct tokens (for removal)
+        self._doc_len = {}
+        self._total_len = 0
+
+    def __len__(self):
+        return len(self._doc_len)
+
+    def add(self, doc_id, tokens):
+        """Index a document, replacing any previous version of it"""
+        if doc_id in self._doc_tokens:
+            self.remove(doc_id)
+        counts = Counter(tokens)
+        postings = self._postings
+        for token, tf in counts.items():
+            token_postings = postings.get(token)
+            if token_postings is None:
+                postings[token] = {doc_id: tf}
+            else:
+                token_postings[doc_id] = tf
+        self._doc_tokens[doc_id] = tuple(counts)
+        self._doc_len[doc_id] = len(tokens)
+        self._total_len += len(tokens)
+
+    def remove(self, doc_id):
+        tokens = self._doc_tokens.pop(doc_id, None)
+        if tokens is None:
+            return
+        for token in tokens:
+            postings = self._postings[token]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[token]
+        self._total_len -= self._doc_len.pop(doc_id)
+
+    def search(self, query):
+        """
+        Return {doc_id: score} for documents containing every query token,
+        scored with BM25.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return {}
+        postings = [self._postings.get(term) for term in terms]
+        if not all(postings):
+            return {}
+
+        # Intersect starting from the rarest term
+        postings.sort(key=len)
+        matches = set(postings[0])
+        for other in postings[1:]:
+            matches.intersection_update(other)
+            if not matches:
+                return {}
+
+        n_docs = len(self._doc_len)
+        avg_len = self._total_len / n_docs if n_docs else 0.0
+        scores = dict.fromkeys(matches, 0.0)
+        for term_postings in postings:
+            df = len(term_postings)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for doc_id in matches:
+                tf = term_postings[doc_id]
+                norm = self.k1 * (1 - self.b + self.b * self._doc_len[doc_id] / avg_len)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+
+# ------ SQLite FTS5 support for the Job model ------
+FTS_TABLE = 'jobs_fts'
+FTS_COLUMNS = SEARCH_FIELDS + ('tags',)
+
+_fts_engines = set()
+
+
+def fts_query(query):
+    """Turn free text into an FTS5 MATCH expression (all terms required)"""
+    return ' AND '.join(f'"{token}"' for token in tokenize(query))
+
+
+def fts_enabled(engine):
+    return str(engine.url) in _fts_engines
+
+
+def setup_sqlite_fts(engine, job_model):
+    """
+    Create and populate the FTS5 table for `job_model` on SQLite and keep it
+    in sync through ORM events. A table indexing other columns (from an
+    older release) is rebuilt. Returns False when the database is not
+    SQLite or the SQLite build lacks FTS5, in which case callers fall back
+    to LIKE matching.
+    """
+    if engine.dialect.name != 'sqlite':
+        return False
+    columns = ', '.join(FTS_COLUMNS)
+    try:
+        with engine.begin() as conn:
+            indexed_columns = tuple(row[1] for row in conn.execute(text(f"PRAGMA table_info({FTS_TABLE})")))
+            if indexed_columns and indexed_columns != FTS_COLUMNS:
+                conn.execute(text(f"DROP TABLE {FTS_TABLE}"))
+            conn.execute(text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+                f"USING fts5({columns}, tokenize='unicode61')"
+            ))
+            indexed = conn.execute(text(f"SELECT count(*) FROM {FTS_TABLE}")).scalar()
+            if not indexed:
+                _populate_fts(conn, job_model)
+    except OperationalError:
+        return False
+
+    if not _fts_engines:
+        event.listen(job_model, 'after_insert', _fts_upsert)
+        event.listen(job_model, 'after_update', _fts_upsert)
+        event.listen(job_model, 'after_delete', _fts_delete)
+    _fts_engines.add(str(engine.url))
+    return True
+
+
+def _fts_rows(conn, job_model, job_ids=None):
+    """FTS rows for jobs (all of them, or just `job_ids`), tag names joined into one column"""
+    jobs = job_model.__table__
+    tags_relationship = job_model.tags.property
+    link = tags_relationship.secondary
+    tags = tags_relationship.target
+    query = (
+        select(
+            jobs.c.id, *(func.coalesce(jobs.c[field], '') for field in SEARCH_FIELDS),
+            func.coalesce(func.group_concat(tags.c.name, ' '), '')
+        )
+        .select_from(jobs.outerjoin(link, link.c.job_id == jobs.c.id).outerjoin(tags, tags.c.id == link.c.tag_id))
+        .group_by(jobs.c.id)
+    )
+    if job_ids is not None:
+        query = query.where(jobs.c.id.in_(job_ids))
+    return [dict(zip(('id',) + FTS_COLUMNS, row)) for row in conn.execute(query)]
+
+
+def _fts_insert(conn, rows):
+    if not rows:
+        return
+    columns = ', '.join(FTS_COLUMNS)
+    params = ', '.join(f':{column}' for column in FTS_COLUMNS)
+    conn.execute(text(f"INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (:id, {params})"), rows)
+
+
+def _populate_fts(conn, job_model):
+    """Index every existing job"""
+    _fts_insert(conn, _fts_rows(conn, job_model))
+
+
+def fts_sync(conn, job_model, job_ids):
+    """
+    Re-index the given jobs. ORM events keep the FTS table current for
+    session writes; Core bulk writes call this instead.
+    """
+    if not job_ids or not fts_enabled(conn.engine):
+        return
+    conn.execute(
+        text(f"DELETE FROM {FTS_TABLE} WHERE rowid IN :ids").bindparams(bindparam('ids', expanding=True)),
+        {'ids': list(job_ids)}
+    )
+    _fts_insert(conn, _fts_rows(conn, job_model, job_ids))
+
+
+def fts_row(job):
+    """Column values mirrored into the FTS table for a Job row"""
+    row = {column: getattr(job, column) or '' for column in FTS_COLUMNS if column != 'tags'}
+    row['tags'] = ' '.join(tag.name for tag in job.tags)
+    return row
+
+
+def _fts_upsert(mapper, connection, target):
+    if not fts_enabled(connection.engine):
+        return
+    columns = ', '.join(FTS_COLUMNS)
+    params = ', '.join(f':{column}' for column in FTS_COLUMNS)
+    connection.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), {'id': target.id})
+    connection.execute(
+        text(f"INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (:id, {params})"),
+        {'id': target.id, **fts_row(target)}
+    )
+
+
+def _fts_delete(mapper, connection, target):
+    if not fts_enabled(connection.engine):
+        return
+    connection.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), {'id': target.id})
@@ -0,0 +1,416 @@
+"""
+Shared job state for multi-worker / multi-node deployments.
+
+With JOB_STORE_BACKEND=shared the jobs the in-memory handlers serve live
+in a shared backend instead of one process. Every worker keeps a local
+JobStore as a read replica: reads are answered from it, and it is brought
+up to date from the backend's change feed (an append-only list of changed
+job ids) at most every `poll_interval` seconds, and immediately after the
+worker's own writes. Writes go to the backend first, inside a transaction
+that serializes writers across all workers.
+
+Backends:
+    SQLJobBackend     tables in any SQLAlchemy database (the app's own by default)
+    MemoryJobBackend  an in-process fake for tests; share one instance
+                      between several SharedJobStores to simulate workers
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, Text, func, select, update
+
+from job_store import DuplicateJobError, JobRecord, JobStore
+from json_provider import dumps_bytes
+
+# Change feed entries kept in the backend; a worker further behind reloads
+FEED_RETENTION = 100_000
+PRUNE_EVERY = 1000
+FETCH_CHUNK = 500
+
+
+class FeedGap(Exception):
+    """The change feed no longer reaches back to the requested position"""
+
+
+def _numeric_id(job_id):
+    try:
+        return int(job_id)
+    except (TypeError, ValueError):
+        return 0
+
+
+# ------ SQL backend ------
+metadata = MetaData()
+
+shared_jobs = Table(
+    'shared_jobs', metadata,
+    Column('id', String(64), primary_key=True),
+    Column('fingerprint', String(64), unique=True),
+    Column('data', Text, nullable=False)
+)
+
+job_changes = Table(
+    'job_changes', metadata,
+    Column('id', Integer, primary_key=True, autoincrement=True),
+    Column('job_id', String(64), nullable=False)
+)
+
+# next_id: job id counter; write_lock: bumped first by every write so
+# writers serialize (and change ids become visible in order);
+# pruned_through: last change id deleted from the feed
+job_store_meta = Table(
+    'job_store_meta', metadata,
+    Column('name', String(32), primary_key=True),
+    Column('value', Integer, nullable=False)
+)
+
+
+class _SQLTransaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def get(self, job_id):
+        data = self.conn.execute(select(shared_jobs.c.data).where(shared_jobs.c.id == job_id)).scalar()
+        return json.loads(data) if data is not None else None
+
+    def find_fingerprint(self, fingerprint):
+        data = self.conn.execute(
+            select(shared_jobs.c.data).where(shared_jobs.c.fingerprint == fingerprint)
+        ).scalar()
+        return json.loads(data) if data is not None else None
+
+    def put(self, job):
+        values = {'fingerprint': job.get('fingerprint'), 'data': dumps_bytes(job).decode('utf-8')}
+        updated = self.conn.execute(
+            update(shared_jobs).where(shared_jobs.c.id == job['id']).values(**values)
+        ).rowcount
+        if not updated:
+            self.conn.execute(shared_jobs.insert().values(id=job['id'], **values))
+        self._changed(job['id'])
+
+    def remove(self, job_id):
+        removed = self.conn.execute(shared_jobs.delete().where(shared_jobs.c.id == job_id)).rowcount
+        if removed:
+            self._changed(job_id)
+        return bool(removed)
+
+    def peek_id(self):
+        return self.conn.execute(
+            select(job_store_meta.c.value).where(job_store_meta.c.name == 'next_id')
+        ).scalar()
+
+    def next_id(self):
+        self.conn.execute(
+            update(job_store_meta).where(job_store_meta.c.name == 'next_id')
+            .values(value=job_store_meta.c.value + 1)
+        )
+        return str(self.peek_id() - 1)
+
+    def skip_ids(self, value):
+        """Make sure ids handed out from now on are at least `value`"""
+        self.conn.execute(
+            update(job_store_meta)
+            .where(job_store_meta.c.name == 'next_id', job_store_meta.c.value < value)
+            .values(value=value)
+        )
+
+    def _changed(self, job_id):
+        change_id = self.conn.execute(job_changes.insert().values(job_id=job_id)).inserted_primary_key[0]
+        if change_id % PRUNE_EVERY == 0 and change_id > FEED_RETENTION:
+            horizon = change_id - FEED_RETENTION
+            self.conn.execute(job_changes.delete().where(job_changes.c.id <= horizon))
+            self.conn.execute(
+                update(job_store_meta).where(job_store_meta.c.name == 'pruned_through').values(value=horizon)
+            )
+
+
+class SQLJobBackend:
+    def __init__(self, engine):
+        self.engine = engine
+        metadata.create_all(engine)
+        with engine.begin() as conn:
+            existing = set(conn.execute(select(job_store_meta.c.name)).scalars())
+            for name, value in (('next_id', 1), ('write_lock', 0), ('pruned_through', 0)):
+                if name not in existing:
+                    conn.execute(job_store_meta.insert().values(name=name, value=value))
+
+    @contextmanager
+    def transaction(self):
+        with self.engine.begin() as conn:
+            # Take the cluster-wide write lock before reading anything
+            conn.execute(
+                update(job_store_meta).where(job_store_meta.c.name == 'write_lock')
+                .values(value=job_store_meta.c.value + 1)
+            )
+            yield _SQLTransaction(conn)
+
+    def snapshot(self):
+        """(last change id, every job) as of one consistent moment"""
+        with self.engine.begin() as conn:
+            last = conn.execute(select(func.coalesce(func.max(job_changes.c.id), 0))).scalar()
+            jobs = [json.loads(data) for data in conn.execute(select(shared_jobs.c.data)).scalars()]
+        return last, jobs
+
+    def changes_since(self, change_id):
+        """
+        (last change id, {job_id: current job or None if deleted}) for
+        every job changed after `change_id`. Raises FeedGap if the feed has
+        been pruned past that point.
+        """
+        with self.engine.begin() as conn:
+            pruned = conn.execute(
+                select(job_store_meta.c.value).where(job_store_meta.c.name == 'pruned_through')
+            ).scalar()
+            if change_id < pruned:
+                raise FeedGap(change_id)
+            rows = conn.execute(
+                select(job_changes.c.id, job_changes.c.job_id)
+                .where(job_changes.c.id > change_id).order_by(job_changes.c.id)
+            ).all()
+            if not rows:
+                return change_id, {}
+
+            changed = {job_id: None for _, job_id in rows}
+            ids = list(changed)
+            for start in range(0, len(ids), FETCH_CHUNK):
+                for job_id, data in conn.execute(
+                    select(shared_jobs.c.id, shared_jobs.c.data)
+                    .where(shared_jobs.c.id.in_(ids[start:start + FETCH_CHUNK]))
+                ):
+                    changed[job_id] = json.loads(data)
+        return rows[-1][0], changed
+
+
+# ------ In-process fake ------
+class _MemoryTransaction:
+    def __init__(self, backend):
+        self.backend = backend
+
+    def get(self, job_id):
+        job = self.backend.jobs.get(job_id)
+        return dict(job) if job is not None else None
+
+    def find_fingerprint(self, fingerprint):
+        for job in self.backend.jobs.values():
+            if fingerprint and job.get('fingerprint') == fingerprint:
+                return dict(job)
+        return None
+
+    def put(self, job):
+        self.backend.jobs[job['id']] = json.loads(dumps_bytes(job))
+        self.backend.changes.append(job['id'])
+
+    def remove(self, job_id):
+        if self.backend.jobs.pop(job_id, None) is None:
+            return False
+        self.backend.changes.append(job_id)
+        return True
+
+    def peek_id(self):
+        return self.backend.next_id
+
+    def next_id(self):
+        self.backend.next_id += 1
+        return str(self.backend.next_id - 1)
+
+    def skip_ids(self, value):
+        self.backend.next_id = max(self.backend.next_id, value)
+
+
+class MemoryJobBackend:
+    def __init__(self):
+        self.jobs = {}
+        self.changes = []    # change id n is changes[n - 1]
+        self.next_id = 1
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            yield _MemoryTransaction(self)
+
+    def snapshot(self):
+        with self._lock:
+            return len(self.changes), [dict(job) for job in self.jobs.values()]
+
+    def changes_since(self, change_id):
+        with self._lock:
+            changed = {job_id: self.jobs.get(job_id) for job_id in self.changes[change_id:]}
+            return len(self.changes), {job_id: dict(job) if job else None for job_id, job in changed.items()}
+
+
+# ------ Replicated store ------
+class SharedJobStore:
+    """
+    JobStore-compatible store backed by a shared backend, with a local
+    JobStore replica for reads. `on_change` callbacks run whenever the
+    replica picked up changes (from any worker).
+    """
+
+    journal = None
+
+    def __init__(self, backend, poll_interval=1.0, seed=None):
+        self.backend = backend
+        self.poll_interval = poll_interval
+        self.on_change = []
+        self._local = JobStore()
+        self._change_id = 0
+        self._sync_lock = threading.Lock()
+
+        if seed:
+            self._seed(seed)
+        self._reload()
+        self._last_sync = time.monotonic()
+
+    def _seed(self, jobs):
+        """Populate a backend that never handed out an id (the first worker to start wins)"""
+        with self.backend.transaction() as txn:
+            if txn.peek_id() > 1:
+                return
+            for job in jobs:
+                txn.put(dict(job))
+            txn.skip_ids(max(_numeric_id(job['id']) for job in jobs) + 1)
+
+    def _reload(self):
+        """Replace the replica with a fresh copy of the backend"""
+        change_id, jobs = self.backend.snapshot()
+        local = JobStore()
+        local.load(jobs)
+        self._local = local
+        self._change_id = change_id
+
+    def sync(self, force=False):
+        """
+        Apply changes other workers made since the last sync. Unless
+        `force`d this is skipped within poll_interval of the previous one.
+        Returns the number of jobs that changed.
+        """
+        if not force and time.monotonic() - self._last_sync < self.poll_interval:
+            return 0
+        with self._sync_lock:
+            try:
+                change_id, changed = self.backend.changes_since(self._change_id)
+                for job_id, job in changed.items():
+                    if job is None:
+                        self._local.delete(job_id)
+                    else:
+                        self._local.add(job)
+                self._change_id = change_id
+                count = len(changed)
+            except FeedGap:
+                self._reload()
+                count = len(self._local)
+            self._last_sync = time.monotonic()
+        if count:
+            for callback in self.on_change:
+                callback()
+        return count
+
+    # ------ Writes: backend first, then catch the replica up ------
+    def next_id(self):
+        with self.backend.transaction() as txn:
+            return txn.next_id()
+
+    @staticmethod
+    def _check_fingerprint(txn, fingerprint, job_id):
+        other = txn.find_fingerprint(fingerprint) if fingerprint else None
+        if other is not None and other['id'] != job_id:
+            raise DuplicateJobError(other['id'])
+
+    def add(self, job, unique=False):
+        job = dict(job.items())
+        with self.backend.transaction() as txn:
+            if unique:
+                self._check_fingerprint(txn, job.get('fingerprint'), job['id'])
+            txn.put(job)
+        self.sync(force=True)
+        return self._local.get(job['id'])
+
+    def update(self, job_id, fields, derive=None):
+        with self.backend.transaction() as txn:
+            job = txn.get(job_id)
+            if job is None:
+                return None
+            if derive is not None:
+                fields = dict(fields, **derive(job, fields))
+                self._check_fingerprint(txn, fields.get('fingerprint'), job_id)
+            job.update(fields)
+            txn.put(job)
+        self.sync(force=True)
+        return self._local.get(job_id)
+
+    def _upsert(self, txn, job):
+        existing = txn.find_fingerprint(job.get('fingerprint')) if job.get('fingerprint') else None
+        if existing is not None:
+            existing.update({key: value for key, value in job.items() if key not in ('id', 'posting_date')})
+            txn.put(existing)
+            return existing['id'], False
+        job = dict(job.items(), id=txn.next_id())
+        txn.put(job)
+        return job['id'], True
+
+    def upsert(self, job, new_id=None):
+        """As JobStore.upsert; ids come from the shared counter, not `new_id`"""
+        with self.backend.transaction() as txn:
+            job_id, created = self._upsert(txn, job)
+        self.sync(force=True)
+        return self._local.get(job_id), created
+
+    def bulk_upsert(self, jobs, new_id=None):
+        created = 0
+        with self.backend.transaction() as txn:
+            for job in jobs:
+                created += self._upsert(txn, job)[1]
+        self.sync(force=True)
+        return created, len(jobs) - created
+
+    def delete(self, job_id):
+        # The job as deleted, which the replica may not have seen yet
+        with self.backend.transaction() as txn:
+            job = txn.get(job_id)
+            removed = job is not None and txn.remove(job_id)
+        self.sync(force=True)
+        return JobRecord(job) if removed else None
+
+    # ------ Reads: from the replica ------
+    def __len__(self):
+        self.sync()
+        return len(self._local)
+
+    def __iter__(self):
+        self.sync()
+        return iter(self._local)
+
+    def __contains__(self, job_id):
+        self.sync()
+        return job_id in self._local
+
+    def get(self, job_id):
+        self.sync()
+        return self._local.get(job_id)
+
+    def fingerprints(self):
+        self.sync()
+        return self._local.fingerprints()
+
+    def search(self, query):
+        self.sync()
+        return self._local.search(query)
+
+    def filter(self, **filters):
+        self.sync()
+        return self._local.filter(**filters)
+
+    def list_by_date(self, *args, **kwargs):
+        self.sync()
+        return self._local.list_by_date(*args, **kwargs)
+
+    def jobs_by_date(self):
+        self.sync()
+        return self._local.jobs_by_date()
+
+    def encode_all(self, jobs):
+        return self._local.encode_all(jobs)
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Latency and throughput of the /jobs API
+
+Loads a synthetic catalogue (see catalog.py) into a fresh app using the
+chosen JOB_ENGINE, then runs every scenario below and reports p50/p99
+latency and requests per second for each:
+
+    listing     first page, both sort orders, X-Total-Count, cursor paging
+    filters     location, job_type, tag, title substring, date range and
+                combinations, full-text search (relevance and date order)
+    CRUD        GET /jobs/<id>, POST, PUT and DELETE
+
+Modes:
+    client  requests go through Flask's test client in this thread, so
+            the numbers are the app's own cost without any networking
+    http    the app is served on a local port (threaded dev server) and
+            --concurrency workers issue real HTTP requests
+
+The GET /jobs response cache is disabled unless --cache is given, so list
+scenarios measure the query itself rather than a cache hit.
+
+Usage: python benchmarks/api_bench.py [--engine sql|memory] [--jobs 1k|100k|1M]
+           [--mode client|http|both] [--requests N] [--concurrency C]
+           [--cache] [--out results.json]
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from catalog import generate_jobs, parse_size
+from common import BACKEND_DIR, add_path, print_table, run_metadata, summarize, write_results
+
+LOAD_BATCH = 10_000
+
+# (name, query string) for GET /jobs
+LIST_SCENARIOS = [
+    ('list first page', 'limit=20'),
+    ('list oldest first', 'limit=20&sort=posting_date_asc'),
+    ('list with total', 'limit=20&include_total=1'),
+    ('filter location', 'limit=20&location=Remote'),
+    ('filter job_type', 'limit=20&job_type=Contract'),
+    ('filter tag', 'limit=20&tag=python'),
+    ('filter location+job_type+tag', 'limit=20&location=Remote&job_type=Contract&tag=python'),
+    ('filter title substring', 'limit=20&title=pricing'),
+    ('filter date range', 'limit=20&posted_after=2024-01-01&posted_before=2024-02-01'),
+    ('filter date range+location', 'limit=20&posted_after=2024-01-01&posted_before=2024-02-01&location=Remote'),
+    ('search', 'limit=20&q=pricing+actuary'),
+    ('search by date', 'limit=20&q=pricing+actuary&sort=posting_date_desc'),
+    ('search+filters', 'limit=20&q=actuary&location=Remote&tag=sql'),
+]
+
+# Unpaged listings return the whole catalogue; only run them on small ones
+UNPAGED_MAX_JOBS = 10_000
+
+
+def build_app(engine, jobs, seed, cache, workdir):
+    """A fresh app on a temporary database with `jobs` catalogue jobs loaded"""
+    os.environ.update({
+        'DATABASE_URL': 'sqlite:///' + os.path.join(workdir, 'bench.db'),
+        'JOB_ENGINE': engine,
+        'JOB_STORE_BACKEND': 'memory',
+        'JOB_STORE_DIR': '',
+        'RESPONSE_CACHE_MAX_MB': '32' if cache else '0',
+        'SCRAPER_BACKEND': 'subprocess',
+    })
+    add_path(BACKEND_DIR)
+    from app import create_app
+    from bulk import BULK_CHUNK_SIZE, validate_jobs
+
+    app = create_app()
+    started = time.perf_counter()
+    with app.app_context():
+        repository = app.extensions['job_repository']
+        catalogue = generate_jobs(jobs, seed)
+        while True:
+            batch = list(itertools.islice(catalogue, LOAD_BATCH))
+            if not batch:
+                break
+            valid, _ = validate_jobs(batch)
+            repository.bulk_upsert(valid, BULK_CHUNK_SIZE)
+    return app, time.perf_counter() - started
+
+
+# ------ Request senders ------
+class ClientSender:
+    """Requests through the Flask test client"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def __call__(self, method, path, body=None):
+        response = self.client.open(path, method=method, json=body)
+        return response.status_code, response.headers, response.get_data()
+
+    def close(self):
+        pass
+
+
+class HTTPSender:
+    """Real HTTP requests against the app served on a local port"""
+
+    def __init__(self, app):
+        from werkzeug.serving import make_server
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        self.server = make_server('127.0.0.1', 0, app, threaded=True)
+        self.port = self.server.server_port
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def __call__(self, method, path, body=None):
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=60)
+        try:
+            headers = {}
+            data = None
+            if body is not None:
+                data = json.dumps(body)
+                headers['Content-Type'] = 'application/json'
+            connection.request(method, path, body=data, headers=headers)
+            response = connection.getresponse()
+            return response.status, response.headers, response.read()
+        finally:
+            connection.close()
+
+    def close(self):
+        self.server.shutdown()
+
+
+def run_scenario(send, requests, concurrency, expected_status):
+    """
+    Send every (method, path, body) in `requests`, `concurrency` at a time.
+    Returns (summary, response bodies).
+    """
+    latencies = []
+    bodies = []
+    errors = 0
+    lock = threading.Lock()
+    pending = iter(requests)
+
+    def worker():
+        nonlocal errors
+        while True:
+            with lock:
+                request = next(pending, None)
+            if request is None:
+                return
+            started = time.perf_counter()
+            try:
+                status, _, body = send(*request)
+            except Exception:
+                status, body = None, b''
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with lock:
+                latencies.append(elapsed_ms)
+                bodies.append(body)
+                if status != expected_status:
+                    errors += 1
+
+    started = time.perf_counter()
+    if concurrency <= 1:
+        worker()
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for _ in range(concurrency):
+                executor.submit(worker)
+    return summarize(latencies, time.perf_counter() - started, errors), bodies
+
+
+def run_mode(mode, app, args, jobs):
+    send = ClientSender(app) if mode == 'client' else HTTPSender(app)
+    concurrency = 1 if mode == 'client' else args.concurrency
+    count = args.requests
+    results = []
+
+    def record(name, requests, expected_status=200):
+        summary, bodies = run_scenario(send, requests, concurrency, expected_status)
+        results.append(dict(name=name, mode=mode, concurrency=concurrency, **summary))
+        return bodies
+
+    try:
+        # Warm up caches and lazily built indexes outside the measurements
+        send('GET', '/jobs?limit=100')
+        send('GET', '/jobs?limit=1&q=actuary')
+
+        scenarios = list(LIST_SCENARIOS)
+        if jobs <= UNPAGED_MAX_JOBS:
+            scenarios.append(('list all (unpaged)', ''))
+        for name, query in scenarios:
+            record(name, [('GET', f'/jobs?{query}', None)] * count)
+
+        _, headers, body = send('GET', '/jobs?limit=20')
+        ids = [job['id'] for job in json.loads(body)]
+        cursor = headers.get('X-Next-Cursor')
+        if cursor:
+            record('list page 2 (cursor)', [('GET', f'/jobs?limit=20&cursor={cursor}', None)] * count)
+
+        # CRUD
+        record('get by id', [('GET', f'/jobs/{ids[i % len(ids)]}', None) for i in range(count)])
+        new_job = {'title': 'Benchmark Actuary', 'company': 'Bench Re', 'location': 'Remote',
+                   'job_type': 'Contract', 'tags': ['Python', 'Pricing'], 'description': 'benchmark'}
+        created = record('create', [('POST', '/jobs', new_job)] * count, expected_status=201)
+        created_ids = [json.loads(body)['id'] for body in created if body]
+        record('update', [('PUT', f'/jobs/{job_id}', {'title': 'Updated Benchmark Actuary'})
+                          for job_id in created_ids])
+        record('delete', [('DELETE', f'/jobs/{job_id}', None) for job_id in created_ids], expected_status=204)
+    finally:
+        send.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--engine', choices=('sql', 'memory'), default='sql')
+    parser.add_argument('--jobs', type=parse_size, default=parse_size('1k'))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--mode', choices=('client', 'http', 'both'), default='client')
+    parser.add_argument('--requests', type=int, default=200, help='requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=8, help='workers in http mode')
+    parser.add_argument('--cache', action='store_true', help='keep the GET /jobs response cache on')
+    parser.add_argument('--out', help='write the JSON results here (default: stdout)')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='jobs-bench-')
+    try:
+        app, load_seconds = build_app(args.engine, args.jobs, args.seed, args.cache, workdir)
+        results = []
+        for mode in (('client', 'http') if args.mode == 'both' else (args.mode,)):
+            results.extend(run_mode(mode, app, args, args.jobs))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    meta = run_metadata(engine=args.engine, jobs=args.jobs, seed=args.seed, requests=args.requests,
+                        response_cache=args.cache, load_seconds=round(load_seconds, 2))
+    print_table(results, ('mode', 'p50_ms', 'p99_ms', 'rps', 'errors'))
+    write_results('api', meta, results, args.out)
+
+
+if __name__ == '__main__':
+    main()
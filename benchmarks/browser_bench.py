@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Selenium page load time and memory per browser profile
+
+Starts Chrome with each create_driver profile (lean, full) --runs times,
+loads the listings page and reports per profile:
+
+    startup_ms   driver start (p50)
+    p50/p99_ms   driver.get() until the first listing is present
+    peak_rss_mb  chromedriver plus browser processes, sampled every 50 ms
+                 during the load (needs psutil)
+
+By default the page is the saved ActuaryList page served on a local port,
+with --assets images, a web font and an analytics script added, each
+answered after --asset-latency ms, so the difference the lean profile
+makes is visible offline. --url measures a live page instead. Needs
+Chrome and chromedriver (see scraper/driver_pool.py).
+
+Usage: python benchmarks/browser_bench.py [--runs N] [--assets N] [--asset-latency MS]
+           [--url URL] [--headed] [--out results.json]
+"""
+
+import argparse
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from common import SCRAPER_DIR, add_path, print_table, run_metadata, summarize, write_results
+
+add_path(SCRAPER_DIR)
+
+from selenium.webdriver.common.by import By  # noqa: E402
+from selenium.webdriver.support import expected_conditions as EC  # noqa: E402
+from selenium.webdriver.support.ui import WebDriverWait  # noqa: E402
+
+from actuarylist_scraper import BROWSER_PROFILES, create_driver  # noqa: E402
+from driver_pool import driver_rss_mb  # noqa: E402
+from job_parser import LISTING_CLASS  # noqa: E402
+
+FIXTURE = os.path.join(SCRAPER_DIR, 'fixtures', 'actuarylist_jobs.html')
+ASSET_TYPES = {'.png': 'image/png', '.woff2': 'font/woff2', '.js': 'application/javascript'}
+
+
+class AssetSite(ThreadingHTTPServer):
+    """The fixture page plus slow images, a font and a third-party-style script"""
+
+    daemon_threads = True
+
+    def __init__(self, page, assets, latency):
+        super().__init__(('127.0.0.1', 0), AssetHandler)
+        images = ''.join(f'<img src="/assets/logo-{n}.png" width="48" height="48">' for n in range(assets))
+        head = ('<style>@font-face { font-family: Brand; src: url(/assets/brand.woff2); }'
+                ' body { font-family: Brand, sans-serif; }</style>'
+                '<script src="/assets/google-analytics.com/analytics.js"></script>')
+        self.page = page.replace('</head>', head + '</head>').replace('</main>', images + '</main>').encode('utf-8')
+        self.latency = latency
+
+
+class AssetHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path.startswith('/assets/'):
+            time.sleep(self.server.latency)
+            content_type = ASSET_TYPES.get(os.path.splitext(self.path)[1], 'application/octet-stream')
+            self.send_body(200, content_type, b'\0' * 2048)
+        else:
+            self.send_body(200, 'text/html; charset=utf-8', self.server.page)
+
+    def send_body(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class PeakRSS:
+    """Samples a driver's RSS on a background thread, keeping the maximum"""
+
+    def __init__(self, driver, interval=0.05):
+        self.driver = driver
+        self.interval = interval
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            rss = driver_rss_mb(self.driver)
+            if rss is not None:
+                self.peak = max(self.peak or 0, rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+def bench_profile(profile, url, runs, headless):
+    startups, loads, peaks = [], [], []
+    elapsed = 0.0
+    for _ in range(runs):
+        started = time.perf_counter()
+        driver = create_driver(headless, profile)
+        startups.append((time.perf_counter() - started) * 1000)
+        try:
+            with PeakRSS(driver) as rss:
+                started = time.perf_counter()
+                driver.get(url)
+                WebDriverWait(driver, 30).until(EC.presence_of_element_located((By.CLASS_NAME, LISTING_CLASS)))
+                load = time.perf_counter() - started
+            loads.append(load * 1000)
+            elapsed += load
+            if rss.peak is not None:
+                peaks.append(rss.peak)
+        finally:
+            driver.quit()
+    return dict(name=profile, startup_ms=round(sorted(startups)[len(startups) // 2], 1),
+                peak_rss_mb=round(max(peaks), 1) if peaks else None, **summarize(loads, elapsed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=5, help='browser starts per profile')
+    parser.add_argument('--assets', type=int, default=40, help='images added to the local page')
+    parser.add_argument('--asset-latency', type=float, default=300, help='ms before each asset is served')
+    parser.add_argument('--url', help='measure this page instead of the local one')
+    parser.add_argument('--headed', action='store_true', help='show the browser windows')
+    parser.add_argument('--out', help='write the JSON results here (default: stdout)')
+    args = parser.parse_args()
+
+    site = None
+    url = args.url
+    if url is None:
+        with open(FIXTURE, encoding='utf-8') as f:
+            site = AssetSite(f.read(), args.assets, args.asset_latency / 1000)
+        threading.Thread(target=site.serve_forever, daemon=True).start()
+        url = f'http://127.0.0.1:{site.server_port}/jobs'
+    try:
+        results = [bench_profile(profile, url, args.runs, not args.headed) for profile in BROWSER_PROFILES]
+    finally:
+        if site is not None:
+            site.shutdown()
+            site.server_close()
+
+    meta = run_metadata(url=args.url or 'local fixture', runs=args.runs, assets=None if args.url else args.assets,
+                        asset_latency_ms=None if args.url else args.asset_latency)
+    print_table(results, ('startup_ms', 'p50_ms', 'p99_ms', 'peak_rss_mb'))
+    write_results('browser', meta, results, args.out)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Synthetic job catalogues for the benchmarks
+
+Generates N listings shaped like the scraper's output, deterministically
+for a given seed, with realistic repetition in company, location, job type
+and tags so filters and indexes behave as they would on real data.
+Posting dates are spread over two years.
+
+Usage: python benchmarks/catalog.py [--jobs N] [--seed S] [--out jobs.ndjson]
+       (--jobs accepts 1k / 100k / 1M style sizes)
+"""
+
+import argparse
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+
+COMPANIES = [f'Insurer {i}' for i in range(300)]
+LOCATIONS = ['New York, NY', 'Chicago, IL', 'Hartford, CT', 'London, UK', 'Remote', 'Toronto, ON']
+JOB_TYPES = ['Full-time', 'Part-time', 'Contract', 'Internship']
+TAGS = ['Life', 'P&C', 'Health', 'Pricing', 'Reserving', 'Python', 'R', 'SQL', 'ASA', 'FSA', 'Excel']
+TITLES = ['Actuarial Analyst', 'Pricing Actuary', 'Reserving Actuary', 'Actuarial Intern',
+          'Senior Actuary', 'Data Scientist', 'Capital Modelling Actuary', 'Valuation Actuary']
+
+SIZES = {'1k': 1_000, '100k': 100_000, '1M': 1_000_000}
+FIRST_DATE = datetime(2023, 1, 1)
+
+
+def parse_size(value):
+    """'1k', '100k', '1M' or a plain number"""
+    if value in SIZES:
+        return SIZES[value]
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(value[-1:].lower())
+    if multiplier:
+        return int(float(value[:-1]) * multiplier)
+    return int(value)
+
+
+def generate_jobs(count, seed=0):
+    """Yield `count` job dicts"""
+    rng = random.Random(seed)
+    for i in range(count):
+        company = rng.choice(COMPANIES)
+        location = rng.choice(LOCATIONS)
+        fingerprint = f'{seed:04x}{i:012x}'
+        posted_at = FIRST_DATE + timedelta(minutes=rng.randrange(2 * 365 * 24 * 60))
+        yield {
+            'id': f'scraped_{fingerprint}',
+            'fingerprint': fingerprint,
+            'title': f'{rng.choice(TITLES)} {i}',
+            'company': company,
+            'location': location,
+            'job_type': rng.choice(JOB_TYPES),
+            'tags': rng.sample(TAGS, 3),
+            'posting_date': posted_at.isoformat(),
+            'url': f'https://www.actuarylist.com/jobs/{i}',
+            'description': f'Actuarial position at {company} in {location}. '
+                           'This job was scraped from ActuaryList.com.'
+        }
+
+
+def scraped_lines(count, seed=0):
+    """The same jobs as NDJSON lines, as the backend receives them from the scraper"""
+    for job in generate_jobs(count, seed):
+        yield json.dumps(job)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--jobs', type=parse_size, default=SIZES['1k'])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help='NDJSON file to write (default: stdout)')
+    args = parser.parse_args()
+
+    out = open(args.out, 'w') if args.out else sys.stdout
+    try:
+        for line in scraped_lines(args.jobs, args.seed):
+            out.write(line + '\n')
+    finally:
+        if args.out:
+            out.close()
+
+
+if __name__ == '__main__':
+    main()
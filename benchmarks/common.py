@@ -0,0 +1,105 @@
+"""
+Helpers shared by the benchmark scripts: import paths, latency summaries
+and the JSON result format.
+
+Every script writes one JSON document:
+
+    {"benchmark": "<name>", "meta": {...run environment...},
+     "results": [{"name": ..., <measurements>}, ...]}
+
+so runs can be diffed with benchmarks/compare.py.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+BACKEND_DIR = os.path.join(ROOT, 'backend')
+SCRAPER_DIR = os.path.join(ROOT, 'scraper')
+
+
+def add_path(directory):
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, elapsed, errors=0):
+    """Latency (ms) percentiles and throughput for one scenario"""
+    ordered = sorted(latencies)
+    return {
+        'requests': len(ordered),
+        'errors': errors,
+        'p50_ms': round(percentile(ordered, 0.50), 3) if ordered else None,
+        'p99_ms': round(percentile(ordered, 0.99), 3) if ordered else None,
+        'mean_ms': round(sum(ordered) / len(ordered), 3) if ordered else None,
+        'max_ms': round(ordered[-1], 3) if ordered else None,
+        'rps': round(len(ordered) / elapsed, 1) if elapsed > 0 else None,
+    }
+
+
+def time_calls(func, repeat):
+    """Call func() `repeat` times; returns (latencies in ms, total seconds)"""
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        call_started = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - call_started) * 1000)
+    return latencies, time.perf_counter() - started
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_metadata(**extra):
+    meta = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+    meta.update(extra)
+    return meta
+
+
+def write_results(benchmark, meta, results, out=None):
+    """Write the result document to `out` (a path) or stdout"""
+    document = {'benchmark': benchmark, 'meta': meta, 'results': results}
+    text = json.dumps(document, indent=2)
+    if out:
+        with open(out, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    return document
+
+
+def print_table(results, columns):
+    """Human-readable summary on stderr, leaving stdout for the JSON"""
+    width = max(len(result['name']) for result in results) if results else 10
+    print(f"{'name':<{width}}  " + '  '.join(f'{column:>10}' for column in columns), file=sys.stderr)
+    for result in results:
+        cells = []
+        for column in columns:
+            value = result.get(column)
+            cells.append(f'{value:>10}' if value is not None else f"{'-':>10}")
+        print(f"{result['name']:<{width}}  " + '  '.join(cells), file=sys.stderr)
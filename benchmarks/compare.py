@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Compare two benchmark result files
+
+Matches results by name (and mode, for the API benchmark) and prints the
+change in each metric from the baseline run to the new one. Latency
+increases and throughput drops beyond --threshold percent are flagged,
+and the exit status is 1 if any were, so this can gate a CI job.
+
+Usage: python benchmarks/compare.py baseline.json new.json [--threshold PCT]
+"""
+
+import argparse
+import json
+import sys
+
+# Metric -> True when a higher value is better
+METRICS = {'p50_ms': False, 'p99_ms': False, 'mean_ms': False, 'rps': True}
+
+
+def load(path):
+    with open(path) as f:
+        document = json.load(f)
+    return document, {(result['name'], result.get('mode')): result for result in document['results']}
+
+
+def change(old, new):
+    if old in (None, 0) or new is None:
+        return None
+    return (new - old) / old * 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('baseline')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='percent change counted as a regression')
+    args = parser.parse_args()
+
+    baseline_doc, baseline = load(args.baseline)
+    new_doc, new = load(args.new)
+    if baseline_doc['benchmark'] != new_doc['benchmark']:
+        raise SystemExit(f"Different benchmarks: {baseline_doc['benchmark']} vs {new_doc['benchmark']}")
+    print(f"baseline {baseline_doc['meta'].get('commit')} {baseline_doc['meta'].get('timestamp')}")
+    print(f"new      {new_doc['meta'].get('commit')} {new_doc['meta'].get('timestamp')}")
+
+    regressions = 0
+    width = max(len(' '.join(filter(None, key))) for key in new) if new else 10
+    for key, result in new.items():
+        old = baseline.get(key)
+        label = ' '.join(filter(None, key))
+        if old is None:
+            print(f'{label:<{width}}  (new)')
+            continue
+        cells = []
+        for metric, higher_is_better in METRICS.items():
+            delta = change(old.get(metric), result.get(metric))
+            if delta is None:
+                continue
+            regressed = (delta < -args.threshold) if higher_is_better else (delta > args.threshold)
+            regressions += regressed
+            cells.append(f"{metric} {old[metric]}→{result[metric]} ({delta:+.1f}%){' !' if regressed else ''}")
+        print(f"{label:<{width}}  " + '  '.join(cells))
+
+    if regressions:
+        print(f'{regressions} regression(s) beyond {args.threshold}%')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
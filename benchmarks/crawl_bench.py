@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Crawler throughput against a local fixture site
+
+Serves a synthetic job board on a local port: --pages results pages, each
+a copy of the saved ActuaryList page (scraper/fixtures) cut to --listings
+listings, with its own job URLs, a simulated --latency per response and a
+pagination bar linking the next --fanout pages. Every --fail-every'th page answers 503 once, so the
+retry path is exercised too.
+
+The board is crawled from its first page at each --concurrency level,
+reporting pages per second (rps), fetch latency and the jobs found. While
+network latency dominates, throughput grows with the limit; past that,
+parsing (--parse-workers processes) is the bottleneck.
+
+Usage: python benchmarks/crawl_bench.py [--pages N] [--listings N] [--latency MS]
+           [--fanout N] [--concurrency 1,2,4,8,16] [--rate R] [--parse-workers N]
+           [--out results.json]
+"""
+
+import argparse
+import logging
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from bs4 import BeautifulSoup
+
+from common import SCRAPER_DIR, add_path, print_table, run_metadata, summarize, write_results
+
+add_path(SCRAPER_DIR)
+
+from crawler import Crawler  # noqa: E402
+from job_parser import HTML_PARSER, LISTING_CLASS  # noqa: E402
+from sources import ActuaryListSource  # noqa: E402
+
+FIXTURE = os.path.join(SCRAPER_DIR, 'fixtures', 'actuarylist_jobs.html')
+JOB_HREF = re.compile(r'href="(/job/[^"]+)"')
+
+
+def trim_listings(html, count):
+    """The page with only its first `count` listings"""
+    soup = BeautifulSoup(html, HTML_PARSER)
+    listings = [element for element in soup.select(f'.{LISTING_CLASS}')
+                if element.find_parent(class_=LISTING_CLASS) is None]
+    for element in listings[count:]:
+        element.decompose()
+    return str(soup)
+
+
+class FixtureSite(ThreadingHTTPServer):
+    """A paginated job board built from one saved results page"""
+
+    daemon_threads = True
+
+    def __init__(self, template, pages, fanout, latency, fail_every):
+        super().__init__(('127.0.0.1', 0), FixtureHandler)
+        self.template = template
+        self.pages = pages
+        self.fanout = fanout
+        self.latency = latency
+        self.fail_every = fail_every
+        self.failed = set()
+        self.lock = threading.Lock()
+
+    def render(self, page):
+        links = ''.join(f'<a class="page-link" href="/jobs?page={n}">{n}</a>'
+                        for n in range(page + 1, min(self.pages, page + self.fanout) + 1))
+        html = JOB_HREF.sub(lambda match: f'href="{match.group(1)}-p{page}"', self.template)
+        return html.replace('</main>', f'</main><nav class="pagination">{links}</nav>')
+
+    def should_fail(self, page):
+        if not self.fail_every or page % self.fail_every:
+            return False
+        with self.lock:
+            if page in self.failed:
+                return False
+            self.failed.add(page)
+            return True
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        site = self.server
+        time.sleep(site.latency)
+        url = urlsplit(self.path)
+        page = int(parse_qs(url.query).get('page', ['1'])[0])
+        if url.path != '/jobs' or not 1 <= page <= site.pages:
+            self.send_body(404, b'not found')
+        elif site.should_fail(page):
+            self.send_body(503, b'try again')
+        else:
+            self.send_body(200, site.render(page).encode('utf-8'))
+
+    def send_body(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def bench_crawl(base_url, concurrency, args):
+    source = ActuaryListSource(start_urls=[f'{base_url}/jobs?page=1'])
+    crawler = Crawler([source], max_jobs=args.pages * 100, concurrency=concurrency, per_host=concurrency,
+                      rate=args.rate, backoff=0.05, max_pages=args.pages, parse_workers=args.parse_workers)
+    started = time.perf_counter()
+    try:
+        jobs = crawler.crawl()
+    finally:
+        crawler.close()
+    elapsed = time.perf_counter() - started
+    fetch_ms = [seconds * 1000 for seconds in crawler.phase_seconds.get('http_fetch', [])]
+    summary = summarize(fetch_ms, elapsed, crawler.failed_pages)
+    # Throughput in pages (not fetches, which include retries) per second
+    summary['rps'] = round(crawler.pages / elapsed, 1) if elapsed > 0 else None
+    return dict(name=f'crawl c={concurrency}', concurrency=concurrency, pages=crawler.pages, jobs=len(jobs),
+                seconds=round(elapsed, 3), **summary)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--pages', type=int, default=60, help='results pages on the fixture site')
+    parser.add_argument('--listings', type=int, default=10, help='listings per page (the fixture has 40)')
+    parser.add_argument('--latency', type=float, default=200, help='server latency per response, in ms')
+    parser.add_argument('--fanout', type=int, default=5, help='pagination links on each page')
+    parser.add_argument('--fail-every', type=int, default=10, help='every Nth page fails once with 503 (0: never)')
+    parser.add_argument('--concurrency', default='1,2,4,8,16', help='comma-separated concurrency levels')
+    parser.add_argument('--rate', type=float, default=None, help='requests per second limit for the host')
+    parser.add_argument('--parse-workers', type=int, default=None, help='parse processes (default: CPUs)')
+    parser.add_argument('--out', help='write the JSON results here (default: stdout)')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    with open(FIXTURE, encoding='utf-8') as f:
+        template = trim_listings(f.read(), args.listings)
+    results = []
+    for concurrency in (int(level) for level in args.concurrency.split(',')):
+        # A fresh site per run, so every run sees the same failures
+        site = FixtureSite(template, args.pages, args.fanout, args.latency / 1000, args.fail_every)
+        thread = threading.Thread(target=site.serve_forever, daemon=True)
+        thread.start()
+        try:
+            results.append(bench_crawl(f'http://127.0.0.1:{site.server_port}', concurrency, args))
+        finally:
+            site.shutdown()
+            site.server_close()
+
+    meta = run_metadata(pages=args.pages, listings=args.listings, latency_ms=args.latency, fanout=args.fanout,
+                        fail_every=args.fail_every, rate=args.rate)
+    print_table(results, ('pages', 'jobs', 'p50_ms', 'rps', 'errors'))
+    write_results('crawl', meta, results, args.out)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Memory per job for the in-memory job store
+
+Builds N synthetic scraped listings (decoded from NDJSON, as the backend
+receives them from the scraper) and reports bytes per job for:
+
+    dicts          one dict per job (the old jobs_storage representation)
+    records        JobRecord objects (__slots__, interned strings)
+    store          a JobStore holding the jobs, with all of its indexes
+    store+json     the same store after every job's JSON has been cached
+
+Usage: python benchmarks/memory_per_job.py [--jobs N] [--json]
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+
+from catalog import scraped_lines
+from common import BACKEND_DIR, add_path
+
+add_path(BACKEND_DIR)
+
+from job_store import JobRecord, JobStore  # noqa: E402
+
+def measure(build, count):
+    """Bytes per job retained by whatever build() returns"""
+    lines = list(scraped_lines(count))
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build(lines)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (after - before) / count
+
+
+def build_store_with_json(lines):
+    store = JobStore(json.loads(line) for line in lines)
+    store.encode_all(store.jobs_by_date())
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--jobs', type=int, default=100_000)
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    results = {
+        'jobs': args.jobs,
+        'bytes_per_job': {
+            'dicts': measure(lambda lines: [json.loads(line) for line in lines], args.jobs),
+            'records': measure(lambda lines: [JobRecord(json.loads(line)) for line in lines], args.jobs),
+            'store': measure(lambda lines: JobStore(json.loads(line) for line in lines), args.jobs),
+            'store+json': measure(build_store_with_json, args.jobs),
+        }
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{args.jobs} jobs")
+    for name, per_job in results['bytes_per_job'].items():
+        print(f"  {name:<12} {per_job:8.0f} bytes/job  ({per_job * 1_000_000 / 2**30:5.2f} GiB per million)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Scraper extraction speed on saved HTML pages
+
+Times the offline parsing steps of scraper/job_parser.py against the
+fixture pages in scraper/fixtures (or --fixtures DIR):
+
+    split_listings         cut a whole page into listing fragments
+    parse_job_html         extract one listing's fields (default selector order)
+    parse_job_html+profile the same with a SelectorProfile's learned order
+    fingerprint            hash one listing's identity
+    parse_listings serial  a batch of --batch listings, in this process
+    parse_listings pool    the same batch through a process pool started (and
+                           warmed up) once, as the scraper service keeps it;
+                           needs more than one --workers
+
+Per-call p50/p99 latency and calls per second are reported; the batch
+rows count one call per listing.
+
+Usage: python benchmarks/parse_bench.py [--fixtures DIR] [--repeat N] [--batch N]
+           [--out results.json]
+"""
+
+import argparse
+import glob
+import os
+import time
+
+from common import SCRAPER_DIR, add_path, print_table, run_metadata, summarize, time_calls, write_results
+
+add_path(SCRAPER_DIR)
+
+from job_parser import (  # noqa: E402
+    FIELD_SELECTORS, HTML_PARSER, SelectorProfile, create_parse_pool, fingerprint, parse_job_html, parse_listings,
+    split_listings
+)
+
+DEFAULT_FIXTURES = os.path.join(SCRAPER_DIR, 'fixtures')
+
+
+def load_pages(directory):
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        with open(path, encoding='utf-8') as f:
+            pages[os.path.basename(path)] = f.read()
+    if not pages:
+        raise SystemExit(f'No *.html fixtures in {directory}')
+    return pages
+
+
+def bench_each(name, func, items, repeat):
+    """Time func(item) for every item, `repeat` passes over the list"""
+    latencies = []
+    elapsed = 0.0
+    for _ in range(repeat):
+        for item in items:
+            item_latencies, item_elapsed = time_calls(lambda: func(item), 1)
+            latencies.extend(item_latencies)
+            elapsed += item_elapsed
+    return dict(name=name, **summarize(latencies, elapsed))
+
+
+def bench_batch(name, fragments, executor, repeat):
+    """parse_listings over a whole batch; latency is per listing"""
+    if executor is not None:
+        # Start the workers and import the parser in them before timing
+        list(parse_listings(fragments, executor=executor))
+    latencies = []
+    elapsed = 0.0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = list(parse_listings(fragments, executor=executor))
+        elapsed += time.perf_counter() - started
+        latencies.extend(elapsed_ms for _, elapsed_ms in results)
+    return dict(name=name, listings=len(fragments), **summarize(latencies, elapsed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES, help='directory of saved listing pages')
+    parser.add_argument('--repeat', type=int, default=20, help='passes over the fixtures')
+    parser.add_argument('--batch', type=int, default=400, help='listings per parse_listings batch')
+    parser.add_argument('--workers', type=int, default=None, help='process pool size (default: CPUs)')
+    parser.add_argument('--out', help='write the JSON results here (default: stdout)')
+    args = parser.parse_args()
+
+    pages = load_pages(args.fixtures)
+    fragments = [fragment for page in pages.values() for fragment in split_listings(page)]
+    if not fragments:
+        raise SystemExit('The fixtures contain no job listings')
+    jobs = [parse_job_html(fragment)[0] for fragment in fragments]
+
+    # A profile trained on the fixtures, as a long-running scraper would have
+    profile = SelectorProfile('benchmark')
+    for fragment in fragments:
+        profile.merge(parse_job_html(fragment)[1])
+    learned_order = {field: profile.selectors(field) for field in FIELD_SELECTORS}
+
+    batch = (fragments * (args.batch // len(fragments) + 1))[:args.batch]
+    results = [
+        bench_each('split_listings', split_listings, list(pages.values()), args.repeat),
+        bench_each('parse_job_html', parse_job_html, fragments, args.repeat),
+        bench_each('parse_job_html+profile', lambda html: parse_job_html(html, learned_order),
+                   fragments, args.repeat),
+        bench_each('fingerprint', fingerprint, jobs, args.repeat * 10),
+        bench_batch('parse_listings serial', batch, None, max(1, args.repeat // 10)),
+    ]
+    parse_pool = create_parse_pool(args.workers)
+    if parse_pool is not None:
+        try:
+            results.append(bench_batch('parse_listings pool', batch, parse_pool, max(1, args.repeat // 10)))
+        finally:
+            parse_pool.shutdown()
+
+    meta = run_metadata(fixtures=sorted(pages), listings=len(fragments), html_parser=HTML_PARSER,
+                        repeat=args.repeat, batch=args.batch)
+    print_table(results, ('p50_ms', 'p99_ms', 'rps'))
+    write_results('parse', meta, results, args.out)
+
+
+if __name__ == '__main__':
+    main()
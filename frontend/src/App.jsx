@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useRef } from "react";
 import { Button } from "@/components/ui/button";
 import JobCard from "./components/JobCard";
 import JobForm from "./components/JobForm";
@@ -6,10 +6,31 @@ import JobFilters from "./components/JobFilters";
 import { jobsApi } from "./services/api";
 import { Plus, Briefcase, AlertCircle, Loader2, Download } from "lucide-react";
 
+// Jobs fetched per request; "Load more" continues from the page's cursor
+const PAGE_SIZE = 20;
+// Wait this long after the last keystroke before querying the API
+const FILTER_DEBOUNCE_MS = 300;
+
+// The filters as GET /jobs query parameters. The API filters and sorts;
+// tag is an exact (case-insensitive) match on one tag.
+const toQuery = (filters) => ({
+  title: filters.title,
+  company: filters.company,
+  location: filters.location,
+  job_type: filters.job_type,
+  tag: filters.tags ? filters.tags.trim() : undefined,
+  sort: filters.sort,
+});
+
 function App() {
   const [jobs, setJobs] = useState([]);
   const [filteredJobs, setFilteredJobs] = useState([]);
+  // null while the API is reachable; the mock jobs when it isn't
+  const [localJobs, setLocalJobs] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [total, setTotal] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState(null);
   const [isFormOpen, setIsFormOpen] = useState(false);
   const [editingJob, setEditingJob] = useState(null);
@@ -66,29 +87,44 @@ function App() {
     },
   ];
 
-  // Load jobs on component mount
+  // Only the latest request may update the list
+  const requestId = useRef(0);
+
+  // Load the first page on mount and again (debounced) when filters change
   useEffect(() => {
-    loadJobs();
-  }, []);
+    const timer = setTimeout(loadJobs, loading ? 0 : FILTER_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [filters]);
 
-  // Apply filters when filters or jobs change
+  // The API already filtered and sorted its results; mock data is
+  // filtered here the same way
   useEffect(() => {
-    applyFilters();
-  }, [jobs, filters]);
+    setFilteredJobs(localJobs ? applyFilters(localJobs) : jobs);
+  }, [jobs, localJobs, filters]);
 
   const loadJobs = async () => {
+    const id = ++requestId.current;
     try {
-      setLoading(true);
       setError(null);
 
       // Try to fetch from API, fallback to mock data
       try {
-        const fetchedJobs = await jobsApi.getJobs(filters);
-        setJobs(fetchedJobs);
+        const page = await jobsApi.getJobsPage(toQuery(filters), {
+          limit: PAGE_SIZE,
+          includeTotal: true,
+        });
+        if (id !== requestId.current) return;
+        setLocalJobs(null);
+        setJobs(page.jobs);
+        setNextCursor(page.nextCursor);
+        setTotal(page.total);
       } catch (apiError) {
+        if (id !== requestId.current) return;
         console.warn("API not available, using mock data:", apiError);
         // Use mock data when API is not available
-        setJobs(mockJobs);
+        setLocalJobs((current) => current || mockJobs);
+        setNextCursor(null);
+        setTotal(null);
       }
     } catch (err) {
       setError("Failed to load jobs. Please try again later.");
@@ -98,8 +134,30 @@ function App() {
     }
   };
 
-  const applyFilters = () => {
-    let filtered = [...jobs];
+  const loadMoreJobs = async () => {
+    const id = requestId.current;
+    try {
+      setLoadingMore(true);
+      const page = await jobsApi.getJobsPage(toQuery(filters), {
+        limit: PAGE_SIZE,
+        cursor: nextCursor,
+      });
+      // Ignore a page of results for filters that have since changed
+      if (id !== requestId.current) return;
+      setJobs((current) => [...current, ...page.jobs]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      console.error("Error loading more jobs:", err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // Update the jobs in state: the API's pages, or the local mock jobs
+  const setAllJobs = (update) => (localJobs ? setLocalJobs : setJobs)(update);
+
+  const applyFilters = (source) => {
+    let filtered = [...source];
 
     // Apply filters
     if (filters.title) {
@@ -122,11 +180,10 @@ function App() {
       filtered = filtered.filter((job) => job.job_type === filters.job_type);
     }
 
-    if (filters.tags) {
+    if (filters.tags && filters.tags.trim()) {
+      const wanted = filters.tags.trim().toLowerCase();
       filtered = filtered.filter((job) =>
-        job.tags.some((tag) =>
-          tag.toLowerCase().includes(filters.tags.toLowerCase()),
-        ),
+        job.tags.some((tag) => tag.trim().toLowerCase() === wanted),
       );
     }
 
@@ -145,7 +202,7 @@ function App() {
       );
     }
 
-    setFilteredJobs(filtered);
+    return filtered;
   };
 
   const handleAddJob = () => {
@@ -165,10 +222,11 @@ function App() {
 
     try {
       await jobsApi.deleteJob(id);
-      setJobs(jobs.filter((job) => job.id !== id));
+      setAllJobs((current) => current.filter((job) => job.id !== id));
+      setTotal((current) => (current === null ? null : current - 1));
     } catch (err) {
       // For mock data, just remove from state
-      setJobs(jobs.filter((job) => job.id !== id));
+      setAllJobs((current) => current.filter((job) => job.id !== id));
       console.warn("API not available, removed from local state");
     }
   };
@@ -181,8 +239,8 @@ function App() {
         // Update existing job
         try {
           const updatedJob = await jobsApi.updateJob(editingJob.id, formData);
-          setJobs(
-            jobs.map((job) => (job.id === editingJob.id ? updatedJob : job)),
+          setAllJobs((current) =>
+            current.map((job) => (job.id === editingJob.id ? updatedJob : job)),
           );
         } catch (err) {
           // For mock data, update locally
@@ -194,15 +252,16 @@ function App() {
               .map((tag) => tag.trim())
               .filter((tag) => tag),
           };
-          setJobs(
-            jobs.map((job) => (job.id === editingJob.id ? updatedJob : job)),
+          setAllJobs((current) =>
+            current.map((job) => (job.id === editingJob.id ? updatedJob : job)),
           );
         }
       } else {
         // Create new job
         try {
           const newJob = await jobsApi.createJob(formData);
-          setJobs([newJob, ...jobs]);
+          setAllJobs((current) => [newJob, ...current]);
+          setTotal((current) => (current === null ? null : current + 1));
         } catch (err) {
           // For mock data, create locally
           const newJob = {
@@ -214,7 +273,7 @@ function App() {
               .filter((tag) => tag),
             posting_date: new Date().toISOString(),
           };
-          setJobs([newJob, ...jobs]);
+          setAllJobs((current) => [newJob, ...current]);
         }
       }
 
@@ -284,8 +343,7 @@ function App() {
       await new Promise((resolve) => setTimeout(resolve, 3000));
 
       // Add scraped jobs to the existing jobs
-      const newJobs = [...mockScrapedJobs, ...jobs];
-      setJobs(newJobs);
+      setAllJobs((current) => [...mockScrapedJobs, ...current]);
 
       alert(
         `Successfully scraped ${mockScrapedJobs.length} jobs from ActuaryList!`,
@@ -298,6 +356,10 @@ function App() {
     }
   };
 
+  const noFilters = !Object.entries(filters).some(
+    ([key, value]) => key !== "sort" && value,
+  );
+
   if (loading) {
     return (
       <div className="min-h-screen bg-gray-50 flex items-center justify-center">
@@ -374,7 +436,8 @@ function App() {
         {/* Results Summary */}
         <div className="mb-6">
           <p className="text-gray-600">
-            Showing {filteredJobs.length} of {jobs.length} jobs
+            Showing {filteredJobs.length} of{" "}
+            {localJobs ? localJobs.length : (total ?? filteredJobs.length)} jobs
           </p>
         </div>
 
@@ -386,11 +449,11 @@ function App() {
               No jobs found
             </h3>
             <p className="text-gray-600 mb-4">
-              {jobs.length === 0
+              {noFilters
                 ? "No jobs have been posted yet."
                 : "Try adjusting your filters to see more results."}
             </p>
-            {jobs.length === 0 && (
+            {noFilters && (
               <Button
                 onClick={handleAddJob}
                 className="bg-blue-600 hover:bg-blue-700"
@@ -401,16 +464,32 @@ function App() {
             )}
           </div>
         ) : (
-          <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
-            {filteredJobs.map((job) => (
-              <JobCard
-                key={job.id}
-                job={job}
-                onEdit={handleEditJob}
-                onDelete={handleDeleteJob}
-              />
-            ))}
-          </div>
+          <>
+            <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
+              {filteredJobs.map((job) => (
+                <JobCard
+                  key={job.id}
+                  job={job}
+                  onEdit={handleEditJob}
+                  onDelete={handleDeleteJob}
+                />
+              ))}
+            </div>
+            {nextCursor && (
+              <div className="text-center mt-8">
+                <Button
+                  variant="outline"
+                  onClick={loadMoreJobs}
+                  disabled={loadingMore}
+                >
+                  {loadingMore && (
+                    <Loader2 className="h-4 w-4 mr-2 animate-spin" />
+                  )}
+                  Load more
+                </Button>
+              </div>
+            )}
+          </>
         )}
       </main>
 
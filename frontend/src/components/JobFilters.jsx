@@ -121,7 +121,7 @@ export default function JobFilters({
         {/* Tags Filter */}
         <div>
           <Input
-            placeholder="Tags (e.g. React)"
+            placeholder="Tag, exact (e.g. React)"
             value={filters.tags || ""}
             onChange={(e) => updateFilter("tags", e.target.value)}
           />
@@ -22,6 +22,26 @@ export const jobsApi = {
     return response.data;
   },
 
+  // Get one page of jobs; pass the returned nextCursor to fetch the next page
+  getJobsPage: async (filters, { limit = 20, cursor, includeTotal } = {}) => {
+    const params = new URLSearchParams();
+    if (filters) {
+      Object.entries(filters).forEach(([key, value]) => {
+        if (value) params.append(key, value);
+      });
+    }
+    params.append("limit", limit);
+    if (cursor) params.append("cursor", cursor);
+    if (includeTotal) params.append("include_total", "true");
+    const response = await api.get(`/jobs?${params.toString()}`);
+    const total = response.headers["x-total-count"];
+    return {
+      jobs: response.data,
+      nextCursor: response.headers["x-next-cursor"] || null,
+      total: total !== undefined ? Number(total) : null,
+    };
+  },
+
   // Get single job by ID
   getJob: async (id) => {
     const response = await api.get(`/jobs/${id}`);
@@ -57,9 +77,19 @@ export const jobsApi = {
     await api.delete(`/jobs/${id}`);
   },
   
-  // Scrape jobs from ActuaryList
-  scrapeJobs: async (maxJobs = 20) => {
+  // Scrape jobs from ActuaryList (queues a task and polls until it finishes)
+  scrapeJobs: async (maxJobs = 20, { pollInterval = 2000, onProgress } = {}) => {
     const response = await api.post("/scrape-jobs", { max_jobs: maxJobs });
-    return response.data;
+    const { task_id: taskId } = response.data;
+
+    for (;;) {
+      const { data: task } = await api.get(`/scrape-jobs/${taskId}`);
+      if (task.status === "completed") return task.result;
+      if (task.status === "failed") {
+        return { success: false, error: task.error };
+      }
+      if (onProgress) onProgress(task.progress);
+      await new Promise((resolve) => setTimeout(resolve, pollInterval));
+    }
   },
 };
@@ -7,8 +7,11 @@ and outputs them as JSON for integration with the job board application.
 """
 
 import json
+import logging
+import os
 import time
 import sys
+from contextlib import contextmanager
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -16,264 +19,480 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+from selenium.common.exceptions import TimeoutException
+from driver_pool import resolve_driver_path
+from fetchers import FetchError, HttpFetcher, USER_AGENT
+from job_parser import LISTING_CLASS, SelectorProfile, fingerprint, next_page_url, parse_listings, split_listings
+from seen_store import SeenStore
+
+logger = logging.getLogger(__name__)
+
+LOAD_MORE_XPATH = "//button[contains(text(), 'Load More') or contains(text(), 'Show More')]"
+# Seconds to wait for one click or scroll to bring in new listings
+LOAD_MORE_TIMEOUT = 15
+# A round is done once the DOM and network have been quiet this long after
+# new listings appeared; with no new listings, after IDLE_MS
+SETTLE_MS = 250
+IDLE_MS = 1500
+# Safety cap on click / scroll rounds for endless feeds
+MAX_LOAD_MORE_ROUNDS = 100
+
+# Installed once per page: a MutationObserver and fetch / XHR hooks that
+# record the last DOM or network activity and the requests in flight
+WATCH_SCRIPT = """
+if (!window.__listingWatch) {
+  const watch = window.__listingWatch = {inflight: 0, lastActivity: performance.now()};
+  const touch = () => { watch.lastActivity = performance.now(); };
+  new MutationObserver(touch).observe(document.body, {childList: true, subtree: true});
+  if (window.fetch) {
+    const fetch = window.fetch;
+    window.fetch = function() {
+      watch.inflight++; touch();
+      return fetch.apply(this, arguments).finally(() => { watch.inflight--; touch(); });
+    };
+  }
+  const send = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function() {
+    watch.inflight++; touch();
+    this.addEventListener('loadend', () => { watch.inflight--; touch(); });
+    return send.apply(this, arguments);
+  };
+}
+"""
+
+# [top-level listings, requests in flight, ms since the last activity]
+WATCH_STATE_SCRIPT = """
+const cls = arguments[0], watch = window.__listingWatch;
+const listings = Array.from(document.getElementsByClassName(cls))
+  .filter(e => !e.parentElement || !e.parentElement.closest('.' + cls)).length;
+return [listings, watch.inflight, performance.now() - watch.lastActivity];
+"""
+
+def configure_logging():
+    """Send progress and log messages to stderr; stdout carries only data"""
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stderr)
+
+# Browser profiles for create_driver: "lean" skips everything the scraper
+# doesn't read (images, media, fonts, analytics) and hands the page over
+# once the DOM is ready; "full" loads pages like a desktop browser
+BROWSER_PROFILES = ("lean", "full")
+
+# Requests the lean profile blocks (CDP Network.setBlockedURLs patterns)
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.mp4", "*.webm", "*.mp3", "*.ogg", "*.m4a",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*facebook.net*", "*connect.facebook.com*", "*hotjar.com*",
+    "*segment.io*", "*cdn.segment.com*", "*mixpanel.com*", "*clarity.ms*",
+    "*intercom.io*", "*newrelic.com*", "*nr-data.net*", "*sentry.io*",
+]
+
+def create_driver(headless=True, profile=None):
+    """
+    Start a Chrome WebDriver with the scraper's options. `profile` is one
+    of BROWSER_PROFILES, by default SCRAPER_BROWSER_PROFILE or "lean".
+    """
+    profile = profile or os.getenv('SCRAPER_BROWSER_PROFILE', 'lean')
+    if profile not in BROWSER_PROFILES:
+        raise ValueError(f"Unknown browser profile {profile!r}; expected one of {', '.join(BROWSER_PROFILES)}")
+    lean = profile == "lean"
+
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument(f'--user-agent={USER_AGENT}')
+    if lean:
+        chrome_options.add_argument('--window-size=1280,800')
+        chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+        chrome_options.add_argument('--disable-extensions')
+        chrome_options.add_argument('--disable-background-networking')
+        chrome_options.add_argument('--disable-component-update')
+        chrome_options.add_argument('--disable-default-apps')
+        chrome_options.add_argument('--disable-sync')
+        chrome_options.add_argument('--disable-features=Translate,MediaRouter,OptimizationHints')
+        chrome_options.add_argument('--mute-audio')
+        chrome_options.add_argument('--no-first-run')
+        chrome_options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.default_content_setting_values.notifications': 2,
+            'profile.default_content_setting_values.geolocation': 2,
+        })
+        # Return from driver.get() at DOMContentLoaded; the scraper waits
+        # for the listings explicitly anyway
+        chrome_options.page_load_strategy = 'eager'
+    else:
+        chrome_options.add_argument('--window-size=1920,1080')
+    
+    # The driver binary path is resolved once and cached, not on every start
+    service = Service(resolve_driver_path())
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+    if lean:
+        # Blocked for the whole session, so pooled drivers keep it
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+    # No implicit wait: page readiness is handled with explicit
+    # WebDriverWait conditions, and field extraction runs on the parsed
+    # HTML, so a missing element must not stall for seconds
+    driver.implicitly_wait(0)
+    return driver
 
 class ActuaryListScraper:
-    def __init__(self, headless=True, max_jobs=50):
+    SITE = "actuarylist.com"
+    JOBS_URL = "https://www.actuarylist.com/jobs"
+
+    def __init__(self, headless=True, max_jobs=50, selector_profile_path=None, parse_pool=None,
+                 fetch_mode="auto", fetcher=None, max_pages=10, driver_pool=None, on_job=None,
+                 incremental=False, seen_store=None, deadline=None):
         self.headless = headless
         self.max_jobs = max_jobs
+        # Optional long-lived process pool (job_parser.create_parse_pool)
+        # owned by the caller; without one listings are parsed in-process
+        self.parse_pool = parse_pool
+        # "auto" tries plain HTTP first and falls back to Selenium when the
+        # listings are rendered by JavaScript; "http" / "selenium" force one
+        self.fetch_mode = fetch_mode
+        self.fetcher = fetcher
+        self.max_pages = max_pages
+        # Optional DriverPool of warm browsers (see scraper_service)
+        self.driver_pool = driver_pool
+        # Optional callback invoked with each job as soon as it is parsed
+        self.on_job = on_job
+        # Incremental mode skips listings already in the seen store and
+        # stops paginating once it reaches them
+        self.seen = None
+        if incremental:
+            self.seen = seen_store if seen_store is not None else SeenStore.for_site(self.SITE)
+        self.known_count = 0
         self.driver = None
         self.jobs = []
+        # Learned selector order, kept between runs (SCRAPER_PROFILE_DIR)
+        if selector_profile_path:
+            self.selector_profile = SelectorProfile(self.SITE, selector_profile_path)
+        else:
+            self.selector_profile = SelectorProfile.for_site(self.SITE)
+        self.extraction_times_ms = []
+        # Seconds per phase (driver_startup, page_load, load_more,
+        # http_fetch, extract per listing), returned in the scrape summary
+        self.phase_seconds = {}
+        # time.monotonic() value after which the scrape gives up, checked
+        # between pages, load-more rounds and listings
+        self.deadline = deadline
+
+    def check_deadline(self):
+        """Raise TimeoutError once the scrape has run past its deadline"""
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise TimeoutError("Scraping timeout - the scrape took too long")
+
+    def record_phase(self, phase, seconds):
+        self.phase_seconds.setdefault(phase, []).append(round(seconds, 6))
+
+    @contextmanager
+    def timed_phase(self, phase):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_phase(phase, time.perf_counter() - started)
         
     def setup_driver(self):
         """Setup Chrome WebDriver with appropriate options"""
-        chrome_options = Options()
-        if self.headless:
-            chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
-        
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.driver.implicitly_wait(10)
+        with self.timed_phase("driver_startup"):
+            self.driver = create_driver(self.headless)
         
     def scrape_jobs(self):
         """Main scraping function"""
+        if self.fetch_mode != "selenium":
+            try:
+                jobs = self._scrape_with_http()
+                if jobs is not None:
+                    return jobs
+                logger.info("No listings in the static HTML, the page needs JavaScript")
+            except FetchError as e:
+                logger.warning(f"HTTP fetch failed: {str(e)}")
+            if self.fetch_mode == "http":
+                return []
+            logger.info("Falling back to Selenium...")
+        return self._scrape_with_browser()
+        
+    def _scrape_with_http(self):
+        """
+        Scrape the listing pages over plain HTTP, following pagination links.
+        Returns None when the pages contain no listings (JS-rendered site).
+        """
+        fetcher = self.fetcher or HttpFetcher()
         try:
-            print("Setting up Chrome driver...")
-            self.setup_driver()
+            jobs = []
+            url = self.JOBS_URL
+            pages = 0
+            while url and len(self.jobs) < self.max_jobs and pages < self.max_pages:
+                self.check_deadline()
+                logger.info(f"Fetching {url}...")
+                with self.timed_phase("http_fetch"):
+                    page_source = fetcher.fetch(url)
+                fragments = split_listings(page_source)
+                if not fragments:
+                    break
+                pages += 1
+                
+                known_before = self.known_count
+                jobs.extend(self._iter_fragments(fragments))
+                if self.known_count > known_before:
+                    # Listings are newest first, so the rest is already known
+                    logger.info("Reached already-known listings, stopping pagination")
+                    break
+                url = next_page_url(page_source, url)
+                
+            if not pages:
+                return None
+            self._finish()
+            return jobs
+        finally:
+            if fetcher is not self.fetcher:
+                fetcher.close()
+        
+    def _scrape_with_browser(self):
+        """Scrape the listings with a headless Chrome (for JS-rendered pages)"""
+        if self.driver_pool is not None:
+            # Borrow a warm driver; it goes back to the pool afterwards
+            try:
+                started = time.perf_counter()
+                with self.driver_pool.driver() as driver:
+                    # Checking out a warm driver, or starting one if none is idle
+                    self.record_phase("driver_startup", time.perf_counter() - started)
+                    self.driver = driver
+                    page_source = self._load_listing_page()
+            except TimeoutError:
+                raise
+            except Exception as e:
+                logger.warning(f"Error during scraping: {str(e)}")
+                return []
+            finally:
+                self.driver = None
+            return list(self.iter_jobs(page_source))
             
-            print("Navigating to Actuary List...")
-            self.driver.get("https://www.actuarylist.com/jobs")
+        try:
+            logger.info("Setting up Chrome driver...")
+            self.setup_driver()
+
+            page_source = self._load_listing_page()
+        except TimeoutError:
+            raise
+        except Exception as e:
+            logger.warning(f"Error during scraping: {str(e)}")
+            return []
+        finally:
+            # The browser isn't needed for parsing, so release it right away
+            if self.driver:
+                self.driver.quit()
+                self.driver = None
+
+        # Outside the browser's error handling: on_job errors propagate
+        return list(self.iter_jobs(page_source))
+                
+    def _load_listing_page(self):
+        """Open the jobs page in the browser and return its fully loaded HTML"""
+        self.check_deadline()
+        logger.info("Navigating to Actuary List...")
+        with self.timed_phase("page_load"):
+            self.driver.get(self.JOBS_URL)
             
             # Wait for page to load
             WebDriverWait(self.driver, 20).until(
                 EC.presence_of_element_located((By.CLASS_NAME, "job-listing"))
             )
-            
-            print("Page loaded, starting to scrape jobs...")
-            
-            # Try to load more jobs if there's a "Load More" button
+        
+        logger.info("Page loaded, starting to scrape jobs...")
+        
+        # Try to load more jobs if there's a "Load More" button
+        with self.timed_phase("load_more"):
             self._load_more_jobs()
-            
-            # Get all job listings
-            job_elements = self.driver.find_elements(By.CLASS_NAME, "job-listing")
-            print(f"Found {len(job_elements)} job listings")
-            
-            for i, job_element in enumerate(job_elements[:self.max_jobs]):
-                try:
-                    job_data = self._extract_job_data(job_element)
-                    if job_data:
-                        self.jobs.append(job_data)
-                        print(f"Scraped job {i+1}: {job_data['title']} at {job_data['company']}")
-                except Exception as e:
-                    print(f"Error scraping job {i+1}: {str(e)}")
+        
+        # Grab the whole document in a single WebDriver round-trip
+        return self.driver.page_source
+        
+    def iter_jobs(self, page_source):
+        """
+        Parse the job listings in a full page (live page_source or a saved
+        HTML file), yielding job dicts as they are extracted
+        """
+        yield from self._iter_fragments(split_listings(page_source))
+        self._finish()
+        
+    def _iter_fragments(self, fragments):
+        """Parse listing fragments, yielding new job dicts in page order"""
+        logger.info(f"Found {len(fragments)} job listings")
+        
+        remaining = self.max_jobs - len(self.jobs)
+        if remaining <= 0:
+            return
+        if self.seen is None:
+            # Every listing counts, so don't parse more than we can use
+            fragments = fragments[:remaining]
+        
+        results = parse_listings(fragments, self.selector_profile, self.parse_pool)
+        for i, (job_fields, elapsed_ms) in enumerate(results):
+            self.check_deadline()
+            self.record_phase("extract", elapsed_ms / 1000)
+            if job_fields is None:
+                logger.warning(f"Error scraping job {i+1}")
+                continue
+            job_fingerprint = fingerprint(job_fields)
+            if self.seen is not None:
+                known = job_fingerprint in self.seen
+                self.seen.add(job_fingerprint)
+                if known:
+                    self.known_count += 1
                     continue
-                    
-            print(f"Successfully scraped {len(self.jobs)} jobs")
-            return self.jobs
+            job_data = self._build_job(job_fields, job_fingerprint)
+            self.jobs.append(job_data)
+            self.extraction_times_ms.append(elapsed_ms)
+            logger.info(f"Scraped job {len(self.jobs)}: {job_data['title']} at {job_data['company']} ({elapsed_ms:.1f} ms)")
+            if self.on_job:
+                self.on_job(job_data)
+            yield job_data
+            if len(self.jobs) >= self.max_jobs:
+                break
             
-        except Exception as e:
-            print(f"Error during scraping: {str(e)}")
-            return []
-        finally:
-            if self.driver:
-                self.driver.quit()
-                
+    def _finish(self):
+        """Report timings and persist what was learned during the scrape"""
+        logger.info(f"Successfully scraped {len(self.jobs)} jobs")
+        if self.known_count:
+            logger.info(f"Skipped {self.known_count} already-known listings")
+        if self.extraction_times_ms:
+            average_ms = sum(self.extraction_times_ms) / len(self.extraction_times_ms)
+            logger.info(f"Average extraction time: {average_ms:.1f} ms per listing")
+        self.selector_profile.save()
+        if self.seen is not None:
+            self.seen.save()
+        
     def _load_more_jobs(self):
-        """Try to load more jobs by clicking load more button or scrolling"""
+        """
+        Click "Load More" (or scroll, for infinite scroll) until the page
+        shows max_jobs listings or a round brings no new ones. Each round
+        waits only until the new listings have rendered and the DOM and
+        network are quiet, not for a fixed delay.
+        """
         try:
-            # Try to find and click "Load More" button
-            load_more_buttons = self.driver.find_elements(By.XPATH, "//button[contains(text(), 'Load More') or contains(text(), 'Show More')]")
-            
-            for _ in range(3):  # Try up to 3 times
-                if load_more_buttons:
-                    button = load_more_buttons[0]
-                    if button.is_displayed() and button.is_enabled():
-                        self.driver.execute_script("arguments[0].click();", button)
-                        time.sleep(2)
-                        load_more_buttons = self.driver.find_elements(By.XPATH, "//button[contains(text(), 'Load More') or contains(text(), 'Show More')]")
-                    else:
-                        break
-                else:
-                    # Try scrolling to load more content
-                    self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(2)
+            self.driver.execute_script(WATCH_SCRIPT)
+            count = self._listing_state()[0]
+            for _ in range(MAX_LOAD_MORE_ROUNDS):
+                if count >= self.max_jobs:
                     break
-                    
-        except Exception as e:
-            print(f"Could not load more jobs: {str(e)}")
-            
-    def _extract_job_data(self, job_element):
-        """Extract job data from a job listing element"""
-        try:
-            # Get the HTML content for BeautifulSoup parsing
-            job_html = job_element.get_attribute('outerHTML')
-            soup = BeautifulSoup(job_html, 'html.parser')
-            
-            # Extract job title
-            title_element = job_element.find_element(By.CSS_SELECTOR, "h3, .job-title, [class*='title'], a[href*='/job/']")
-            title = title_element.text.strip() if title_element else "Unknown Title"
-            
-            # Extract company name
-            company_selectors = [
-                ".company-name", ".employer", "[class*='company']", 
-                "h4", ".job-company", "[data-company]"
-            ]
-            company = "Unknown Company"
-            for selector in company_selectors:
+                self.check_deadline()
+                self._request_more()
                 try:
-                    company_element = job_element.find_element(By.CSS_SELECTOR, selector)
-                    if company_element and company_element.text.strip():
-                        company = company_element.text.strip()
-                        break
-                except:
-                    continue
-                    
-            # Extract location
-            location_selectors = [
-                ".location", ".job-location", "[class*='location']",
-                "[data-location]", ".city", ".state"
-            ]
-            location = "Remote"
-            for selector in location_selectors:
-                try:
-                    location_element = job_element.find_element(By.CSS_SELECTOR, selector)
-                    if location_element and location_element.text.strip():
-                        location = location_element.text.strip()
-                        break
-                except:
-                    continue
-                    
-            # Extract posting date
-            date_selectors = [
-                ".date", ".posted-date", "[class*='date']", ".time",
-                "[data-date]", ".posted", "time"
-            ]
-            posting_date = datetime.now().isoformat()
-            for selector in date_selectors:
-                try:
-                    date_element = job_element.find_element(By.CSS_SELECTOR, selector)
-                    if date_element and date_element.text.strip():
-                        date_text = date_element.text.strip()
-                        # Keep original date text for now, could parse it later
-                        posting_date = datetime.now().isoformat()
-                        break
-                except:
-                    continue
-                    
-            # Extract job type (default to Full-time)
-            job_type_selectors = [
-                ".job-type", ".employment-type", "[class*='type']",
-                ".full-time", ".part-time", ".contract", ".intern"
-            ]
-            job_type = "Full-time"
-            for selector in job_type_selectors:
-                try:
-                    type_element = job_element.find_element(By.CSS_SELECTOR, selector)
-                    if type_element and type_element.text.strip():
-                        type_text = type_element.text.strip().lower()
-                        if 'part' in type_text:
-                            job_type = "Part-time"
-                        elif 'contract' in type_text:
-                            job_type = "Contract"
-                        elif 'intern' in type_text:
-                            job_type = "Internship"
-                        break
-                except:
-                    continue
-                    
-            # Extract tags/skills
-            tags = []
-            tag_selectors = [
-                ".skills", ".tags", ".keywords", "[class*='skill']",
-                ".badge", ".chip", ".tag", "[class*='tag']"
-            ]
-            
-            for selector in tag_selectors:
-                try:
-                    tag_elements = job_element.find_elements(By.CSS_SELECTOR, selector)
-                    for tag_element in tag_elements:
-                        tag_text = tag_element.text.strip()
-                        if tag_text and len(tag_text) < 50:  # Reasonable tag length
-                            tags.append(tag_text)
-                except:
-                    continue
-                    
-            # Default tags for actuarial jobs
-            if not tags:
-                tags = ["Actuarial", "Insurance", "Risk Management"]
-            else:
-                tags = list(set(tags[:5]))  # Limit to 5 unique tags
-                
-            # Create job data object
-            job_data = {
-                "id": f"scraped_{int(time.time())}_{len(self.jobs)}",
-                "title": title,
-                "company": company,
-                "location": location,
-                "job_type": job_type,
-                "tags": tags,
-                "posting_date": posting_date,
-                "description": f"Actuarial position at {company} in {location}. This job was scraped from ActuaryList.com."
-            }
-            
-            return job_data
-            
+                    new_count = WebDriverWait(self.driver, LOAD_MORE_TIMEOUT, poll_frequency=0.1).until(
+                        self._round_finished(count))[0]
+                except TimeoutException:
+                    logger.info("Timed out waiting for more listings")
+                    break
+                if new_count <= count:
+                    break
+                logger.info(f"Loaded more listings: {count} -> {new_count}")
+                count = new_count
+        except TimeoutError:
+            raise
         except Exception as e:
-            print(f"Error extracting job data: {str(e)}")
-            return None
+            logger.warning(f"Could not load more jobs: {str(e)}")
+
+    def _listing_state(self):
+        """(listings on the page, requests in flight, ms since last activity)"""
+        return self.driver.execute_script(WATCH_STATE_SCRIPT, LISTING_CLASS)
+
+    def _request_more(self):
+        """Click a visible Load More button, or scroll to the bottom"""
+        buttons = self.driver.find_elements(By.XPATH, LOAD_MORE_XPATH)
+        if buttons and buttons[0].is_displayed() and buttons[0].is_enabled():
+            self.driver.execute_script(
+                "window.__listingWatch.lastActivity = performance.now(); arguments[0].click();", buttons[0])
+        else:
+            self.driver.execute_script(
+                "window.__listingWatch.lastActivity = performance.now();"
+                " window.scrollTo(0, document.body.scrollHeight);")
+
+    def _round_finished(self, count):
+        """WebDriverWait condition returning the listing state once a round has settled"""
+        def condition(driver):
+            state = self._listing_state()
+            listings, inflight, quiet_ms = state
+            if listings >= self.max_jobs:
+                # Enough listings, no need to wait for the rest to render
+                return state
+            if inflight:
+                return False
+            if listings > count and quiet_ms >= SETTLE_MS:
+                return state
+            if quiet_ms >= IDLE_MS:
+                return state
+            return False
+        return condition
+            
+    def _build_job(self, job_fields, job_fingerprint):
+        """Create the job data object for parsed listing fields"""
+        job_data = {"id": f"scraped_{job_fingerprint}", "fingerprint": job_fingerprint}
+        job_data.update(job_fields)
+        return job_data
             
     def save_to_json(self, filename="scraped_jobs.json"):
         """Save scraped jobs to JSON file"""
         try:
             with open(filename, 'w', encoding='utf-8') as f:
                 json.dump(self.jobs, f, indent=2, ensure_ascii=False)
-            print(f"Saved {len(self.jobs)} jobs to {filename}")
+            logger.info(f"Saved {len(self.jobs)} jobs to {filename}")
         except Exception as e:
-            print(f"Error saving to JSON: {str(e)}")
+            logger.warning(f"Error saving to JSON: {str(e)}")
             
 def main():
     """Main function to run the scraper"""
+    configure_logging()
     try:
         # Parse command line arguments
         max_jobs = 50
         headless = True
+        html_file = None
         
         if len(sys.argv) > 1:
             try:
                 max_jobs = int(sys.argv[1])
             except ValueError:
-                print("Invalid max_jobs argument, using default: 50")
+                logger.warning("Invalid max_jobs argument, using default: 50")
                 
         if len(sys.argv) > 2:
             headless = sys.argv[2].lower() != 'false'
             
-        print(f"Starting scraper with max_jobs={max_jobs}, headless={headless}")
+        # Optional saved page to parse offline instead of launching a browser
+        if len(sys.argv) > 3:
+            html_file = sys.argv[3]
+            
+        logger.info(f"Starting scraper with max_jobs={max_jobs}, headless={headless}")
         
         # Create and run scraper
         scraper = ActuaryListScraper(headless=headless, max_jobs=max_jobs)
-        jobs = scraper.scrape_jobs()
+        if html_file:
+            with open(html_file, 'r', encoding='utf-8') as f:
+                jobs = list(scraper.iter_jobs(f.read()))
+        else:
+            jobs = scraper.scrape_jobs()
         
         if jobs:
             # Save to JSON file
             scraper.save_to_json("scraped_jobs.json")
             
             # Output JSON to stdout for API integration
-            print("\n=== SCRAPED JOBS JSON ===")
+            print("=== SCRAPED JOBS JSON ===")
             print(json.dumps(jobs, indent=2))
             print("=== END SCRAPED JOBS ===")
         else:
-            print("No jobs were scraped")
+            logger.info("No jobs were scraped")
             
     except KeyboardInterrupt:
-        print("\nScraping interrupted by user")
+        logger.info("Scraping interrupted by user")
     except Exception as e:
-        print(f"Error in main: {str(e)}")
+        logger.warning(f"Error in main: {str(e)}")
         
 if __name__ == "__main__":
     main()
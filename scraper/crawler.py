@@ -0,0 +1,294 @@
+"""
+Concurrent multi-page, multi-source crawler
+
+Crawls the results pages of one or more job boards (see sources.py) on an
+asyncio event loop. Every page's pagination and category links are queued
+as soon as the page is parsed, so pages are fetched in parallel instead of
+one "next" link at a time, and several boards are crawled at once.
+
+Limits are per host: at most `per_host` requests in flight and, with
+`rate`, at most that many requests started per second. A failed fetch is
+retried with exponential backoff and jitter, sleeping without holding a
+slot; 4xx responses other than 429 are not retried. `concurrency` caps the
+requests in flight over all hosts. A page that still can't be fetched or
+parsed is skipped (counted in failed_pages); an exception raised by
+on_job ends the crawl instead.
+
+Pages are downloaded with the same HttpFetcher as the scrapers (pooled
+keep-alive session, validator cache) on a thread pool, and parsed in a
+process pool, so the event loop never blocks on either and parsing, which
+is CPU-bound, isn't limited to one core. The pool is the caller's
+`parse_pool` (see job_parser.create_parse_pool) when given, else one of
+`parse_workers` processes kept for the crawler's lifetime (a single
+thread when that is 1); close() shuts the latter down. The crawler is HTTP only: a board that renders its
+listings with JavaScript still needs ActuaryListScraper's Selenium path.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from fetchers import FetchError, HttpFetcher
+from job_parser import create_parse_pool, fingerprint
+from seen_store import SeenStore
+from sources import get_source
+
+logger = logging.getLogger(__name__)
+
+# Failed fetches worth retrying: connection errors (no status) and these
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def parse_page(source, page_source, url, selector_order):
+    """A results page's listings and links; runs in the parse thread or a parse process"""
+    return list(source.listings(page_source, url, selector_order)), source.links(page_source, url)
+
+
+class HostLimiter:
+    """Caps the requests in flight to one host and how often they start"""
+
+    def __init__(self, concurrency, rate=None):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.interval = 1 / rate if rate else 0
+        self._next_start = 0.0
+
+    async def __aenter__(self):
+        await self.semaphore.acquire()
+        if self.interval:
+            # Reserve a start time before sleeping, so requests waiting
+            # together are still spaced `interval` apart
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+            try:
+                await asyncio.sleep(start - now)
+            except BaseException:
+                self.semaphore.release()
+                raise
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.semaphore.release()
+
+
+class Crawler:
+    def __init__(self, sources, max_jobs=50, concurrency=8, per_host=4, rate=None, retries=3,
+                 backoff=0.5, max_pages=50, parse_workers=None, parse_pool=None, fetcher=None,
+                 http_cache_dir=None, on_job=None, incremental=False, seen_store=None):
+        # Source instances or names registered in sources.SOURCES
+        self.sources = [get_source(source) if isinstance(source, str) else source for source in sources]
+        self.max_jobs = max_jobs
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.rate = rate
+        self.retries = retries
+        self.backoff = backoff
+        # Results pages fetched per source, at most
+        self.max_pages = max_pages
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        self.parse_pool = parse_pool
+        self._own_parse_pool = None
+        self.fetcher = fetcher
+        self.http_cache_dir = http_cache_dir
+        # Optional callback invoked with each job as soon as it is parsed
+        self.on_job = on_job
+        # Incremental crawls skip listings seen before and don't follow the
+        # links of pages that contain them; `seen_store`, if given, is used
+        # for every source instead of each one's store in ~/.cache
+        self.seen = None
+        if incremental:
+            self.seen = {source.name: seen_store if seen_store is not None else SeenStore.for_site(source.name)
+                         for source in self.sources}
+        self.known_count = 0
+        self.jobs = []
+        self.pages = 0
+        self.failed_pages = 0
+        # Seconds per phase (http_fetch, extract per listing), as in
+        # ActuaryListScraper
+        self.phase_seconds = {}
+
+    def record_phase(self, phase, seconds):
+        self.phase_seconds.setdefault(phase, []).append(round(seconds, 6))
+
+    def crawl(self, timeout=None):
+        """
+        Crawl every source and return the new jobs. With `timeout`, the
+        crawl is cancelled after that many seconds and raises TimeoutError.
+        """
+        return asyncio.run(self._crawl_with_timeout(timeout))
+
+    async def _crawl_with_timeout(self, timeout):
+        try:
+            return await asyncio.wait_for(self.crawl_async(), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError("Scraping timeout - the crawl took too long") from None
+
+    def close(self):
+        """Shut down the parse pool the crawler started, if any"""
+        if self._own_parse_pool is not None:
+            self._own_parse_pool.shutdown()
+            self._own_parse_pool = None
+
+    def _get_parse_pool(self):
+        if self.parse_pool is not None:
+            return self.parse_pool
+        if self._own_parse_pool is None:
+            self._own_parse_pool = (create_parse_pool(self.parse_workers)
+                                    or ThreadPoolExecutor(1, thread_name_prefix="crawl-parse"))
+        return self._own_parse_pool
+
+    async def crawl_async(self):
+        # The crawler retries itself (without blocking a fetch thread), so
+        # its own fetcher doesn't
+        fetcher = self.fetcher or HttpFetcher(pool_size=self.concurrency, retries=0, cache_dir=self.http_cache_dir)
+        self._fetch_pool = ThreadPoolExecutor(self.concurrency, thread_name_prefix="crawl-fetch")
+        self._parse_pool = self._get_parse_pool()
+        self._limiters = {}
+        self._queued = set()
+        self._page_counts = {}
+        self._fingerprints = set()
+
+        queue = asyncio.Queue()
+        for source in self.sources:
+            for url in source.start_urls:
+                self._enqueue(queue, source, url)
+        workers = [asyncio.create_task(self._worker(queue, fetcher)) for _ in range(self.concurrency)]
+        joined = asyncio.ensure_future(queue.join())
+        try:
+            # A worker only stops early by raising (e.g. on_job failed),
+            # which ends the crawl with that error
+            await asyncio.wait([joined, *workers], return_when=asyncio.FIRST_COMPLETED)
+            for worker in workers:
+                if worker.done():
+                    worker.result()
+        finally:
+            joined.cancel()
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self._fetch_pool.shutdown()
+            if fetcher is not self.fetcher:
+                fetcher.close()
+        self._finish()
+        return self.jobs
+
+    def _enqueue(self, queue, source, url):
+        if url in self._queued or self._page_counts.get(source.name, 0) >= self.max_pages:
+            return
+        self._queued.add(url)
+        self._page_counts[source.name] = self._page_counts.get(source.name, 0) + 1
+        queue.put_nowait((source, url))
+
+    async def _worker(self, queue, fetcher):
+        while True:
+            source, url = await queue.get()
+            try:
+                # Once enough jobs are in, the rest of the queue is drained
+                if len(self.jobs) < self.max_jobs:
+                    await self._crawl_page(queue, fetcher, source, url)
+            finally:
+                queue.task_done()
+
+    async def _crawl_page(self, queue, fetcher, source, url):
+        loop = asyncio.get_running_loop()
+        # A page that can't be fetched or parsed is skipped; errors from
+        # on_job are the caller's and propagate
+        try:
+            page_source = await self._fetch(loop, fetcher, url)
+            results, links = await loop.run_in_executor(self._parse_pool, parse_page, source, page_source, url,
+                                                        source.selector_order())
+        except Exception as e:
+            self.failed_pages += 1
+            logger.warning(f"Could not crawl {url}: {str(e)}")
+            return
+        self.pages += 1
+        logger.info(f"Crawled {url}: {len(results)} listings, {len(links)} links")
+
+        known_before = self.known_count
+        for job_fields, winners, elapsed_ms in results:
+            self.record_phase("extract", elapsed_ms / 1000)
+            source.selector_profile.merge(winners)
+            if len(self.jobs) >= self.max_jobs:
+                return
+            if job_fields is None:
+                logger.warning(f"Error scraping a listing on {url}")
+                continue
+            self._add_job(source, job_fields)
+        if self.known_count > known_before:
+            # Listings are newest first, so pages beyond this one are known
+            logger.info(f"Reached already-known listings on {url}, not following its links")
+            return
+        for link in links:
+            self._enqueue(queue, source, link)
+
+    async def _fetch(self, loop, fetcher, url):
+        host = urlsplit(url).netloc
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = self._limiters[host] = HostLimiter(self.per_host, self.rate)
+        for attempt in range(self.retries + 1):
+            try:
+                async with limiter:
+                    started = time.perf_counter()
+                    try:
+                        return await loop.run_in_executor(self._fetch_pool, fetcher.fetch, url)
+                    finally:
+                        self.record_phase("http_fetch", time.perf_counter() - started)
+            except FetchError as e:
+                if attempt == self.retries or (e.status is not None and e.status not in RETRY_STATUSES):
+                    raise
+                delay = self.backoff * 2 ** attempt * random.uniform(0.5, 1)
+                logger.info(f"{str(e)}; retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    def _add_job(self, source, job_fields):
+        job_fingerprint = fingerprint(job_fields)
+        if job_fingerprint in self._fingerprints:
+            # Also listed on another page of this crawl (e.g. a category)
+            return
+        self._fingerprints.add(job_fingerprint)
+        if self.seen is not None:
+            seen = self.seen[source.name]
+            known = job_fingerprint in seen
+            seen.add(job_fingerprint)
+            if known:
+                self.known_count += 1
+                return
+        job_data = source.build_job(job_fields, job_fingerprint)
+        self.jobs.append(job_data)
+        if self.on_job:
+            self.on_job(job_data)
+
+    def _finish(self):
+        logger.info(f"Crawled {self.pages} pages ({self.failed_pages} failed), {len(self.jobs)} new jobs")
+        if self.known_count:
+            logger.info(f"Skipped {self.known_count} already-known listings")
+        for source in self.sources:
+            source.finish()
+        if self.seen is not None:
+            for seen in self.seen.values():
+                seen.save()
+
+
+def settings_from_env():
+    """
+    Crawler options from the SCRAPER_CRAWL_* environment variables, or
+    None when SCRAPER_CRAWL_SOURCES (comma-separated source names) is unset
+    """
+    names = [name.strip() for name in os.getenv('SCRAPER_CRAWL_SOURCES', '').split(',') if name.strip()]
+    if not names:
+        return None
+    return {
+        'sources': names,
+        'concurrency': int(os.getenv('SCRAPER_CRAWL_CONCURRENCY', 8)),
+        'per_host': int(os.getenv('SCRAPER_CRAWL_PER_HOST', 4)),
+        # Requests per second per host; 0 means unlimited
+        'rate': float(os.getenv('SCRAPER_CRAWL_RATE', 0)) or None,
+        'retries': int(os.getenv('SCRAPER_CRAWL_RETRIES', 3)),
+        'max_pages': int(os.getenv('SCRAPER_CRAWL_MAX_PAGES', 50)),
+        # Parse processes; 0 means one per CPU
+        'parse_workers': int(os.getenv('SCRAPER_CRAWL_PARSE_WORKERS', 0)) or None,
+    }
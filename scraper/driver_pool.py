@@ -0,0 +1,192 @@
+"""
+Warm WebDriver pool
+
+Starting Chrome (and resolving the driver binary through webdriver-manager)
+costs several seconds per scrape. DriverPool keeps a few headless drivers
+alive between scrapes, health-checks them on checkout and recycles a
+driver after it has served `max_pages` pages or grown past `max_rss_mb`.
+"""
+
+import logging
+import os
+import queue
+import threading
+from contextlib import contextmanager
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+DRIVER_PATH_CACHE = os.path.join(os.path.expanduser('~'), '.cache', 'joblisting', 'chromedriver_path')
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def resolve_driver_path():
+    """
+    Path to the chromedriver binary. CHROMEDRIVER_PATH wins; otherwise the
+    path webdriver-manager resolved last time is reused from a small cache
+    file, and webdriver-manager is only consulted when that is missing.
+    """
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path and os.path.exists(_driver_path):
+            return _driver_path
+
+        path = os.getenv('CHROMEDRIVER_PATH')
+        if not path:
+            try:
+                with open(DRIVER_PATH_CACHE, 'r', encoding='utf-8') as f:
+                    path = f.read().strip()
+            except OSError:
+                path = None
+        if not path or not os.path.exists(path):
+            from webdriver_manager.chrome import ChromeDriverManager
+            path = ChromeDriverManager().install()
+            try:
+                os.makedirs(os.path.dirname(DRIVER_PATH_CACHE), exist_ok=True)
+                with open(DRIVER_PATH_CACHE, 'w', encoding='utf-8') as f:
+                    f.write(path)
+            except OSError as e:
+                logger.warning(f"Could not cache driver path: {str(e)}")
+
+        _driver_path = path
+        return path
+
+
+def driver_rss_mb(driver):
+    """Resident memory of chromedriver plus its browser processes, in MB"""
+    if psutil is None:
+        return None
+    try:
+        process = psutil.Process(driver.service.process.pid)
+        processes = [process] + process.children(recursive=True)
+        return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+    except (AttributeError, psutil.Error):
+        return None
+
+
+class PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+
+class DriverPool:
+    """
+    Fixed-size pool of WebDrivers created by `factory()`.
+
+    `max_rss_mb` recycling needs psutil; without it only the page count is
+    used.
+    """
+
+    def __init__(self, factory, size=1, max_pages=50, max_rss_mb=None):
+        self.factory = factory
+        self.size = size
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+
+    def warm(self):
+        """Start drivers until the pool is full"""
+        while True:
+            with self._lock:
+                if self._closed or self._created >= self.size:
+                    return
+                self._created += 1
+            try:
+                self._idle.put(PooledDriver(self.factory()))
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+    def _checkout(self):
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                grow = self._created < self.size
+                if grow:
+                    self._created += 1
+            if grow:
+                try:
+                    return PooledDriver(self.factory())
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            # Pool is full: wait for a driver to come back (or be discarded)
+            try:
+                return self._idle.get(timeout=1)
+            except queue.Empty:
+                continue
+
+    @staticmethod
+    def _healthy(pooled):
+        try:
+            return pooled.driver.execute_script("return 1;") == 1
+        except Exception:
+            return False
+
+    def _needs_recycle(self, pooled):
+        if self.max_pages and pooled.pages >= self.max_pages:
+            return True
+        if self.max_rss_mb:
+            rss = driver_rss_mb(pooled.driver)
+            if rss is not None and rss > self.max_rss_mb:
+                return True
+        return False
+
+    def _discard(self, pooled):
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+        with self._lock:
+            self._created -= 1
+
+    @contextmanager
+    def driver(self):
+        """Check out a healthy driver; it is returned (or recycled) on exit"""
+        pooled = self._checkout()
+        if not self._healthy(pooled):
+            self._discard(pooled)
+            with self._lock:
+                self._created += 1
+            try:
+                pooled = PooledDriver(self.factory())
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            yield pooled.driver
+        except Exception:
+            # A failed scrape may leave the browser in a bad state
+            self._discard(pooled)
+            raise
+        else:
+            pooled.pages += 1
+            if self._closed or self._needs_recycle(pooled):
+                self._discard(pooled)
+            else:
+                self._idle.put(pooled)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
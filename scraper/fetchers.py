@@ -0,0 +1,108 @@
+"""
+Page fetchers for the scrapers
+
+HttpFetcher is the default way to download listing pages: a pooled,
+keep-alive requests.Session with gzip and conditional requests (ETag /
+If-Modified-Since), so unchanged pages cost a 304 and no body. Scrapers
+only start a browser when a page turns out to need JavaScript.
+
+Any object with fetch(url) -> html and close() can be used as a fetcher.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+
+class FetchError(Exception):
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        # HTTP status of the failed response; None for connection errors
+        self.status = status
+
+
+class HttpFetcher:
+    """Connection-pooled HTTP fetcher with an optional on-disk validator cache"""
+
+    def __init__(self, timeout=15, pool_size=10, retries=2, cache_dir=None, user_agent=USER_AGENT):
+        self.timeout = timeout
+        self.cache_dir = cache_dir
+        self._memory_cache = {}
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': user_agent,
+            'Accept': 'text/html,application/xhtml+xml',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive'
+        })
+        retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    # ------ Validator cache ------
+    def _cache_path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+    def _cached(self, url):
+        entry = self._memory_cache.get(url)
+        if entry is None and self.cache_dir:
+            try:
+                with open(self._cache_path(url), 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                entry = None
+        return entry
+
+    def _store(self, url, response):
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        entry = {'etag': etag, 'last_modified': last_modified, 'body': response.text}
+        self._memory_cache[url] = entry
+        if self.cache_dir:
+            try:
+                with open(self._cache_path(url), 'w', encoding='utf-8') as f:
+                    json.dump(entry, f)
+            except OSError as e:
+                logger.warning(f"Could not write HTTP cache: {str(e)}")
+
+    # ------ Fetching ------
+    def fetch(self, url):
+        """Return the HTML for `url`, revalidating any cached copy"""
+        headers = {}
+        cached = self._cached(url)
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise FetchError(f"Failed to fetch {url}: {str(e)}")
+
+        if response.status_code == 304 and cached:
+            return cached['body']
+        if response.status_code != 200:
+            raise FetchError(f"Failed to fetch {url}: HTTP {response.status_code}", response.status_code)
+
+        self._store(url, response)
+        return response.text
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,340 @@
+"""
+Offline job listing parser
+
+Each listing's outerHTML is fetched from the browser once and every field
+is extracted from the BeautifulSoup tree, so missing selectors cost
+microseconds instead of a WebDriver implicit wait. A SelectorProfile
+remembers which selector matched for each field so later listings on the
+same site try the winning selector first.
+
+For whole pages, split_listings cuts a saved or live page_source into
+per-listing fragments and parse_listings parses them, in a long-lived
+process pool from create_parse_pool when one is passed in, streaming the
+results back in page order.
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from urllib.parse import urljoin
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import repeat
+from bs4 import BeautifulSoup
+from listing_identity import fingerprint  # noqa: F401  (re-exported for the scrapers)
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+logger = logging.getLogger(__name__)
+
+# Candidate selectors per field, in default priority order
+FIELD_SELECTORS = {
+    'title': [
+        "h3", ".job-title", "[class*='title']", "a[href*='/job/']"
+    ],
+    'company': [
+        ".company-name", ".employer", "[class*='company']",
+        "h4", ".job-company", "[data-company]"
+    ],
+    'location': [
+        ".location", ".job-location", "[class*='location']",
+        "[data-location]", ".city", ".state"
+    ],
+    'posting_date': [
+        ".date", ".posted-date", "[class*='date']", ".time",
+        "[data-date]", ".posted", "time"
+    ],
+    'job_type': [
+        ".job-type", ".employment-type", "[class*='type']",
+        ".full-time", ".part-time", ".contract", ".intern"
+    ]
+}
+
+TAG_SELECTORS = [
+    ".skills", ".tags", ".keywords", "[class*='skill']",
+    ".badge", ".chip", ".tag", "[class*='tag']"
+]
+
+DEFAULT_TAGS = ["Actuarial", "Insurance", "Risk Management"]
+
+# Where learned selector profiles are kept between runs
+DEFAULT_PROFILE_DIR = os.getenv('SCRAPER_PROFILE_DIR') or os.path.join(os.path.expanduser('~'), '.cache', 'joblisting')
+
+
+class SelectorProfile:
+    """Per-site record of which selector matched each field"""
+
+    def __init__(self, site, path=None):
+        self.site = site
+        self.path = path
+        self.hits = {field: {} for field in FIELD_SELECTORS}
+        if path and os.path.exists(path):
+            self.load()
+
+    @classmethod
+    def for_site(cls, site):
+        """The site's profile in DEFAULT_PROFILE_DIR (SCRAPER_PROFILE_DIR)"""
+        return cls(site, os.path.join(DEFAULT_PROFILE_DIR, f"selectors_{site}.json"))
+
+    def selectors(self, field):
+        """Candidate selectors for `field`, most successful first"""
+        hits = self.hits[field]
+        defaults = FIELD_SELECTORS[field]
+        return sorted(defaults, key=lambda selector: (-hits.get(selector, 0), defaults.index(selector)))
+
+    def record(self, field, selector, count=1):
+        self.hits[field][selector] = self.hits[field].get(selector, 0) + count
+
+    def merge(self, winners):
+        """Record a {field: selector} mapping returned by parse_job_html"""
+        for field, selector in winners.items():
+            self.record(field, selector)
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for field, hits in data.get('hits', {}).items():
+                if field in self.hits:
+                    self.hits[field].update(hits)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load selector profile: {str(e)}")
+
+    def save(self):
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            # Write then rename, so concurrent scrapes never leave a torn file
+            temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'site': self.site, 'hits': self.hits}, f, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save selector profile: {str(e)}")
+
+
+def _first_text(soup, selectors):
+    """Return (text, selector) for the first selector with non-empty text"""
+    for selector in selectors:
+        element = soup.select_one(selector)
+        if element is not None:
+            text = element.get_text(" ", strip=True)
+            if text:
+                return text, selector
+    return None, None
+
+
+def _normalize_job_type(text):
+    type_text = text.lower()
+    if 'part' in type_text:
+        return "Part-time"
+    if 'contract' in type_text:
+        return "Contract"
+    if 'intern' in type_text:
+        return "Internship"
+    return "Full-time"
+
+
+def parse_job_html(html, selector_order=None):
+    """
+    Extract job fields from a listing's outerHTML.
+
+    `selector_order` maps field -> selectors to try (see
+    SelectorProfile.selectors); defaults to FIELD_SELECTORS. Returns
+    (job_fields, winners) where winners maps field -> the selector that
+    matched, for feeding back into a SelectorProfile.
+    """
+    selector_order = selector_order or FIELD_SELECTORS
+    soup = BeautifulSoup(html, HTML_PARSER)
+    winners = {}
+
+    def extract(field, default):
+        text, selector = _first_text(soup, selector_order[field])
+        if selector is None:
+            return default
+        winners[field] = selector
+        return text
+
+    title = extract('title', "Unknown Title")
+    company = extract('company', "Unknown Company")
+    location = extract('location', "Remote")
+
+    # Keep the scrape time (UTC, with its offset) as posting date for now;
+    # the listing's date text could be parsed later
+    extract('posting_date', None)
+    posting_date = datetime.now(timezone.utc).isoformat()
+
+    job_type = _normalize_job_type(extract('job_type', "Full-time"))
+
+    # Link to the listing's detail page, if any
+    link = soup.select_one("a[href]")
+    url = link['href'] if link is not None else None
+
+    # Extract tags/skills
+    tags = []
+    for selector in TAG_SELECTORS:
+        for tag_element in soup.select(selector):
+            tag_text = tag_element.get_text(" ", strip=True)
+            if tag_text and len(tag_text) < 50:  # Reasonable tag length
+                tags.append(tag_text)
+
+    # Default tags for actuarial jobs
+    if not tags:
+        tags = list(DEFAULT_TAGS)
+    else:
+        tags = list(set(tags[:5]))  # Limit to 5 unique tags
+
+    job_fields = {
+        "title": title,
+        "company": company,
+        "location": location,
+        "job_type": job_type,
+        "tags": tags,
+        "posting_date": posting_date,
+        "url": url,
+        "description": f"Actuarial position at {company} in {location}. This job was scraped from ActuaryList.com."
+    }
+    return job_fields, winners
+
+
+def timed_parse(html, selector_order=None):
+    """
+    parse_job_html plus the elapsed parse time in milliseconds. A listing
+    that fails to parse yields job_fields=None instead of raising, so one
+    bad fragment doesn't abort a batch.
+    """
+    started = time.perf_counter()
+    try:
+        job_fields, winners = parse_job_html(html, selector_order)
+    except Exception as e:
+        logger.warning(f"Error extracting job data: {str(e)}")
+        job_fields, winners = None, {}
+    return job_fields, winners, (time.perf_counter() - started) * 1000
+
+
+# Below this many listings a process pool costs more than it saves
+PARALLEL_THRESHOLD = 20
+
+LISTING_CLASS = "job-listing"
+
+
+def split_listings(page_source, listing_class=LISTING_CLASS):
+    """Split a full page into the outerHTML of each job listing"""
+    soup = BeautifulSoup(page_source, HTML_PARSER)
+    fragments = []
+    for element in soup.select(f".{listing_class}"):
+        # Skip listings nested inside another listing; the outer one
+        # already contains them
+        if element.find_parent(class_=listing_class) is None:
+            fragments.append(str(element))
+    return fragments
+
+
+NEXT_PAGE_SELECTORS = [
+    "link[rel='next']", "a[rel='next']", ".pagination a.next",
+    "a.next", "a[aria-label='Next']"
+]
+
+
+def next_page_url(page_source, base_url):
+    """Absolute URL of the next results page, or None on the last page"""
+    soup = BeautifulSoup(page_source, HTML_PARSER)
+    for selector in NEXT_PAGE_SELECTORS:
+        element = soup.select_one(selector)
+        if element is not None and element.get('href'):
+            return urljoin(base_url, element['href'])
+    return None
+
+
+# Links to further results pages of the same listing: pagination and
+# category / filter pages
+PAGE_LINK_SELECTORS = NEXT_PAGE_SELECTORS + [
+    ".pagination a", "a.page-link", "nav[aria-label='pagination'] a",
+    ".categories a", "a.category"
+]
+
+
+def page_links(page_source, base_url, selectors=PAGE_LINK_SELECTORS):
+    """Absolute URLs of every pagination and category link, in page order"""
+    soup = BeautifulSoup(page_source, HTML_PARSER)
+    urls = []
+    for element in soup.select(', '.join(selectors)):
+        if element.get('href'):
+            url = urljoin(base_url, element['href']).split('#')[0]
+            if url not in urls:
+                urls.append(url)
+    return urls
+
+
+def _learn(selector_profile, selector_order, winners):
+    """Merge `winners` and re-rank the fields whose winner wasn't tried first"""
+    selector_profile.merge(winners)
+    for field, selector in winners.items():
+        if selector_order[field][0] != selector:
+            selector_order[field] = selector_profile.selectors(field)
+
+
+def create_parse_pool(max_workers=None):
+    """
+    A process pool for parse_listings, to be kept for as long as its owner
+    (scraper service, crawler, scrape script) lives rather than started per
+    batch. Returns None with a single worker: parse in-process then.
+
+    Workers are started with forkserver (spawn where that's unavailable),
+    never fork: the callers run threads (Flask, the scrape task queue, the
+    crawler's fetchers) and forking a multi-threaded process can deadlock
+    the child.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    if workers <= 1:
+        return None
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+
+
+def parse_listings(fragments, selector_profile=None, executor=None):
+    """
+    Parse listing fragments, yielding (job_fields, elapsed_ms) in order;
+    job_fields is None for a fragment that could not be parsed.
+
+    Large batches are parsed in `executor` (see create_parse_pool), when
+    given, so CPU-bound HTML parsing runs in parallel and off the browser's
+    critical path. Winning
+    selectors are merged into `selector_profile` as results arrive; parsed
+    in this process, every listing tries the order learned so far, and a
+    pooled batch uses the order learned up to its first listing.
+    """
+    selector_order = None
+    if selector_profile is not None:
+        selector_order = {field: selector_profile.selectors(field) for field in FIELD_SELECTORS}
+
+    if executor is None or len(fragments) < PARALLEL_THRESHOLD:
+        for fragment in fragments:
+            job_fields, winners, elapsed_ms = timed_parse(fragment, selector_order)
+            if selector_profile is not None:
+                _learn(selector_profile, selector_order, winners)
+            yield job_fields, elapsed_ms
+        return
+
+    # The workers get a snapshot of the order, so learn from the first
+    # listing here before handing out the rest
+    job_fields, winners, elapsed_ms = timed_parse(fragments[0], selector_order)
+    if selector_profile is not None:
+        _learn(selector_profile, selector_order, winners)
+    yield job_fields, elapsed_ms
+    fragments = fragments[1:]
+
+    chunksize = max(1, len(fragments) // ((os.cpu_count() or 1) * 4))
+    results = executor.map(timed_parse, fragments, repeat(selector_order), chunksize=chunksize)
+    for job_fields, winners, elapsed_ms in results:
+        if selector_profile is not None:
+            selector_profile.merge(winners)
+        yield job_fields, elapsed_ms
@@ -0,0 +1,21 @@
+"""
+Listing identity shared by the scraper and the backend
+
+Kept free of third-party imports so the backend (bulk imports) can use it
+without the scraper's dependencies.
+"""
+
+import hashlib
+
+# The fields a fingerprint is computed from
+IDENTITY_FIELDS = ('url', 'title', 'company', 'location')
+
+
+def fingerprint(job_fields):
+    """
+    Stable identity for a listing across scrapes and imports: a hash of its
+    URL, title, company and location (case- and whitespace-insensitive)
+    """
+    parts = [job_fields.get(field) or '' for field in IDENTITY_FIELDS]
+    key = '\x1f'.join(' '.join(part.split()).lower() for part in parts)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
@@ -1,37 +1,105 @@
 #!/usr/bin/env python3
 """
-Simple script to run the Actuary List scraper and return JSON output
+Simple script to run the Actuary List scraper and stream its output
+
+Output is NDJSON on stdout, one record per line, written as soon as each
+job is extracted:
+
+    {"type": "job", "job": {...}}
+    {"type": "summary", "success": true, "count": 12, "phase_seconds": {...}}
+
+The summary record is always last; on failure it carries "error".
+
+With --incremental, listings seen by earlier runs are skipped. The backend
+adds --known FILE, a JSON list of the fingerprints it already stores, which
+then decides what is known instead of the scraper's own seen store.
+phase_seconds lists the duration of every driver startup, page load,
+load-more, HTTP fetch and listing extraction, for the backend's metrics.
+Progress and log messages go to stderr.
+
+With SCRAPER_CRAWL_SOURCES set (e.g. "actuarylist"), the listed boards
+are crawled concurrently over HTTP instead (see crawler.py); the summary
+then also reports the number of pages crawled.
 """
 
 import json
+import os
 import sys
-from actuarylist_scraper import ActuaryListScraper
+from actuarylist_scraper import ActuaryListScraper, configure_logging
+from crawler import Crawler, settings_from_env
+from fetchers import HttpFetcher
+from job_parser import create_parse_pool
+from seen_store import SeenStore
 
-def run_scraper(max_jobs=20):
-    """Run the scraper and return jobs as JSON"""
+def emit(record):
+    """Write one NDJSON record to stdout and flush it immediately"""
+    sys.stdout.write(json.dumps(record) + "\n")
+    sys.stdout.flush()
+
+def load_known(path):
+    """The fingerprints listed in the --known JSON file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return SeenStore.of(json.load(f))
+
+def run_scraper(max_jobs=20, incremental=False, on_job=None, known_path=None):
+    """Run the scraper, passing each job to `on_job`; returns a summary"""
     try:
-        scraper = ActuaryListScraper(headless=True, max_jobs=max_jobs)
-        jobs = scraper.scrape_jobs()
+        seen_store = load_known(known_path) if known_path else None
+        crawl = settings_from_env()
+        if crawl is not None:
+            crawler = Crawler(max_jobs=max_jobs, http_cache_dir=os.getenv('SCRAPER_HTTP_CACHE_DIR'),
+                              on_job=on_job, incremental=incremental, seen_store=seen_store, **crawl)
+            try:
+                jobs = crawler.crawl()
+            finally:
+                crawler.close()
+            return {
+                "success": True,
+                "count": len(jobs),
+                "pages": crawler.pages,
+                "phase_seconds": crawler.phase_seconds
+            }
+
+        # SCRAPER_FETCH_MODE: auto (HTTP first, Selenium fallback), http or selenium
+        fetch_mode = os.getenv('SCRAPER_FETCH_MODE', 'auto')
+        fetcher = HttpFetcher(cache_dir=os.getenv('SCRAPER_HTTP_CACHE_DIR'))
+        parse_pool = create_parse_pool()
+        scraper = ActuaryListScraper(headless=True, max_jobs=max_jobs, fetch_mode=fetch_mode, fetcher=fetcher,
+                                     parse_pool=parse_pool, incremental=incremental, seen_store=seen_store,
+                                     on_job=on_job)
+        try:
+            jobs = scraper.scrape_jobs()
+        finally:
+            fetcher.close()
+            if parse_pool is not None:
+                parse_pool.shutdown()
         return {
             "success": True,
-            "jobs": jobs,
-            "count": len(jobs)
+            "count": len(jobs),
+            "phase_seconds": scraper.phase_seconds
         }
     except Exception as e:
         return {
             "success": False,
             "error": str(e),
-            "jobs": [],
             "count": 0
         }
 
 if __name__ == "__main__":
+    configure_logging()
     max_jobs = 20
     if len(sys.argv) > 1:
         try:
             max_jobs = int(sys.argv[1])
         except ValueError:
             pass
-    
-    result = run_scraper(max_jobs)
-    print(json.dumps(result))
+    # --incremental: only return listings not seen by earlier scrapes
+    incremental = '--incremental' in sys.argv[2:]
+    # --known FILE: the backend's fingerprints, which count as seen
+    known_path = None
+    if '--known' in sys.argv[2:-1]:
+        known_path = sys.argv[sys.argv.index('--known') + 1]
+
+    summary = run_scraper(max_jobs, incremental, on_job=lambda job: emit({"type": "job", "job": job}),
+                          known_path=known_path)
+    emit({"type": "summary", **summary})
@@ -0,0 +1,114 @@
+"""
+Long-lived scraper service
+
+Keeps the expensive parts of a scrape alive between runs: a pool of warm
+headless Chrome drivers and the process pool listings are parsed in. The
+backend uses it in-process (SCRAPER_BACKEND=service) instead of starting a
+new Python process, importing Selenium and launching Chrome for every
+scrape.
+
+Scrapes can run concurrently, so each one gets its own HTTP session (the
+on-disk validator cache is still shared). With SCRAPER_CRAWL_SOURCES set,
+scrapes use the concurrent crawler (crawler.py) instead.
+"""
+
+import logging
+import threading
+import time
+from actuarylist_scraper import ActuaryListScraper, create_driver
+from crawler import Crawler, settings_from_env
+from job_parser import create_parse_pool
+from driver_pool import DriverPool
+from fetchers import HttpFetcher
+from seen_store import SeenStore
+
+logger = logging.getLogger(__name__)
+
+
+class ScraperService:
+    def __init__(self, pool_size=1, max_pages_per_driver=50, max_rss_mb=None,
+                 headless=True, fetch_mode="auto", http_cache_dir=None):
+        self.fetch_mode = fetch_mode
+        self.http_cache_dir = http_cache_dir
+        self.crawl = settings_from_env()
+        # Shared by every scrape and crawl; None on a single CPU
+        self.parse_pool = create_parse_pool(self.crawl['parse_workers'] if self.crawl else None)
+        self.driver_pool = DriverPool(
+            lambda: create_driver(headless),
+            size=pool_size,
+            max_pages=max_pages_per_driver,
+            max_rss_mb=max_rss_mb
+        )
+
+    def warm(self, background=True):
+        """Pre-start the browser pool so the first scrape doesn't pay for it"""
+        if not background:
+            self.driver_pool.warm()
+            return
+        thread = threading.Thread(target=self._warm_quietly, name="scraper-warmup", daemon=True)
+        thread.start()
+
+    def _warm_quietly(self):
+        try:
+            self.driver_pool.warm()
+        except Exception as e:
+            logger.warning(f"Could not warm WebDriver pool: {str(e)}")
+
+    def scrape(self, max_jobs=20, on_job=None, incremental=False, timeout=None, known=None):
+        """
+        Run one scrape; returns the same result shape as run_scraper. With
+        `timeout`, the scrape gives up after that many seconds. `known`
+        (fingerprints) replaces the on-disk seen store for incremental scrapes.
+        """
+        fetcher = None
+        seen_store = SeenStore.of(known) if known is not None else None
+        try:
+            if self.crawl is not None:
+                # The crawler opens (and closes) a session of its own
+                crawler = Crawler(max_jobs=max_jobs, http_cache_dir=self.http_cache_dir,
+                                  parse_pool=self.parse_pool, on_job=on_job, incremental=incremental,
+                                  seen_store=seen_store, **self.crawl)
+                jobs = crawler.crawl(timeout)
+                return {
+                    "success": True,
+                    "jobs": jobs,
+                    "count": len(jobs),
+                    "pages": crawler.pages,
+                    "phase_seconds": crawler.phase_seconds
+                }
+
+            fetcher = HttpFetcher(cache_dir=self.http_cache_dir)
+            scraper = ActuaryListScraper(
+                headless=True,
+                max_jobs=max_jobs,
+                fetch_mode=self.fetch_mode,
+                fetcher=fetcher,
+                driver_pool=self.driver_pool,
+                parse_pool=self.parse_pool,
+                on_job=on_job,
+                incremental=incremental,
+                seen_store=seen_store,
+                deadline=time.monotonic() + timeout if timeout else None
+            )
+            jobs = scraper.scrape_jobs()
+            return {
+                "success": True,
+                "jobs": jobs,
+                "count": len(jobs),
+                "phase_seconds": scraper.phase_seconds
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "jobs": [],
+                "count": 0
+            }
+        finally:
+            if fetcher is not None:
+                fetcher.close()
+
+    def close(self):
+        self.driver_pool.close()
+        if self.parse_pool is not None:
+            self.parse_pool.shutdown()
@@ -0,0 +1,71 @@
+"""
+Persisted set of listing fingerprints the scraper has already seen
+
+Incremental scrapes skip listings whose fingerprint is in the store and
+stop paginating once they reach known listings, so a steady-state scrape
+only processes new or changed postings.
+
+Run standalone, the scraper keeps its store in ~/.cache. The backend
+instead passes the fingerprints its catalog holds (SeenStore.of), so a
+listing only counts as known while the backend still has it: after a
+database reset, or with the in-memory engine, everything is new again.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEEN_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'joblisting')
+
+
+class SeenStore:
+    def __init__(self, path=None, max_entries=100000):
+        self.path = path
+        self.max_entries = max_entries
+        self._seen = {}  # fingerprint -> last seen (ISO timestamp, UTC)
+        if path and os.path.exists(path):
+            self.load()
+
+    @classmethod
+    def for_site(cls, site):
+        return cls(os.path.join(DEFAULT_SEEN_DIR, f"seen_{site}.json"))
+
+    @classmethod
+    def of(cls, fingerprints):
+        """An unsaved store holding just `fingerprints` (e.g. the backend's jobs)"""
+        store = cls()
+        store._seen = dict.fromkeys(fingerprints, '')
+        return store
+
+    def __contains__(self, fingerprint):
+        return fingerprint in self._seen
+
+    def __len__(self):
+        return len(self._seen)
+
+    def add(self, fingerprint):
+        self._seen.pop(fingerprint, None)
+        self._seen[fingerprint] = datetime.now(timezone.utc).isoformat()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._seen = json.load(f).get('fingerprints', {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load seen listings: {str(e)}")
+
+    def save(self):
+        if not self.path:
+            return
+        # Keep the most recently seen fingerprints (dict order is insertion order)
+        if len(self._seen) > self.max_entries:
+            self._seen = dict(list(self._seen.items())[-self.max_entries:])
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump({'fingerprints': self._seen}, f)
+        except OSError as e:
+            logger.warning(f"Could not save seen listings: {str(e)}")
@@ -0,0 +1,81 @@
+"""
+Job boards the crawler can scrape
+
+A Source knows where a board's listings start, how to cut a results page
+into jobs and which links lead to more results pages (pagination and
+category pages). Adding a board means subclassing Source and registering
+it in SOURCES; the crawler handles fetching, concurrency and retries.
+"""
+
+from urllib.parse import urlsplit
+from job_parser import FIELD_SELECTORS, SelectorProfile, page_links, split_listings, timed_parse
+
+
+class Source:
+    """Base class for a job board; subclasses set name and start_urls"""
+
+    name = None
+    start_urls = ()
+
+    def __init__(self, start_urls=None, selector_profile_path=None):
+        if start_urls:
+            self.start_urls = tuple(start_urls)
+        # Learned selector order, kept between crawls (SCRAPER_PROFILE_DIR)
+        if selector_profile_path:
+            self.selector_profile = SelectorProfile(self.name, selector_profile_path)
+        else:
+            self.selector_profile = SelectorProfile.for_site(self.name)
+
+    def selector_order(self):
+        """Snapshot of the learned selector order, passed to listings()"""
+        return {field: self.selector_profile.selectors(field) for field in FIELD_SELECTORS}
+
+    # listings() and links() may run in a worker process, so they must not
+    # depend on state changed during the crawl
+    def listings(self, page_source, url, selector_order=None):
+        """
+        (job_fields, winners, elapsed_ms) for each listing on a results page,
+        as job_parser.timed_parse returns them
+        """
+        raise NotImplementedError
+
+    def links(self, page_source, url):
+        """URLs of further results pages linked from this one"""
+        return []
+
+    def build_job(self, job_fields, job_fingerprint):
+        """The job record for parsed listing fields"""
+        job_data = {"id": f"scraped_{job_fingerprint}", "fingerprint": job_fingerprint}
+        job_data.update(job_fields)
+        return job_data
+
+    def finish(self):
+        """Persist what was learned during a crawl"""
+        self.selector_profile.save()
+
+
+class ActuaryListSource(Source):
+    name = "actuarylist.com"
+    start_urls = ("https://www.actuarylist.com/jobs",)
+
+    def listings(self, page_source, url, selector_order=None):
+        return [timed_parse(fragment, selector_order) for fragment in split_listings(page_source)]
+
+    def links(self, page_source, url):
+        # Stay on the board's own results pages, not job detail pages or
+        # the rest of the site
+        host = urlsplit(url).netloc
+        return [link for link in page_links(page_source, url)
+                if urlsplit(link).netloc == host and urlsplit(link).path.startswith("/jobs")]
+
+
+SOURCES = {
+    "actuarylist": ActuaryListSource,
+}
+
+
+def get_source(name, **kwargs):
+    try:
+        return SOURCES[name](**kwargs)
+    except KeyError:
+        raise ValueError(f"Unknown source {name!r}; expected one of {', '.join(SOURCES)}")
@@ -0,0 +1,93 @@
+import os
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+BACKEND_DIR = os.path.join(ROOT, 'backend')
+SCRAPER_DIR = os.path.join(ROOT, 'scraper')
+
+for directory in (SCRAPER_DIR, BACKEND_DIR):
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+
+
+@pytest.fixture
+def make_app(tmp_path, monkeypatch):
+    """
+    create_app() for a JOB_ENGINE on a fresh SQLite database in tmp_path.
+    The memory engine starts from the sample jobs; module-level caches are
+    replaced so nothing carries over between tests.
+    """
+    import app as app_module
+    import models
+    from job_store import JobStore
+
+    monkeypatch.setattr(models, 'json_cache', models.JSONCache())
+    monkeypatch.setattr(app_module, 'json_cache', models.json_cache)
+
+    def make(engine='sql', database='jobs.db', **config):
+        monkeypatch.setenv('JOB_ENGINE', engine)
+        monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / database}")
+        monkeypatch.setenv('SCRAPER_WARM', 'false')
+        for key, value in config.items():
+            monkeypatch.setenv(key, str(value))
+        monkeypatch.setattr(app_module, 'jobs_storage', JobStore(app_module.initial_jobs))
+        return app_module.create_app()
+
+    return make
+
+
+# JOB_ENGINE and extra settings for each way of storing jobs
+ENGINES = {
+    'sql': ('sql', {}),
+    'memory': ('memory', {}),
+    'shared': ('memory', {'JOB_STORE_BACKEND': 'shared'}),
+}
+
+
+@pytest.fixture(params=list(ENGINES))
+def client(request, make_app):
+    """A test client for each job engine (and the shared in-memory store)"""
+    engine, config = ENGINES[request.param]
+    return make_app(engine, **config).test_client()
+
+
+class SavedPageFetcher:
+    """Serves the saved ActuaryList results page for every URL, after `delay` seconds"""
+
+    path = os.path.join(SCRAPER_DIR, 'fixtures', 'actuarylist_jobs.html')
+    delay = 0
+    instances = []
+
+    def __init__(self, **kwargs):
+        self.closed = False
+        SavedPageFetcher.instances.append(self)
+
+    def fetch(self, url):
+        time.sleep(self.delay)
+        with open(self.path, encoding='utf-8') as f:
+            return f.read()
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def saved_page_fetcher(tmp_path, monkeypatch):
+    """
+    Make ScraperService scrape the saved results page over "HTTP", with
+    the learned selectors and seen listings kept in tmp_path
+    """
+    import job_parser
+    import scraper_service
+    import seen_store
+
+    monkeypatch.setenv('SCRAPER_FETCH_MODE', 'http')
+    monkeypatch.delenv('SCRAPER_CRAWL_SOURCES', raising=False)
+    monkeypatch.setattr(job_parser, 'DEFAULT_PROFILE_DIR', str(tmp_path / 'profiles'))
+    monkeypatch.setattr(seen_store, 'DEFAULT_SEEN_DIR', str(tmp_path / 'seen'))
+    monkeypatch.setattr(scraper_service, 'HttpFetcher', SavedPageFetcher)
+    monkeypatch.setattr(SavedPageFetcher, 'instances', [])
+    return SavedPageFetcher
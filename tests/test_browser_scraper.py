@@ -0,0 +1,322 @@
+"""
+ActuaryListScraper's Selenium path: create_driver's browser profiles and
+the load-more loop against scripted fakes, and both against a local page
+in a real Chrome when one is available (CHROMEDRIVER_PATH or chromedriver
+on PATH).
+"""
+
+import os
+import shutil
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+import actuarylist_scraper
+import driver_pool
+from actuarylist_scraper import (
+    BLOCKED_URL_PATTERNS, WATCH_SCRIPT, WATCH_STATE_SCRIPT, ActuaryListScraper, create_driver,
+)
+from job_parser import split_listings
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scraper', 'fixtures',
+                       'actuarylist_jobs.html')
+
+
+class FakeChrome:
+    """Stands in for webdriver.Chrome, recording how create_driver set it up"""
+
+    def __init__(self, service=None, options=None):
+        self.service = service
+        self.options = options
+        self.cdp_commands = []
+        self.implicit_wait = None
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp_commands.append((command, params))
+
+    def implicitly_wait(self, seconds):
+        self.implicit_wait = seconds
+
+
+@pytest.fixture
+def fake_chrome(monkeypatch):
+    monkeypatch.setattr(actuarylist_scraper.webdriver, 'Chrome', FakeChrome)
+    monkeypatch.setattr(actuarylist_scraper, 'resolve_driver_path', lambda: '/usr/bin/chromedriver')
+    monkeypatch.delenv('SCRAPER_BROWSER_PROFILE', raising=False)
+
+
+def test_lean_profile_blocks_what_the_scraper_does_not_read(fake_chrome):
+    driver = create_driver()
+    arguments = driver.options.arguments
+    assert '--headless' in arguments
+    assert {'--disable-extensions', '--blink-settings=imagesEnabled=false', '--window-size=1280,800'} <= set(arguments)
+    assert driver.options.experimental_options['prefs']['profile.managed_default_content_settings.images'] == 2
+    assert driver.options.page_load_strategy == 'eager'
+    assert driver.cdp_commands == [('Network.enable', {}),
+                                   ('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})]
+    assert driver.implicit_wait == 0
+
+
+def test_full_profile_loads_everything(fake_chrome, monkeypatch):
+    monkeypatch.setenv('SCRAPER_BROWSER_PROFILE', 'full')
+    driver = create_driver(headless=False)
+    arguments = driver.options.arguments
+    assert '--headless' not in arguments and '--window-size=1920,1080' in arguments
+    assert '--disable-extensions' not in arguments
+    assert driver.options.page_load_strategy == 'normal'
+    assert driver.cdp_commands == []
+
+
+def test_unknown_profile_is_rejected(fake_chrome):
+    with pytest.raises(ValueError, match='Unknown browser profile'):
+        create_driver(profile='tiny')
+
+
+class FakeButton:
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+
+class FakePage:
+    """
+    A driver showing `batch` listings at first. Each click (or scroll,
+    without a button) has a request in flight for `delay` seconds, then
+    adds `batch` more listings, up to `total`.
+    """
+
+    def __init__(self, total, batch=10, button=True, delay=0.0):
+        self.total = total
+        self.batch = batch
+        self.button = button
+        self.delay = delay
+        self.shown = min(batch, total)
+        self.actions = []
+        self.requested_at = None
+        self.last_activity = time.monotonic()
+        self.quit_called = False
+
+    def _settle(self):
+        now = time.monotonic()
+        if self.requested_at is not None and now - self.requested_at >= self.delay:
+            self.requested_at = None
+            if self.shown < self.total:
+                self.shown = min(self.total, self.shown + self.batch)
+                self.last_activity = now
+
+    def execute_script(self, script, *args):
+        if script == WATCH_SCRIPT:
+            return None
+        self._settle()
+        if script == WATCH_STATE_SCRIPT:
+            inflight = int(self.requested_at is not None)
+            return [self.shown, inflight, (time.monotonic() - self.last_activity) * 1000]
+        # The click or scroll script
+        self.actions.append('click' if args else 'scroll')
+        self.requested_at = self.last_activity = time.monotonic()
+        return None
+
+    def find_elements(self, by, value):
+        return [FakeButton()] if self.button and self.shown < self.total else []
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    # Short settle / idle windows keep the rounds fast
+    monkeypatch.setattr(actuarylist_scraper, 'SETTLE_MS', 20)
+    monkeypatch.setattr(actuarylist_scraper, 'IDLE_MS', 150)
+
+    def make(**kwargs):
+        return ActuaryListScraper(selector_profile_path=str(tmp_path / 'selectors.json'), **kwargs)
+
+    return make
+
+
+def load_more(scraper, page):
+    scraper.driver = page
+    scraper._load_more_jobs()
+    return page
+
+
+def test_clicks_load_more_until_max_jobs(scraper):
+    page = load_more(scraper(max_jobs=35), FakePage(total=100, delay=0.05))
+    assert page.shown == 40
+    assert page.actions == ['click'] * 3
+
+
+def test_scrolls_an_infinite_feed_until_no_progress(scraper):
+    page = load_more(scraper(max_jobs=100), FakePage(total=30, button=False))
+    assert page.shown == 30
+    # Two rounds bring listings, the third doesn't
+    assert page.actions == ['scroll'] * 3
+
+
+def test_waits_for_requests_in_flight(scraper):
+    # Slower than IDLE_MS, but the pending request keeps the round open
+    page = load_more(scraper(max_jobs=20), FakePage(total=100, delay=0.3))
+    assert page.shown == 20
+
+
+def test_load_more_stops_at_the_deadline(scraper):
+    with pytest.raises(TimeoutError):
+        load_more(scraper(max_jobs=50, deadline=time.monotonic() - 1), FakePage(total=100))
+
+
+@pytest.fixture
+def browser_scraper(scraper, monkeypatch):
+    """Selenium-mode scraper whose 'browser' loads the saved results page"""
+    page = FakePage(total=40)
+
+    def setup_driver(self):
+        self.driver = page
+
+    def load_listing_page(self):
+        with open(FIXTURE, encoding='utf-8') as f:
+            return f.read()
+
+    monkeypatch.setattr(ActuaryListScraper, 'setup_driver', setup_driver)
+    monkeypatch.setattr(ActuaryListScraper, '_load_listing_page', load_listing_page)
+    return page, lambda **kwargs: scraper(fetch_mode='selenium', **kwargs)
+
+
+def test_browser_scrape_passes_jobs_to_on_job(browser_scraper):
+    page, make = browser_scraper
+    received = []
+    jobs = make(max_jobs=5, on_job=received.append).scrape_jobs()
+    assert len(jobs) == 5 and received == jobs
+    assert page.quit_called
+
+
+def test_browser_scrape_propagates_on_job_errors(browser_scraper):
+    page, make = browser_scraper
+
+    def on_job(job):
+        raise RuntimeError('store failed')
+
+    with pytest.raises(RuntimeError, match='store failed'):
+        make(max_jobs=5, on_job=on_job).scrape_jobs()
+    assert page.quit_called
+
+
+def test_browser_errors_give_no_jobs(browser_scraper, monkeypatch):
+    page, make = browser_scraper
+
+    def load_listing_page(self):
+        raise RuntimeError('page crashed')
+
+    monkeypatch.setattr(ActuaryListScraper, '_load_listing_page', load_listing_page)
+    assert make(max_jobs=5).scrape_jobs() == []
+    assert page.quit_called
+
+
+# ------ Real Chrome, against a local page ------
+LOAD_MORE_PAGE = """<!doctype html>
+<html><body>
+<main id="jobs"></main>
+<button id="more">Load More</button>
+<img src="/pixel.png" id="pixel">
+<script>
+const total = %(total)d, main = document.getElementById('jobs'), more = document.getElementById('more');
+let shown = 0;
+function add(n) {
+  for (let i = 0; i < n && shown < total; i++, shown++) {
+    const job = document.createElement('div');
+    job.className = 'job-listing';
+    job.innerHTML = '<a href="/job/' + shown + '"><h3>Actuary ' + shown + '</h3></a>'
+      + '<div class="company-name">Company ' + shown + '</div><div class="location">Remote</div>';
+    main.appendChild(job);
+  }
+  if (shown >= total) more.remove();
+}
+add(10);
+more.onclick = () => fetch('/slow').then(() => add(10));
+</script>
+</body></html>
+"""
+
+
+# 1x1 transparent PNG
+PIXEL = bytes.fromhex(
+    '89504e470d0a1a0a0000000d49484452000000010000000108060000001f15c489'
+    '0000000d49444154789c6300010000000500010d0a2db40000000049454e44ae426082'
+)
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == '/slow':
+            time.sleep(0.2)
+            body, content_type = b'ok', 'text/plain'
+        elif url.path == '/pixel.png':
+            body, content_type = PIXEL, 'image/png'
+        else:
+            total = int(parse_qs(url.query).get('total', ['45'])[0])
+            body, content_type = (LOAD_MORE_PAGE % {'total': total}).encode('utf-8'), 'text/html'
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def local_site():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PageHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def chrome(monkeypatch):
+    """create_driver(), skipping unless a chromedriver is installed (never downloaded)"""
+    path = os.getenv('CHROMEDRIVER_PATH') or shutil.which('chromedriver')
+    if not path:
+        pytest.skip('chromedriver not available')
+    monkeypatch.setenv('CHROMEDRIVER_PATH', path)
+    monkeypatch.setattr(driver_pool, '_driver_path', None)
+    drivers = []
+
+    def start(**kwargs):
+        drivers.append(create_driver(**kwargs))
+        return drivers[-1]
+
+    yield start
+    for driver in drivers:
+        driver.quit()
+
+
+@pytest.mark.parametrize('max_jobs, expected', [(25, 30), (100, 45)])
+def test_chrome_loads_more_listings(chrome, local_site, scraper, max_jobs, expected):
+    driver = chrome()
+    driver.get(f'{local_site}/?total=45')
+    scrape = scraper(max_jobs=max_jobs)
+    scrape.driver = driver
+    scrape._load_more_jobs()
+    assert len(split_listings(driver.page_source)) == expected
+
+
+@pytest.mark.parametrize('profile, image_loaded', [('lean', False), ('full', True)])
+def test_chrome_profile_image_loading(chrome, local_site, profile, image_loaded):
+    driver = chrome(profile=profile)
+    driver.get(f'{local_site}/?total=10')
+    loaded = driver.execute_script(
+        "const img = document.getElementById('pixel');"
+        " return new Promise(done => img.complete ? done(img.naturalWidth > 0)"
+        " : img.addEventListener('loadend', () => done(img.naturalWidth > 0)))"
+    )
+    assert loaded == image_loaded
@@ -0,0 +1,211 @@
+"""
+Crawler behaviour against a local job board: retries, per-host limits,
+the page cap, link deduplication and the timeout.
+"""
+
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from crawler import Crawler
+from sources import ActuaryListSource
+
+
+class Board(ThreadingHTTPServer):
+    """
+    Results pages /jobs?page=1..pages, each with `listings` jobs and links
+    to the next `fanout` pages and back to the first. failures[page] lists
+    statuses answered, in order, before the page is served.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, pages=3, listings=2, fanout=2, latency=0):
+        super().__init__(('127.0.0.1', 0), BoardHandler)
+        self.pages = pages
+        self.listings = listings
+        self.fanout = fanout
+        self.latency = latency
+        self.failures = {}
+        self.requests = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def url(self, page):
+        return f'http://127.0.0.1:{self.server_port}/jobs?page={page}'
+
+    def render(self, page):
+        jobs = ''.join(
+            f'<div class="job-listing"><a href="/job/{page}-{n}"><h3>Actuary {page}-{n}</h3></a>'
+            f'<div class="company-name">Company {n}</div><div class="location">Remote</div></div>'
+            for n in range(self.listings)
+        )
+        links = ''.join(f'<a class="page-link" href="/jobs?page={n}">{n}</a>'
+                        for n in [1] + list(range(page + 1, min(self.pages, page + self.fanout) + 1)))
+        return f'<html><body><main>{jobs}</main><nav class="pagination">{links}</nav></body></html>'
+
+
+class BoardHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        board = self.server
+        with board.lock:
+            board.requests[self.path] += 1
+            board.in_flight += 1
+            board.max_in_flight = max(board.max_in_flight, board.in_flight)
+        try:
+            time.sleep(board.latency)
+            url = urlsplit(self.path)
+            page = int(parse_qs(url.query).get('page', ['0'])[0])
+            with board.lock:
+                failures = board.failures.get(page)
+                status = failures.pop(0) if failures else None
+            if url.path != '/jobs' or not 1 <= page <= board.pages:
+                self.send_body(404, 'not found')
+            elif status is not None:
+                self.send_body(status, 'try again')
+            else:
+                self.send_body(200, board.render(page))
+        finally:
+            with board.lock:
+                board.in_flight -= 1
+
+    def send_body(self, status, body):
+        body = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def board():
+    boards = []
+
+    def start(**kwargs):
+        server = Board(**kwargs)
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        boards.append(server)
+        return server
+
+    yield start
+    for server in boards:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def crawl(tmp_path):
+    """Crawl `start_urls` in-process, keeping the learned selectors in tmp_path"""
+
+    def run(start_urls, timeout=None, **kwargs):
+        source = ActuaryListSource(start_urls=start_urls,
+                                   selector_profile_path=str(tmp_path / 'selectors.json'))
+        options = dict(max_jobs=1000, concurrency=4, per_host=4, retries=3, backoff=0.001, parse_workers=1)
+        options.update(kwargs)
+        crawler = Crawler([source], **options)
+        try:
+            jobs = crawler.crawl(timeout)
+        finally:
+            crawler.close()
+        return crawler, jobs
+
+    return run
+
+
+def test_crawls_every_page(board, crawl):
+    site = board(pages=4, listings=3)
+    crawler, jobs = crawl([site.url(1)])
+    assert crawler.pages == 4
+    assert crawler.failed_pages == 0
+    assert len(jobs) == 12
+    assert len({job['fingerprint'] for job in jobs}) == 12
+
+
+@pytest.mark.parametrize('status', [503, 429])
+def test_retries_transient_errors(board, crawl, status):
+    site = board(pages=3)
+    site.failures[2] = [status, status]
+    crawler, jobs = crawl([site.url(1)])
+    assert site.requests['/jobs?page=2'] == 3
+    assert crawler.pages == 3
+    assert crawler.failed_pages == 0
+    assert len(jobs) == 6
+
+
+def test_gives_up_after_retries(board, crawl):
+    site = board(pages=1)
+    site.failures[1] = [503] * 5
+    crawler, jobs = crawl([site.url(1)], retries=2)
+    assert site.requests['/jobs?page=1'] == 3
+    assert crawler.pages == 0
+    assert crawler.failed_pages == 1
+    assert jobs == []
+
+
+def test_does_not_retry_not_found(board, crawl):
+    site = board(pages=1)
+    crawler, jobs = crawl([site.url(1), site.url(99)])
+    assert site.requests['/jobs?page=99'] == 1
+    assert crawler.pages == 1
+    assert crawler.failed_pages == 1
+    assert len(jobs) == 2
+
+
+def test_per_host_limit(board, crawl):
+    # Page 1 links to every other page, so they are all queued at once
+    site = board(pages=12, fanout=12, latency=0.05)
+    crawler, _ = crawl([site.url(1)], concurrency=8, per_host=2)
+    assert crawler.pages == 12
+    assert site.max_in_flight == 2
+
+
+def test_max_pages(board, crawl):
+    site = board(pages=10, fanout=10)
+    crawler, jobs = crawl([site.url(1)], max_pages=4)
+    assert sum(site.requests.values()) == 4
+    assert crawler.pages == 4
+    assert len(jobs) == 8
+
+
+def test_each_page_fetched_once(board, crawl):
+    # Pages link to overlapping next pages and back to the first
+    site = board(pages=6, fanout=3)
+    crawler, _ = crawl([site.url(1), site.url(1)])
+    assert crawler.pages == 6
+    assert set(site.requests) == {f'/jobs?page={n}' for n in range(1, 7)}
+    assert set(site.requests.values()) == {1}
+
+
+def test_timeout_cancels_the_crawl(board, crawl):
+    site = board(pages=20, fanout=1, latency=0.2)
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        crawl([site.url(1)], timeout=0.5, concurrency=1)
+    assert time.monotonic() - started < 2
+    assert site.requests['/jobs?page=20'] == 0
+
+
+def test_on_job_errors_stop_the_crawl(board, crawl):
+    site = board(pages=10, fanout=1)
+    stored = []
+
+    def on_job(job):
+        if len(stored) == 3:
+            raise RuntimeError('store failed')
+        stored.append(job)
+
+    with pytest.raises(RuntimeError, match='store failed'):
+        crawl([site.url(1)], on_job=on_job, concurrency=2)
+    assert len(stored) == 3
+    assert site.requests['/jobs?page=10'] == 0
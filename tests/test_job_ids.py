@@ -0,0 +1,64 @@
+"""SQL engine: ids of deleted jobs are never reused (migration 0006)"""
+
+from sqlalchemy import create_engine, inspect, text
+
+import migrations
+import models
+
+JOB = {'title': 'Pricing Actuary', 'company': 'Acme Re', 'location': 'Zurich', 'job_type': 'Full-time'}
+
+
+def test_new_job_never_gets_a_deleted_jobs_cached_json(make_app, monkeypatch):
+    worker = make_app('sql').test_client()
+    other_worker = make_app('sql').test_client()
+    newest = worker.post('/jobs', json=JOB).get_json()
+    assert newest['id'] in worker.get('/jobs?limit=100').get_data(as_text=True)
+
+    # The other worker has its own JSON cache, so this one's isn't told
+    with monkeypatch.context() as patch:
+        patch.setattr(models, 'json_cache', models.JSONCache())
+        assert other_worker.delete(f"/jobs/{newest['id']}").status_code == 204
+        created = other_worker.post('/jobs', json=dict(JOB, title='Reserving Actuary')).get_json()
+
+    assert created['id'] != newest['id']
+    listed = worker.get('/jobs?limit=100').get_json()
+    assert [job['title'] for job in listed if job['id'] == created['id']] == ['Reserving Actuary']
+    assert newest['id'] not in {job['id'] for job in listed}
+
+
+def test_migration_rebuilds_jobs_with_autoincrement(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    revisions = {module.revision: module for module in migrations.load_revisions()}
+    with engine.begin() as conn:
+        # A jobs table as created before 0006, with a row and its tag link
+        revisions['0006']._jobs_table('jobs', autoincrement=False).create(conn)
+        conn.execute(text("CREATE INDEX ix_jobs_location ON jobs (location)"))
+        conn.execute(text("CREATE UNIQUE INDEX ix_jobs_fingerprint ON jobs (fingerprint)"))
+        conn.execute(text(
+            "INSERT INTO jobs (id, title, company, location, posting_date, job_type, fingerprint) "
+            "VALUES (7, 'Actuary', 'Acme', 'Zurich', '2024-01-01 00:00:00', 'Full-time', 'abc')"
+        ))
+        conn.execute(text("CREATE TABLE job_tags (job_id INTEGER, tag_id INTEGER)"))
+        conn.execute(text("INSERT INTO job_tags VALUES (7, 1)"))
+        migrations.current_revision(conn)
+        conn.execute(migrations.schema_version.insert().values(version_num='0005'))
+
+    assert migrations.upgrade(engine) == ['0006']
+
+    with engine.begin() as conn:
+        assert revisions['0006']._has_autoincrement(conn)
+        assert conn.execute(text("SELECT id, title, version FROM jobs")).all() == [(7, 'Actuary', 1)]
+        assert conn.execute(text("SELECT job_id FROM job_tags")).scalars().all() == [7]
+        assert {index['name'] for index in inspect(conn).get_indexes('jobs')} == {
+            'ix_jobs_location', 'ix_jobs_fingerprint'}
+        conn.execute(text("DELETE FROM jobs"))
+        conn.execute(text(
+            "INSERT INTO jobs (title, company, location, posting_date, job_type) "
+            "VALUES ('Analyst', 'Acme', 'Zurich', '2024-01-02 00:00:00', 'Full-time')"
+        ))
+        assert conn.execute(text("SELECT id FROM jobs")).scalar() == 8
+
+    migrations.downgrade(engine, '0005')
+    with engine.begin() as conn:
+        assert not revisions['0006']._has_autoincrement(conn)
+        assert conn.execute(text("SELECT id FROM jobs")).scalar() == 8
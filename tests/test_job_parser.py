@@ -0,0 +1,81 @@
+"""Offline parsing of the saved ActuaryList results page (scraper/fixtures)"""
+
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from job_parser import (
+    FIELD_SELECTORS, SelectorProfile, create_parse_pool, fingerprint, page_links, parse_job_html,
+    parse_listings, split_listings,
+)
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scraper', 'fixtures',
+                       'actuarylist_jobs.html')
+
+
+@pytest.fixture(scope='module')
+def fragments():
+    with open(FIXTURE, encoding='utf-8') as f:
+        return split_listings(f.read())
+
+
+def identity(job_fields):
+    """The fields that don't depend on the parse time or tag order"""
+    return {key: value for key, value in job_fields.items() if key not in ('posting_date', 'tags')}
+
+
+def test_splits_every_listing(fragments):
+    assert len(fragments) == 40
+    assert all('job-listing' in fragment.split('>', 1)[0] for fragment in fragments)
+
+
+def test_parses_listing_fields(fragments):
+    job_fields, winners = parse_job_html(fragments[0])
+    assert identity(job_fields) == {
+        'title': 'Actuarial Analyst',
+        'company': 'MetLife',
+        'location': 'New York, NY',
+        'job_type': 'Full-time',
+        'url': '/job/actuarial-analyst-1000',
+        'description': 'Actuarial position at MetLife in New York, NY. This job was scraped from ActuaryList.com.',
+    }
+    assert {'Python', 'Life', 'R'} <= set(job_fields['tags'])
+    assert set(winners) >= {'title', 'company', 'location'}
+
+
+def test_posting_date_is_utc(fragments):
+    posted = datetime.fromisoformat(parse_job_html(fragments[0])[0]['posting_date'])
+    assert posted.utcoffset() == timedelta(0)
+    assert abs(datetime.now(timezone.utc) - posted) < timedelta(minutes=1)
+
+
+def test_listings_have_distinct_fingerprints(fragments):
+    jobs = [parse_job_html(fragment)[0] for fragment in fragments]
+    assert len({fingerprint(job) for job in jobs}) == len(jobs)
+
+
+def test_learned_order_parses_the_same(fragments):
+    profile = SelectorProfile('test')
+    for fragment in fragments:
+        profile.merge(parse_job_html(fragment)[1])
+    learned = {field: profile.selectors(field) for field in FIELD_SELECTORS}
+    for fragment in fragments:
+        assert identity(parse_job_html(fragment, learned)[0]) == identity(parse_job_html(fragment)[0])
+
+
+def test_pool_parses_in_page_order(fragments):
+    batch = fragments * 2
+    serial = [identity(job) for job, _ in parse_listings(batch)]
+    pool = create_parse_pool(2)
+    try:
+        parallel = [identity(job) for job, _ in parse_listings(batch, executor=pool)]
+    finally:
+        pool.shutdown()
+    assert parallel == serial
+    assert len(serial) == 80
+
+
+def test_page_without_pagination_has_no_links():
+    with open(FIXTURE, encoding='utf-8') as f:
+        assert page_links(f.read(), 'https://www.actuarylist.com/jobs') == []
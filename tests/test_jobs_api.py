@@ -0,0 +1,94 @@
+"""Creating and updating jobs through /jobs, on every engine"""
+
+import pytest
+
+NEW_JOB = {'title': 'Pricing Actuary', 'company': 'Acme Re', 'location': 'Zurich',
+           'job_type': 'Full-time', 'url': 'https://example.com/jobs/1', 'tags': ['Pricing']}
+
+
+def bulk(client, *jobs):
+    response = client.post('/jobs/bulk', json={'jobs': list(jobs)})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def test_created_job_dedupes_with_imports(client):
+    created = client.post('/jobs', json=NEW_JOB).get_json()
+    count = client.get('/health').get_json()['jobs_count']
+    result = bulk(client, dict(NEW_JOB, description='Imported'))
+    assert (result['created'], result['updated']) == (0, 1)
+    assert client.get('/health').get_json()['jobs_count'] == count
+    assert client.get(f"/jobs/{created['id']}").get_json()['description'] == 'Imported'
+
+
+def test_creating_the_same_listing_twice_conflicts(client):
+    created = client.post('/jobs', json=NEW_JOB).get_json()
+    response = client.post('/jobs', json=dict(NEW_JOB, title=' pricing  actuary '))
+    assert response.status_code == 409
+    assert response.get_json()['id'] == created['id']
+
+
+def test_update_follows_identity_changes(client):
+    created = client.post('/jobs', json=NEW_JOB).get_json()
+    moved = dict(NEW_JOB, location='Munich')
+    assert client.put(f"/jobs/{created['id']}", json={'location': 'Munich'}).status_code == 200
+    assert bulk(client, moved)['updated'] == 1
+    # The old identity is free again
+    assert bulk(client, NEW_JOB)['created'] == 1
+
+
+def test_update_keeps_fingerprint_without_identity_changes(client):
+    created = client.post('/jobs', json=NEW_JOB).get_json()
+    response = client.put(f"/jobs/{created['id']}", json={'description': 'Now remote', 'title': NEW_JOB['title']})
+    assert response.status_code == 200
+    assert bulk(client, NEW_JOB)['updated'] == 1
+
+
+def test_update_onto_another_listing_conflicts(client):
+    first = client.post('/jobs', json=NEW_JOB).get_json()
+    second = client.post('/jobs', json=dict(NEW_JOB, url='https://example.com/jobs/2')).get_json()
+    response = client.put(f"/jobs/{second['id']}", json={'url': NEW_JOB['url']})
+    assert response.status_code == 409
+    assert response.get_json()['id'] == first['id']
+    assert client.get(f"/jobs/{second['id']}").get_json()['url'] == 'https://example.com/jobs/2'
+
+
+@pytest.mark.parametrize('fields', [
+    {'title': None}, {'title': '  '}, {'title': 5}, {'company': ['Acme']},
+    {'description': {'text': 'x'}}, {'url': 1}, {'tags': [1, 2]}, {'tags': {'a': 1}},
+])
+def test_create_rejects_bad_fields(client, fields):
+    response = client.post('/jobs', json=dict(NEW_JOB, **fields))
+    assert response.status_code == 400
+    assert response.get_json()['error']
+
+
+@pytest.mark.parametrize('fields', [
+    {'title': None}, {'location': ''}, {'job_type': 3}, {'tags': [1]}, {'url': ['x']},
+])
+def test_update_rejects_bad_fields(client, fields):
+    created = client.post('/jobs', json=NEW_JOB).get_json()
+    response = client.put(f"/jobs/{created['id']}", json=fields)
+    assert response.status_code == 400
+    assert client.get(f"/jobs/{created['id']}").get_json() == created
+    assert client.get('/jobs', query_string={'title': 'pricing'}).status_code == 200
+
+
+def test_comma_separated_tags_are_split(client):
+    created = client.post('/jobs', json=dict(NEW_JOB, tags='Pricing, Python,,')).get_json()
+    assert sorted(created['tags']) == ['Pricing', 'Python']
+    updated = client.put(f"/jobs/{created['id']}", json={'tags': 'SQL ,R'}).get_json()
+    assert sorted(updated['tags']) == ['R', 'SQL']
+
+
+def test_fields_are_stripped(client):
+    created = client.post('/jobs', json=dict(NEW_JOB, title='  Pricing Actuary ', job_type=None)).get_json()
+    assert (created['title'], created['job_type']) == ('Pricing Actuary', 'Full-time')
+    updated = client.patch(f"/jobs/{created['id']}", json={'company': ' Acme Life '}).get_json()
+    assert updated['company'] == 'Acme Life'
+
+
+def test_bulk_rejects_the_same_bad_fields(client):
+    result = bulk(client, NEW_JOB, dict(NEW_JOB, title='Other', tags=[1]), dict(NEW_JOB, title=None))
+    assert result['created'] == 1
+    assert [error['index'] for error in result['errors']] == [1, 2]
@@ -0,0 +1,63 @@
+"""POST /scrape-jobs request validation"""
+
+import time
+
+import pytest
+
+
+@pytest.mark.parametrize('max_jobs', ['many', None, 0, -5, 2.5, True, [10]])
+def test_rejects_invalid_max_jobs(make_app, max_jobs):
+    client = make_app().test_client()
+    response = client.post('/scrape-jobs', json={'max_jobs': max_jobs})
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+def test_clamps_max_jobs(make_app, monkeypatch):
+    import scrape_tasks
+
+    submitted = []
+
+    def submit(self, params):
+        submitted.append(params)
+        return scrape_tasks.ScrapeTask(params), True
+
+    # Record the queued parameters instead of starting a scrape
+    monkeypatch.setattr(scrape_tasks.ScrapeTaskManager, 'submit', submit)
+    client = make_app(SCRAPE_MAX_JOBS=50).test_client()
+    assert client.post('/scrape-jobs', json={'max_jobs': '20'}).status_code == 202
+    assert client.post('/scrape-jobs', json={'max_jobs': 10_000}).status_code == 202
+    assert [params['max_jobs'] for params in submitted] == [20, 50]
+
+
+def run_scrape(client, **params):
+    """Queue a scrape and wait for it to finish"""
+    response = client.post('/scrape-jobs', json=params)
+    status_url = response.headers['Location']
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        task = client.get(status_url).get_json()
+        if task['status'] not in ('queued', 'running'):
+            return task
+        time.sleep(0.02)
+    raise AssertionError('scrape did not finish')
+
+
+@pytest.mark.parametrize('engine', ['sql', 'memory'])
+def test_incremental_scrapes_skip_what_the_catalog_has(make_app, saved_page_fetcher, engine):
+    client = make_app(engine, SCRAPER_BACKEND='service').test_client()
+    first = run_scrape(client, max_jobs=3, incremental=True)
+    assert first['status'] == 'completed'
+    assert first['result']['jobs_added'] == 3
+
+    second = run_scrape(client, max_jobs=3, incremental=True)
+    assert second['result']['jobs_added'] == 3
+    first_ids = {job['id'] for job in first['result']['jobs']}
+    assert not first_ids & {job['id'] for job in second['result']['jobs']}
+
+    # Once the backend no longer has a job, its listing is new again
+    deleted = first['result']['jobs'][0]
+    assert client.delete(f"/jobs/{deleted['id']}").status_code == 204
+    third = run_scrape(client, max_jobs=1, incremental=True)
+    assert third['result']['jobs_added'] == 1
+    assert third['result']['jobs'][0]['title'] == deleted['title']
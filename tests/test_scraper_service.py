@@ -0,0 +1,44 @@
+"""
+ScraperService: every scrape gets its own HTTP session, and scrapes give
+up at their timeout.
+"""
+
+import pytest
+
+from scraper_service import ScraperService
+
+
+@pytest.fixture
+def service(saved_page_fetcher):
+    service = ScraperService(fetch_mode='http')
+    yield service
+    service.close()
+
+
+def test_each_scrape_has_its_own_session(service, saved_page_fetcher):
+    first = service.scrape(max_jobs=5)
+    second = service.scrape(max_jobs=5)
+    assert first['success'] and second['success']
+    assert first['count'] == second['count'] == 5
+    assert len(saved_page_fetcher.instances) == 2
+    assert all(fetcher.closed for fetcher in saved_page_fetcher.instances)
+
+
+def test_scrape_gives_up_at_timeout(service, saved_page_fetcher, monkeypatch):
+    monkeypatch.setattr(saved_page_fetcher, 'delay', 0.2)
+    jobs = []
+    result = service.scrape(max_jobs=5, on_job=jobs.append, timeout=0.05)
+    assert not result['success']
+    assert 'timeout' in result['error']
+    assert jobs == []
+    assert saved_page_fetcher.instances[0].closed
+
+
+def test_known_fingerprints_replace_the_seen_store(service):
+    first = service.scrape(max_jobs=3, incremental=True, known=[])
+    known = {job['fingerprint'] for job in first['jobs']}
+    second = service.scrape(max_jobs=3, incremental=True, known=known)
+    assert not known & {job['fingerprint'] for job in second['jobs']}
+    # Forgotten by the caller, so new again
+    third = service.scrape(max_jobs=3, incremental=True, known=[])
+    assert [job['fingerprint'] for job in third['jobs']] == [job['fingerprint'] for job in first['jobs']]
@@ -0,0 +1,54 @@
+"""SharedJobStore replicas of one backend, as used by separate workers"""
+
+import json
+
+import pytest
+
+from shared_store import MemoryJobBackend, SharedJobStore
+
+JOB = {'title': 'Pricing Actuary', 'company': 'Acme Re', 'location': 'Zurich', 'job_type': 'Full-time',
+       'tags': ['Pricing'], 'posting_date': '2024-05-01T00:00:00', 'description': ''}
+
+
+@pytest.fixture
+def workers():
+    """Two replicas that only sync when forced or when they write"""
+    backend = MemoryJobBackend()
+    return SharedJobStore(backend, poll_interval=3600), SharedJobStore(backend, poll_interval=3600)
+
+
+def titles(store):
+    return [json.loads(data)['title'] for data in store.encode_all(store.jobs_by_date())]
+
+
+def test_replaced_record_is_not_cached(workers):
+    worker, other = workers
+    job = worker.add(dict(JOB, id=worker.next_id()))
+    listed = worker.jobs_by_date()
+
+    other.update(job['id'], {'title': 'Reserving Actuary'})
+    worker.sync(force=True)
+    # A page listed before the sync still encodes, without caching the old record
+    assert [json.loads(data)['title'] for data in worker.encode_all(listed)] == ['Pricing Actuary']
+    assert titles(worker) == ['Reserving Actuary']
+
+
+def test_delete_of_a_job_not_yet_synced(workers):
+    worker, other = workers
+    job_id = other.add(dict(JOB, id=other.next_id()))['id']
+    assert job_id not in worker._local
+
+    deleted = worker.delete(job_id)
+    assert deleted is not None and deleted['title'] == 'Pricing Actuary'
+    assert worker.get(job_id) is None
+    assert worker.delete(job_id) is None
+
+
+def test_api_delete_of_a_job_created_by_another_worker(make_app):
+    config = {'JOB_STORE_BACKEND': 'shared', 'SHARED_STORE_POLL_INTERVAL': 3600}
+    worker = make_app('memory', **config).test_client()
+    other = make_app('memory', **config).test_client()
+    job_id = other.post('/jobs', json=JOB).get_json()['id']
+
+    assert worker.delete(f'/jobs/{job_id}').status_code == 204
+    assert worker.delete(f'/jobs/{job_id}').status_code == 404